@@ -1,3 +1,15 @@
-from .embeddings import CrossEncoderModelSingleton, EmbeddingModelSingleton
+from .embeddings import (
+    CrossEncoderModelSingleton,
+    EmbeddingModel,
+    EmbeddingModelSingleton,
+    SparseEmbeddingModelSingleton,
+    get_embedding_model,
+)
 
-__all__ = ["EmbeddingModelSingleton", "CrossEncoderModelSingleton"]
+__all__ = [
+    "EmbeddingModel",
+    "EmbeddingModelSingleton",
+    "CrossEncoderModelSingleton",
+    "SparseEmbeddingModelSingleton",
+    "get_embedding_model",
+]
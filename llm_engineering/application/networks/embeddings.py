@@ -1,4 +1,7 @@
-from functools import cached_property
+import re
+import zlib
+from collections import Counter
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -14,9 +17,9 @@ from llm_engineering.settings import settings
 from .base import SingletonMeta
 
 
-class EmbeddingModelSingleton(metaclass=SingletonMeta):
+class EmbeddingModel:
     """
-    A singleton class that provides a pre-trained transformer model for generating embeddings of input text.
+    A pre-trained transformer model for generating embeddings of input text.
     """
 
     def __init__(
@@ -108,6 +111,31 @@ class EmbeddingModelSingleton(metaclass=SingletonMeta):
         return embeddings
 
 
+class EmbeddingModelSingleton(EmbeddingModel, metaclass=SingletonMeta):
+    """
+    A singleton class that provides the pre-trained transformer model configured by `TEXT_EMBEDDING_MODEL_ID`.
+    """
+
+
+@lru_cache(maxsize=None)
+def get_embedding_model(model_id: str) -> EmbeddingModel:
+    """
+    Returns the embedding model with the given identifier, loading it only once.
+
+    Args:
+        model_id (str): The identifier of the pre-trained transformer model.
+
+    Returns:
+        EmbeddingModel: The singleton model if `model_id` is the configured one, otherwise a cached model.
+    """
+
+    embedding_model = EmbeddingModelSingleton()
+    if embedding_model.model_id == model_id:
+        return embedding_model
+
+    return EmbeddingModel(model_id=model_id)
+
+
 class CrossEncoderModelSingleton(metaclass=SingletonMeta):
     def __init__(
         self,
@@ -134,3 +162,74 @@ class CrossEncoderModelSingleton(metaclass=SingletonMeta):
             scores = scores.tolist()
 
         return scores
+
+
+class SparseEmbeddingModelSingleton(metaclass=SingletonMeta):
+    """
+    A singleton class that computes BM25-style sparse embeddings of input text locally, on CPU.
+
+    Each token is hashed into a sparse index and weighted with the BM25 term-frequency saturation. The inverse
+    document frequency depends on the whole collection, so it is left to the vector DB (the IDF modifier of
+    the sparse vector).
+    """
+
+    # Splits camelCase and snake_case identifiers so code matches the words used in natural-language queries.
+    _token_pattern = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_document_length: float = 256.0) -> None:
+        self._k1 = k1
+        self._b = b
+        self._avg_document_length = avg_document_length
+
+    @property
+    def model_id(self) -> str:
+        """
+        Returns the identifier of the sparse embedding model.
+
+        Returns:
+            str: The identifier of the sparse embedding model.
+        """
+
+        return "bm25"
+
+    def tokenize(self, text: str) -> list[str]:
+        """
+        Splits the input text into lowercase tokens.
+
+        Args:
+            text (str): The input text to tokenize.
+
+        Returns:
+            list[str]: The tokens of the input text.
+        """
+
+        return [token.lower() for token in self._token_pattern.findall(text)]
+
+    def __call__(self, input_text: str | list[str], is_query: bool = False) -> list[tuple[list[int], list[float]]]:
+        """
+        Generates sparse embeddings for the input text.
+
+        Args:
+            input_text (str | list[str]): The input text to generate sparse embeddings for.
+            is_query (bool): Whether the input text is a query. Query terms are weighted uniformly, as their
+                importance comes from the IDF computed by the vector DB. Defaults to False.
+
+        Returns:
+            list[tuple[list[int], list[float]]]: The (indices, values) pair of each input text.
+        """
+
+        if isinstance(input_text, str):
+            input_text = [input_text]
+
+        return [self._embed(text, is_query=is_query) for text in input_text]
+
+    def _embed(self, text: str, is_query: bool) -> tuple[list[int], list[float]]:
+        tokens = self.tokenize(text)
+        term_frequencies = Counter(zlib.crc32(token.encode()) for token in tokens)
+        if is_query:
+            return list(term_frequencies), [1.0] * len(term_frequencies)
+
+        length_norm = self._k1 * (1 - self._b + self._b * len(tokens) / self._avg_document_length)
+        values = [tf * (self._k1 + 1) / (tf + length_norm) for tf in term_frequencies.values()]
+
+        return list(term_frequencies), values
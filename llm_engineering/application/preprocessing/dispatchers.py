@@ -106,7 +106,10 @@ class EmbeddingDispatcher:
 
     @classmethod
     def dispatch(
-        cls, data_model: VectorBaseDocument | list[VectorBaseDocument]
+        cls,
+        data_model: VectorBaseDocument | list[VectorBaseDocument],
+        extra_embedding_model_ids: list[str] | None = None,
+        with_sparse_embedding: bool | None = None,
     ) -> VectorBaseDocument | list[VectorBaseDocument]:
         is_list = isinstance(data_model, list)
         if not is_list:
@@ -121,7 +124,11 @@ class EmbeddingDispatcher:
         ), "Data models must be of the same category."
         handler = cls.factory.create_handler(data_category)
 
-        embedded_chunk_model = handler.embed_batch(data_model)
+        embedded_chunk_model = handler.embed_batch(
+            data_model,
+            extra_embedding_model_ids=extra_embedding_model_ids,
+            with_sparse_embedding=with_sparse_embedding,
+        )
 
         if not is_list:
             embedded_chunk_model = embedded_chunk_model[0]
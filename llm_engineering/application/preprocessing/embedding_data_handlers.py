@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, cast
+from typing import Generic, TypeVar
 
-from llm_engineering.application.networks import EmbeddingModelSingleton
+import numpy as np
+from numpy.typing import NDArray
+
+from llm_engineering.application.networks import (
+    EmbeddingModelSingleton,
+    SparseEmbeddingModelSingleton,
+    get_embedding_model,
+)
 from llm_engineering.domain.chunks import ArticleChunk, Chunk, PostChunk, RepositoryChunk
 from llm_engineering.domain.embedded_chunks import (
     EmbeddedArticleChunk,
@@ -10,11 +17,22 @@ from llm_engineering.domain.embedded_chunks import (
     EmbeddedRepositoryChunk,
 )
 from llm_engineering.domain.queries import EmbeddedQuery, Query
+from llm_engineering.domain.types import SparseEmbedding
+from llm_engineering.settings import settings
 
 ChunkT = TypeVar("ChunkT", bound=Chunk)
 EmbeddedChunkT = TypeVar("EmbeddedChunkT", bound=EmbeddedChunk)
 
 embedding_model = EmbeddingModelSingleton()
+sparse_embedding_model = SparseEmbeddingModelSingleton()
+
+
+def _build_point_metadata(embedded_chunk_class: type[EmbeddedChunk]) -> dict:
+    # Stored once per collection (see `build_collection_metadata`), copying it into every point is opt-in.
+    if settings.RAG_PER_POINT_EMBEDDING_METADATA is False:
+        return {}
+
+    return embedded_chunk_class.build_collection_metadata()
 
 
 class EmbeddingDataHandler(ABC, Generic[ChunkT, EmbeddedChunkT]):
@@ -23,93 +41,143 @@ class EmbeddingDataHandler(ABC, Generic[ChunkT, EmbeddedChunkT]):
     All data transformations logic for the embedding step is done here
     """
 
-    def embed(self, data_model: ChunkT) -> EmbeddedChunkT:
-        return self.embed_batch([data_model])[0]
-
-    def embed_batch(self, data_model: list[ChunkT]) -> list[EmbeddedChunkT]:
+    def embed(
+        self,
+        data_model: ChunkT,
+        extra_embedding_model_ids: list[str] | None = None,
+        with_sparse_embedding: bool | None = None,
+    ) -> EmbeddedChunkT:
+        return self.embed_batch(
+            [data_model],
+            extra_embedding_model_ids=extra_embedding_model_ids,
+            with_sparse_embedding=with_sparse_embedding,
+        )[0]
+
+    def embed_batch(
+        self,
+        data_model: list[ChunkT],
+        extra_embedding_model_ids: list[str] | None = None,
+        with_sparse_embedding: bool | None = None,
+    ) -> list[EmbeddedChunkT]:
         embedding_model_input = [data_model.content for data_model in data_model]
-        embeddings = embedding_model(embedding_model_input, to_list=True)
+        # Keep a single (n, embedding_size) float32 matrix and hand out its rows as views.
+        embeddings = embedding_model(embedding_model_input, to_list=False)
+        if with_sparse_embedding is None:
+            with_sparse_embedding = self.with_sparse_embedding()
+        if with_sparse_embedding is True:
+            sparse_embeddings = self.sparse_embed_batch(embedding_model_input)
+        else:
+            sparse_embeddings = [None] * len(embedding_model_input)
 
         embedded_chunk = [
-            self.map_model(data_model, cast(list[float], embedding))
-            for data_model, embedding in zip(data_model, embeddings, strict=False)
+            self.map_model(data_model, embedding, sparse_embedding)
+            for data_model, embedding, sparse_embedding in zip(data_model, embeddings, sparse_embeddings, strict=False)
         ]
 
+        # The extra models fill the other named vectors of the same points, e.g. while migrating to a new model.
+        if extra_embedding_model_ids is None:
+            extra_embedding_model_ids = settings.TEXT_EMBEDDING_EXTRA_MODEL_ID_LIST
+        for model_id in extra_embedding_model_ids:
+            extra_embeddings = get_embedding_model(model_id)(embedding_model_input, to_list=False)
+            for chunk, extra_embedding in zip(embedded_chunk, extra_embeddings, strict=False):
+                chunk.extra_embeddings[model_id] = extra_embedding
+
         return embedded_chunk
 
+    def with_sparse_embedding(self) -> bool:
+        return settings.RAG_SPARSE_VECTOR
+
+    def sparse_embed_batch(self, input_text: list[str]) -> list[SparseEmbedding]:
+        return [
+            SparseEmbedding(indices=indices, values=values) for indices, values in sparse_embedding_model(input_text)
+        ]
+
     @abstractmethod
-    def map_model(self, data_model: ChunkT, embedding: list[float]) -> EmbeddedChunkT:
+    def map_model(
+        self, data_model: ChunkT, embedding: NDArray[np.float32], sparse_embedding: SparseEmbedding | None
+    ) -> EmbeddedChunkT:
         pass
 
 
 class QueryEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: Query, embedding: list[float]) -> EmbeddedQuery:
+    def with_sparse_embedding(self) -> bool:
+        # The sparse query vector is only searched by the hybrid retrieval.
+        return settings.RAG_HYBRID_SEARCH
+
+    def sparse_embed_batch(self, input_text: list[str]) -> list[SparseEmbedding]:
+        return [
+            SparseEmbedding(indices=indices, values=values)
+            for indices, values in sparse_embedding_model(input_text, is_query=True)
+        ]
+
+    def map_model(
+        self, data_model: Query, embedding: NDArray[np.float32], sparse_embedding: SparseEmbedding | None
+    ) -> EmbeddedQuery:
         return EmbeddedQuery(
             id=data_model.id,
             author_id=data_model.author_id,
             author_full_name=data_model.author_full_name,
             content=data_model.content,
             embedding=embedding,
+            sparse_embedding=sparse_embedding,
             metadata={
                 "embedding_model_id": embedding_model.model_id,
                 "embedding_size": embedding_model.embedding_size,
                 "max_input_length": embedding_model.max_input_length,
+                "sparse_embedding_model_id": sparse_embedding_model.model_id if sparse_embedding else None,
             },
         )
 
 
 class PostEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: PostChunk, embedding: list[float]) -> EmbeddedPostChunk:
+    def map_model(
+        self, data_model: PostChunk, embedding: NDArray[np.float32], sparse_embedding: SparseEmbedding | None
+    ) -> EmbeddedPostChunk:
         return EmbeddedPostChunk(
             id=data_model.id,
             content=data_model.content,
             embedding=embedding,
+            sparse_embedding=sparse_embedding,
             platform=data_model.platform,
             document_id=data_model.document_id,
             author_id=data_model.author_id,
             author_full_name=data_model.author_full_name,
-            metadata={
-                "embedding_model_id": embedding_model.model_id,
-                "embedding_size": embedding_model.embedding_size,
-                "max_input_length": embedding_model.max_input_length,
-            },
+            metadata=_build_point_metadata(EmbeddedPostChunk),
         )
 
 
 class ArticleEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: ArticleChunk, embedding: list[float]) -> EmbeddedArticleChunk:
+    def map_model(
+        self, data_model: ArticleChunk, embedding: NDArray[np.float32], sparse_embedding: SparseEmbedding | None
+    ) -> EmbeddedArticleChunk:
         return EmbeddedArticleChunk(
             id=data_model.id,
             content=data_model.content,
             embedding=embedding,
+            sparse_embedding=sparse_embedding,
             platform=data_model.platform,
             link=data_model.link,
             document_id=data_model.document_id,
             author_id=data_model.author_id,
             author_full_name=data_model.author_full_name,
-            metadata={
-                "embedding_model_id": embedding_model.model_id,
-                "embedding_size": embedding_model.embedding_size,
-                "max_input_length": embedding_model.max_input_length,
-            },
+            metadata=_build_point_metadata(EmbeddedArticleChunk),
         )
 
 
 class RepositoryEmbeddingHandler(EmbeddingDataHandler):
-    def map_model(self, data_model: RepositoryChunk, embedding: list[float]) -> EmbeddedRepositoryChunk:
+    def map_model(
+        self, data_model: RepositoryChunk, embedding: NDArray[np.float32], sparse_embedding: SparseEmbedding | None
+    ) -> EmbeddedRepositoryChunk:
         return EmbeddedRepositoryChunk(
             id=data_model.id,
             content=data_model.content,
             embedding=embedding,
+            sparse_embedding=sparse_embedding,
             platform=data_model.platform,
             name=data_model.name,
             link=data_model.link,
             document_id=data_model.document_id,
             author_id=data_model.author_id,
             author_full_name=data_model.author_full_name,
-            metadata={
-                "embedding_model_id": embedding_model.model_id,
-                "embedding_size": embedding_model.embedding_size,
-                "max_input_length": embedding_model.max_input_length,
-            },
+            metadata=_build_point_metadata(EmbeddedRepositoryChunk),
         )
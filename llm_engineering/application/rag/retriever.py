@@ -1,4 +1,4 @@
-import concurrent.futures
+import asyncio
 
 import opik
 from loguru import logger
@@ -6,6 +6,7 @@ from qdrant_client.models import FieldCondition, Filter, MatchValue
 
 from llm_engineering.application import utils
 from llm_engineering.application.preprocessing.dispatchers import EmbeddingDispatcher
+from llm_engineering.domain.base.vector import VectorBaseDocument, VectorQuotaSearchRequest, VectorSearchRequest
 from llm_engineering.domain.embedded_chunks import (
     EmbeddedArticleChunk,
     EmbeddedChunk,
@@ -13,6 +14,7 @@ from llm_engineering.domain.embedded_chunks import (
     EmbeddedRepositoryChunk,
 )
 from llm_engineering.domain.queries import EmbeddedQuery, Query
+from llm_engineering.settings import settings
 
 from .query_expanison import QueryExpansion
 from .reranking import Reranker
@@ -20,7 +22,25 @@ from .self_query import SelfQuery
 
 
 class ContextRetriever:
-    def __init__(self, mock: bool = False) -> None:
+    document_classes: tuple[type[EmbeddedChunk], ...] = (
+        EmbeddedPostChunk,
+        EmbeddedArticleChunk,
+        EmbeddedRepositoryChunk,
+    )
+
+    def __init__(
+        self,
+        mock: bool = False,
+        hybrid: bool = settings.RAG_HYBRID_SEARCH,
+        embedding_model_id: str | None = None,
+        chunks_per_document: int | None = None,
+    ) -> None:
+        self._hybrid = hybrid
+        # Searches the named vectors of this embedding model instead of the `TEXT_EMBEDDING_MODEL_ID` ones.
+        self._embedding_model_id = embedding_model_id
+        # If set, retrieves the top documents with their best `chunks_per_document` chunks each,
+        # so neighbouring chunks of the same document don't crowd the candidates sent to the reranker.
+        self._chunks_per_document = chunks_per_document
         self._query_expander = QueryExpansion(mock=mock)
         self._metadata_extractor = SelfQuery(mock=mock)
         self._reranker = Reranker(mock=mock)
@@ -44,12 +64,8 @@ class ContextRetriever:
             f"Successfully generated {len(n_generated_queries)} search queries.",
         )
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            search_tasks = [executor.submit(self._search, _query_model, k) for _query_model in n_generated_queries]
-
-            n_k_documents = [task.result() for task in concurrent.futures.as_completed(search_tasks)]
-            n_k_documents = utils.misc.flatten(n_k_documents)
-            n_k_documents = list(set(n_k_documents))
+        n_k_documents = self._search(n_generated_queries, k)
+        n_k_documents = list(set(n_k_documents))
 
         logger.info(f"{len(n_k_documents)} documents retrieved successfully")
 
@@ -60,12 +76,104 @@ class ContextRetriever:
 
         return k_documents
 
-    def _search(self, query: Query, k: int = 3) -> list[EmbeddedChunk]:
+    @opik.track(name="ContextRetriever.asearch")
+    async def asearch(
+        self,
+        query: str,
+        k: int = 3,
+        expand_to_n_queries: int = 3,
+    ) -> list:
+        """
+        Async version of `search`. The vector DB is queried through the async ODM, while the blocking
+        LLM calls and models run in worker threads, so the event loop is never blocked.
+        """
+
+        query_model = Query.from_str(query)
+
+        query_model = await asyncio.to_thread(self._metadata_extractor.generate, query_model)
+        logger.info(
+            f"Successfully extracted the author_full_name = {query_model.author_full_name} from the query.",
+        )
+
+        n_generated_queries = await asyncio.to_thread(
+            self._query_expander.generate, query_model, expand_to_n=expand_to_n_queries
+        )
+        logger.info(
+            f"Successfully generated {len(n_generated_queries)} search queries.",
+        )
+
+        search_requests = await asyncio.to_thread(self._build_search_requests, n_generated_queries, k)
+        if self._chunks_per_document is not None:
+            # Qdrant has no batch endpoint for grouped searches, so they run in the ODM's thread pool.
+            n_k_documents = await asyncio.to_thread(self._search_groups, search_requests)
+        elif self._is_shared_collection():
+            n_k_documents = await asyncio.to_thread(self._search_with_quotas, search_requests)
+        else:
+            n_k_documents = utils.misc.flatten(
+                await VectorBaseDocument.asearch_batch(search_requests, using=self._embedding_model_id)
+            )
+        n_k_documents = list(set(n_k_documents))
+
+        logger.info(f"{len(n_k_documents)} documents retrieved successfully")
+
+        if len(n_k_documents) > 0:
+            k_documents = await asyncio.to_thread(self.rerank, query, chunks=n_k_documents, keep_top_k=k)
+        else:
+            k_documents = []
+
+        return k_documents
+
+    def _search(self, queries: list[Query], k: int = 3) -> list[EmbeddedChunk]:
+        # All the (query, data category) searches are sent in one round trip per collection.
+        search_requests = self._build_search_requests(queries, k)
+        if self._chunks_per_document is not None:
+            return self._search_groups(search_requests)
+        if self._is_shared_collection():
+            return self._search_with_quotas(search_requests)
+
+        retrieved_chunks = utils.misc.flatten(
+            VectorBaseDocument.search_batch(search_requests, using=self._embedding_model_id)
+        )
+
+        return retrieved_chunks
+
+    def _is_shared_collection(self) -> bool:
+        return len({document_class.get_collection_name() for document_class in self.document_classes}) == 1
+
+    def _search_with_quotas(self, search_requests: list[VectorSearchRequest]) -> list[EmbeddedChunk]:
+        # With all the categories in one collection, each query is a single request whose category prefetches
+        # keep the same per-category limits.
+        quota_search_requests = [
+            VectorQuotaSearchRequest(
+                quotas={request.document_class: request.limit for request in query_search_requests},
+                query_vector=query_search_requests[0].query_vector,
+                query_filter=query_search_requests[0].query_filter,
+                query_sparse_vector=query_search_requests[0].query_sparse_vector,
+            )
+            for query_search_requests in utils.misc.batch(search_requests, len(self.document_classes))
+        ]
+
+        return utils.misc.flatten(
+            VectorBaseDocument.search_with_quotas(quota_search_requests, using=self._embedding_model_id)
+        )
+
+    def _search_groups(self, search_requests: list[VectorSearchRequest]) -> list[EmbeddedChunk]:
+        # Each request's limit becomes the number of documents, each with up to `chunks_per_document` chunks.
+        grouped_chunks = VectorBaseDocument.search_groups_batch(
+            search_requests,
+            group_by="document_id",
+            group_size=self._chunks_per_document,
+            using=self._embedding_model_id,
+        )
+
+        return utils.misc.flatten([utils.misc.flatten(groups) for groups in grouped_chunks])
+
+    def _build_search_requests(self, queries: list[Query], k: int = 3) -> list[VectorSearchRequest]:
         assert k >= 3, "k should be >= 3"
 
-        def _search_data_category(
+        def _build_search_request(
             data_category_odm: type[EmbeddedChunk], embedded_query: EmbeddedQuery
-        ) -> list[EmbeddedChunk]:
+        ) -> VectorSearchRequest:
             if embedded_query.author_id:
                 query_filter = Filter(
                     must=[
@@ -80,21 +188,38 @@ class ContextRetriever:
             else:
                 query_filter = None
 
-            return data_category_odm.search(
-                query_vector=embedded_query.embedding,
-                limit=k // 3,
+            if self._hybrid and data_category_odm.get_sparse_vector_name() is not None:
+                query_sparse_vector = embedded_query.sparse_embedding
+            else:
+                query_sparse_vector = None
+
+            return VectorSearchRequest(
+                document_class=data_category_odm,
+                query_vector=embedded_query.extra_embeddings.get(self._embedding_model_id, embedded_query.embedding),
                 query_filter=query_filter,
+                limit=k // 3,
+                query_sparse_vector=query_sparse_vector,
             )
 
-        embedded_query: EmbeddedQuery = EmbeddingDispatcher.dispatch(query)
-
-        post_chunks = _search_data_category(EmbeddedPostChunk, embedded_query)
-        articles_chunks = _search_data_category(EmbeddedArticleChunk, embedded_query)
-        repositories_chunks = _search_data_category(EmbeddedRepositoryChunk, embedded_query)
-
-        retrieved_chunks = post_chunks + articles_chunks + repositories_chunks
+        if self._embedding_model_id is not None and self._embedding_model_id != settings.TEXT_EMBEDDING_MODEL_ID:
+            extra_embedding_model_ids = [self._embedding_model_id]
+        else:
+            extra_embedding_model_ids = []
+        # BM25 embed the queries only if a collection is searched with them.
+        with_sparse_embedding = self._hybrid and any(
+            data_category_odm.get_sparse_vector_name() is not None for data_category_odm in self.document_classes
+        )
+        embedded_queries: list[EmbeddedQuery] = EmbeddingDispatcher.dispatch(
+            queries,
+            extra_embedding_model_ids=extra_embedding_model_ids,
+            with_sparse_embedding=with_sparse_embedding,
+        )
 
-        return retrieved_chunks
+        return [
+            _build_search_request(data_category_odm, embedded_query)
+            for embedded_query in embedded_queries
+            for data_category_odm in self.document_classes
+        ]
 
     def rerank(self, query: str | Query, chunks: list[EmbeddedChunk], keep_top_k: int) -> list[EmbeddedChunk]:
         if isinstance(query, str):
@@ -1,6 +1,6 @@
 import uuid
 from abc import ABC
-from typing import Generic, Type, TypeVar
+from typing import Any, ClassVar, Generator, Generic, Type, TypeVar
 
 from loguru import logger
 from pydantic import UUID4, BaseModel, Field
@@ -10,6 +10,8 @@ from llm_engineering.domain.exceptions import ImproperlyConfigured
 from llm_engineering.infrastructure.db.mongo import connection
 from llm_engineering.settings import settings
 
+from .utils import TrustedField, construct_trusted, get_trusted_fields
+
 _database = connection.get_database(settings.DATABASE_NAME)
 
 
@@ -19,6 +21,14 @@ T = TypeVar("T", bound="NoSQLBaseDocument")
 class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
     id: UUID4 = Field(default_factory=uuid.uuid4)
 
+    _trusted_fields: ClassVar[tuple[TrustedField, ...]] = ()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+
+        cls._trusted_fields = get_trusted_fields(cls)
+
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, self.__class__):
             return False
@@ -29,14 +39,22 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
         return hash(self.id)
 
     @classmethod
-    def from_mongo(cls: Type[T], data: dict) -> T:
-        """Convert "_id" (str object) into "id" (UUID object)."""
+    def from_mongo(cls: Type[T], data: dict, trusted: bool = False, partial: bool = False) -> T:
+        """Convert "_id" (str object) into "id" (UUID object).
+
+        When `trusted` is True, the document is assumed to be written by this ODM and is built without the
+        pydantic validation, converting only the UUID fields. When `partial` is True, e.g. for projected
+        reads, it is built the same way and the missing fields are left unset: accessing them raises.
+        """
 
         if not data:
             raise ValueError("Data is empty.")
 
         id = data.pop("_id")
 
+        if trusted is True or partial is True:
+            return construct_trusted(cls, dict(data, id=id), cls._trusted_fields, partial=partial)
+
         return cls(**dict(data, id=id))
 
     def to_mongo(self: T, **kwargs) -> dict:
@@ -119,15 +137,47 @@ class NoSQLBaseDocument(BaseModel, Generic[T], ABC):
             return None
 
     @classmethod
-    def bulk_find(cls: Type[T], **filter_options) -> list[T]:
+    def bulk_find(cls: Type[T], trusted: bool = False, **filter_options) -> list[T]:
+        return list(cls.iter_find(filter_options, trusted=trusted))
+
+    @classmethod
+    def iter_find(
+        cls: Type[T],
+        filter: dict | None = None,
+        projection: list[str] | None = None,
+        batch_size: int = 100,
+        sort: list[tuple[str, int]] | None = None,
+        trusted: bool = False,
+    ) -> Generator[T, None, None]:
+        """
+        Lazily iterates over the documents matching the filter. Only one batch of the cursor is held in
+        memory at a time, so it scales to collections that do not fit in memory.
+
+        Args:
+            filter (dict | None): The MongoDB query. Defaults to all the documents.
+            projection (list[str] | None): The fields to fetch. The documents are then partial (see
+                `from_mongo`). Defaults to all the fields.
+            batch_size (int): The number of documents fetched per round trip to MongoDB. Defaults to 100.
+            sort (list[tuple[str, int]] | None): The (field, direction) pairs to sort the documents by, e.g.
+                `[("platform", pymongo.ASCENDING)]`. Defaults to the natural order.
+            trusted (bool): Whether to build the documents without validation (see `from_mongo`).
+
+        Yields:
+            T: The matching documents.
+        """
+
         collection = _database[cls.get_collection_name()]
+        if projection is not None:
+            projection = {"_id" if field == "id" else field: 1 for field in projection}
+
+        cursor = collection.find(filter or {}, projection=projection, batch_size=batch_size, sort=sort)
         try:
-            instances = collection.find(filter_options)
-            return [document for instance in instances if (document := cls.from_mongo(instance)) is not None]
+            for instance in cursor:
+                yield cls.from_mongo(instance, trusted=trusted, partial=projection is not None)
         except errors.OperationFailure:
             logger.error("Failed to retrieve documents")
-
-            return []
+        finally:
+            cursor.close()
 
     @classmethod
     def get_collection_name(cls: Type[T]) -> str:
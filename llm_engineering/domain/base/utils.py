@@ -0,0 +1,88 @@
+from functools import lru_cache
+from typing import Any, NamedTuple, TypeVar, get_args
+from uuid import UUID
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_object_setattr = object.__setattr__
+
+
+class TrustedField(NamedTuple):
+    name: str
+    alias: str | None
+    is_uuid: bool
+    is_required: bool
+    default: Any
+    default_factory: Any
+
+
+def get_trusted_fields(model_class: type[BaseModel]) -> tuple[TrustedField, ...]:
+    """Resolve once per class everything `construct_trusted` needs to know about the model's fields."""
+
+    return tuple(
+        TrustedField(
+            name=field_name,
+            alias=field_info.alias if field_info.alias != field_name else None,
+            is_uuid=_is_uuid_annotation(field_info.annotation),
+            is_required=field_info.is_required(),
+            default=field_info.default,
+            default_factory=field_info.default_factory,
+        )
+        for field_name, field_info in model_class.__pydantic_fields__.items()
+    )
+
+
+def construct_trusted(
+    model_class: type[ModelT], attributes: dict, fields: tuple[TrustedField, ...], partial: bool = False
+) -> ModelT:
+    """
+    Build a model from data written by the ODM itself, skipping the pydantic validation.
+
+    Only the string UUID fields are parsed, missing fields are filled with their defaults and unknown keys
+    are dropped. The instance state is set directly, which is cheaper than both validation and `model_construct`.
+    With `partial`, e.g. for projected reads, missing fields are left unset instead, so accessing them raises.
+    Otherwise, data missing a required field, e.g. a legacy record, falls back to the validated construction.
+    """
+
+    values = {}
+    for field in fields:
+        if field.name in attributes:
+            value = attributes[field.name]
+        elif field.alias is not None and field.alias in attributes:
+            value = attributes[field.alias]
+        elif partial:
+            continue
+        elif field.is_required:
+            return model_class(**attributes)
+        else:
+            values[field.name] = field.default_factory() if field.default_factory is not None else field.default
+
+            continue
+
+        if field.is_uuid and value.__class__ is str:
+            value = parse_uuid(value)
+        values[field.name] = value
+
+    instance = model_class.__new__(model_class)
+    _object_setattr(instance, "__dict__", values)
+    _object_setattr(instance, "__pydantic_fields_set__", set(attributes).intersection(values))
+    _object_setattr(instance, "__pydantic_extra__", None)
+    _object_setattr(instance, "__pydantic_private__", None)
+
+    return instance
+
+
+@lru_cache(maxsize=65536)
+def parse_uuid(value: str) -> UUID:
+    """Parse a UUID string. Memoized, as foreign keys such as `author_id` or `document_id` repeat a lot."""
+
+    return UUID(value)
+
+
+def _is_uuid_annotation(annotation: Any) -> bool:
+    if annotation is UUID:
+        return True
+
+    return any(_is_uuid_annotation(arg) for arg in get_args(annotation))
@@ -1,26 +1,136 @@
+import asyncio
+import itertools
+import json
+import re
+import time
 import uuid
 from abc import ABC
-from typing import Any, Callable, Dict, Generic, Type, TypeVar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, Callable, ClassVar, Dict, Generator, Generic, Iterable, Iterator, NamedTuple, Type, TypeVar
 from uuid import UUID
 
 import numpy as np
 from loguru import logger
 from pydantic import UUID4, BaseModel, Field
 from qdrant_client.http import exceptions
-from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client.http.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CollectionStatus,
+    CreateAlias,
+    CreateAliasOperation,
+    Datatype,
+    DeleteAlias,
+    DeleteAliasOperation,
+    Distance,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    Fusion,
+    FusionQuery,
+    HasIdCondition,
+    HnswConfigDiff,
+    MatchValue,
+    Modifier,
+    NamedVector,
+    OptimizersConfigDiff,
+    PayloadSchemaType,
+    Prefetch,
+    QuantizationConfig,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SearchRequest,
+    SparseVector,
+    SparseVectorParams,
+    VectorParams,
+)
 from qdrant_client.models import CollectionInfo, PointStruct, Record
 
-from llm_engineering.application.networks.embeddings import EmbeddingModelSingleton
+from llm_engineering.application.networks.embeddings import EmbeddingModelSingleton, get_embedding_model
 from llm_engineering.domain.exceptions import ImproperlyConfigured
-from llm_engineering.domain.types import DataCategory
-from llm_engineering.infrastructure.db.qdrant import connection
+from llm_engineering.domain.types import DataCategory, SparseEmbedding, to_embedding_array
+from llm_engineering.infrastructure.db.qdrant import AsyncQdrantDatabaseConnector, connection
+from llm_engineering.infrastructure.db.search_cache import SearchCache, SearchCacheStats, create_search_cache
+from llm_engineering.settings import settings
+
+from .utils import TrustedField, construct_trusted, get_trusted_fields
 
 T = TypeVar("T", bound="VectorBaseDocument")
 
+# Qdrant's default `indexing_threshold`, in kilobytes of vectors.
+DEFAULT_INDEXING_THRESHOLD = 20000
+
+
+class VectorSearchRequest(NamedTuple):
+    document_class: type["VectorBaseDocument"]
+    query_vector: Any
+    query_filter: Filter | None = None
+    limit: int = 10
+    query_sparse_vector: SparseEmbedding | SparseVector | None = None
+
+
+class VectorQuotaSearchRequest(NamedTuple):
+    quotas: dict[type["VectorBaseDocument"], int]
+    query_vector: Any
+    query_filter: Filter | None = None
+    query_sparse_vector: SparseEmbedding | SparseVector | None = None
+
+
+class CollectionSetup(NamedTuple):
+    """The `create_collection` arguments of a collection, and what to write once it is created."""
+
+    create_kwargs: dict[str, Any]
+    payload_indexes: dict[str, PayloadSchemaType]
+    metadata_point: PointStruct | None
+
+
+class VectorDocumentMetadata(NamedTuple):
+    collection_name: str | None
+    category: DataCategory | None
+    has_embedding: bool
+    has_sparse_embedding: bool
+    has_extra_embeddings: bool
+    fields: tuple[str, ...]
+    trusted_fields: tuple[TrustedField, ...]
+
 
 class VectorBaseDocument(BaseModel, Generic[T], ABC):
     id: UUID4 = Field(default_factory=uuid.uuid4)
 
+    # Populated at class-creation time, so lookups never have to reflect on the class hierarchy.
+    _collection_registry: ClassVar[dict[str, type["VectorBaseDocument"]]] = {}
+    _shared_collection_registry: ClassVar[dict[tuple[str, DataCategory], type["VectorBaseDocument"]]] = {}
+    _class_metadata: ClassVar[VectorDocumentMetadata | None] = None
+    # Shared by all the classes. Its keys hold the collection names, so the classes never read each other's results.
+    _search_cache: ClassVar[SearchCache | None] = create_search_cache()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+
+        config = getattr(cls, "Config", None)
+        collection_name = getattr(config, "name", None)
+        shared_collection_name = getattr(config, "shared_collection", None)
+        cls._class_metadata = VectorDocumentMetadata(
+            collection_name=shared_collection_name or collection_name,
+            category=getattr(config, "category", None),
+            has_embedding="embedding" in cls.model_fields,
+            has_sparse_embedding="sparse_embedding" in cls.model_fields,
+            has_extra_embeddings="extra_embeddings" in cls.model_fields,
+            fields=tuple(cls.model_fields),
+            trusted_fields=get_trusted_fields(cls),
+        )
+
+        if collection_name is not None and "Config" in cls.__dict__:
+            VectorBaseDocument._collection_registry[collection_name] = cls
+            if shared_collection_name is not None:
+                VectorBaseDocument._shared_collection_registry[(shared_collection_name, config.category)] = cls
+
     def __eq__(self, value: object) -> bool:
         if not isinstance(value, self.__class__):
             return False
@@ -31,18 +141,93 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
         return hash(self.id)
 
     @classmethod
-    def from_record(cls: Type[T], point: Record) -> T:
+    def from_record(cls: Type[T], point: Record, trusted: bool = False, partial: bool = False) -> T:
+        """
+        Build a document from a Qdrant point.
+
+        Args:
+            point (Record): The Qdrant point.
+            trusted (bool): Whether the payload was written by this ODM and can skip the pydantic validation.
+                Only the UUID fields and the embedding are converted. Defaults to False.
+            partial (bool): Whether the point was read with a projection (see `_pop_projection`). The document
+                only gets the fields found in the point, without validation. Defaults to False.
+
+        Returns:
+            T: The document.
+        """
+
         _id = UUID(point.id, version=4)
         payload = point.payload or {}
+        metadata = cls.get_metadata()
+        if "category" in payload and "category" not in metadata.fields:
+            # Written by classes sharing a collection (see `get_shared_collection_name`).
+            payload = {key: value for key, value in payload.items() if key != "category"}
 
         attributes = {
             "id": _id,
             **payload,
         }
-        if cls._has_class_attribute("embedding"):
-            attributes["embedding"] = point.vector or None
+        vector = point.vector
+        sparse_vector = None
+        extra_vectors = {}
+        if isinstance(vector, dict):
+            # Collections with named or sparse vectors return all of them, the unnamed dense vector being "".
+            *extra_vector_names, sparse_vector_name = [*cls.get_embedding_models()[1:], cls.get_sparse_vector_name()]
+            extra_vectors = {name: vector[name] for name in extra_vector_names if name in vector}
+            sparse_vector = vector.get(sparse_vector_name)
+            vector = vector.get(cls.get_vector_name())
+
+        if metadata.has_embedding and (vector or not partial):
+            attributes["embedding"] = vector or None
+        if metadata.has_sparse_embedding and sparse_vector is not None:
+            attributes["sparse_embedding"] = SparseEmbedding(indices=sparse_vector.indices, values=sparse_vector.values)
+        if metadata.has_extra_embeddings and extra_vectors:
+            attributes["extra_embeddings"] = extra_vectors
+
+        if trusted is False and partial is False:
+            return cls(**attributes)
+
+        if attributes.get("embedding") is not None:
+            attributes["embedding"] = to_embedding_array(attributes["embedding"])
+        if "extra_embeddings" in attributes:
+            attributes["extra_embeddings"] = {
+                name: to_embedding_array(extra_vector) for name, extra_vector in attributes["extra_embeddings"].items()
+            }
+
+        return construct_trusted(cls, attributes, metadata.trusted_fields, partial=partial)
 
-        return cls(**attributes)
+    @classmethod
+    def from_records(
+        cls: Type[T],
+        records: list[Record],
+        trusted: bool = False,
+        projection: tuple[str, ...] | None = None,
+        as_tuples: bool = False,
+    ) -> list[T] | list[tuple]:
+        """
+        Build the documents of Qdrant points read with the arguments popped by `_pop_projection`.
+
+        Args:
+            records (list[Record]): The Qdrant points.
+            trusted (bool): Whether the payloads can skip the pydantic validation. Defaults to False.
+            projection (tuple[str, ...] | None): The projected fields. Defaults to None, the full documents.
+            as_tuples (bool): Whether to return `(id, *projected values)` tuples instead of partial documents.
+                Defaults to False.
+
+        Returns:
+            list[T] | list[tuple]: The documents, or their tuples.
+        """
+
+        if projection is None:
+            return [cls.from_record(record, trusted=trusted) for record in records]
+
+        documents = [cls.from_record(record, partial=True) for record in records]
+        if as_tuples is False:
+            return documents
+
+        fields = ("id", *projection)
+
+        return [tuple(getattr(document, field, None) for field in fields) for document in documents]
 
     def to_point(self: T, **kwargs) -> PointStruct:
         exclude_unset = kwargs.pop("exclude_unset", False)
@@ -51,10 +236,28 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
         payload = self.model_dump(exclude_unset=exclude_unset, by_alias=by_alias, **kwargs)
 
         _id = str(payload.pop("id"))
+        if self.get_shared_collection_name() is not None:
+            payload["category"] = str(self.get_category())
         vector = payload.pop("embedding", {})
-        if vector and isinstance(vector, np.ndarray):
+        if isinstance(vector, np.ndarray):
             vector = vector.tolist()
 
+        sparse_embedding = payload.pop("sparse_embedding", None)
+        extra_embeddings = payload.pop("extra_embeddings", None) or {}
+
+        vectors = {}
+        if vector:
+            vectors[self.get_vector_name()] = vector
+        for model_id in self.get_embedding_models()[1:]:
+            if model_id in extra_embeddings:
+                vectors[model_id] = np.asarray(extra_embeddings[model_id], dtype=np.float32).tolist()
+        sparse_vector_name = self.get_sparse_vector_name()
+        if vectors and sparse_embedding is not None and sparse_vector_name is not None:
+            vectors[sparse_vector_name] = SparseVector(**sparse_embedding)
+
+        if list(vectors) != [""]:
+            vector = vectors
+
         return PointStruct(id=_id, vector=vector, payload=payload)
 
     def model_dump(self: T, **kwargs) -> dict:
@@ -77,7 +280,40 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
         return item
 
     @classmethod
-    def bulk_insert(cls: Type[T], documents: list["VectorBaseDocument"]) -> bool:
+    def bulk_insert(
+        cls: Type[T],
+        documents: list["VectorBaseDocument"],
+        bulk_load: bool = False,
+        defer_indexing: bool = False,
+        wait_for_indexing: bool = False,
+        **kwargs,
+    ) -> bool:
+        """
+        Upserts the documents into the class's collection, creating the collection if it does not exist.
+
+        Args:
+            documents (list[VectorBaseDocument]): The documents to upsert.
+            bulk_load (bool): Whether to split the points into batches and upsert them concurrently
+                (see `_bulk_load`). Defaults to False, which sends all the points in a single blocking request.
+            defer_indexing (bool): Whether to disable the HNSW indexing while bulk loading (see `deferred_indexing`).
+                Only used with `bulk_load`. Defaults to False.
+            wait_for_indexing (bool): Whether to block until the deferred indexing is done. Defaults to False.
+            **kwargs: Extra arguments forwarded to `_bulk_load` (e.g. `batch_size`, `max_batch_bytes`,
+                `max_workers`, `max_retries`).
+
+        Returns:
+            bool: Whether all the documents were inserted successfully.
+        """
+
+        if bulk_load is True:
+            cls.get_or_create_collection()
+
+            if defer_indexing is True:
+                with cls.deferred_indexing(wait=wait_for_indexing):
+                    return cls._bulk_load(documents, **kwargs)
+
+            return cls._bulk_load(documents, **kwargs)
+
         try:
             cls._bulk_insert(documents)
         except exceptions.UnexpectedResponse:
@@ -101,6 +337,181 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
         points = [doc.to_point() for doc in documents]
 
         connection.upsert(collection_name=cls.get_collection_name(), points=points)
+        cls._invalidate_search_cache()
+
+    @classmethod
+    def bulk_insert_points(
+        cls: Type[T],
+        points: list[PointStruct],
+        defer_indexing: bool = False,
+        wait_for_indexing: bool = False,
+        **kwargs,
+    ) -> bool:
+        """
+        Bulk loads already serialized points into the class's collection, creating the collection if it does
+        not exist. It skips the validation and serialization of the documents, e.g. when restoring an export.
+
+        Args:
+            points (list[PointStruct]): The points to upsert, shaped as `to_point` builds them.
+            defer_indexing (bool): Whether to disable the HNSW indexing while loading (see `deferred_indexing`).
+                Defaults to False.
+            wait_for_indexing (bool): Whether to block until the deferred indexing is done. Defaults to False.
+            **kwargs: Extra arguments forwarded to `_bulk_load_points` (e.g. `batch_size`, `max_workers`).
+
+        Returns:
+            bool: Whether all the points were inserted successfully.
+        """
+
+        cls.get_or_create_collection()
+
+        if defer_indexing is True:
+            with cls.deferred_indexing(wait=wait_for_indexing):
+                return cls._bulk_load_points(points, **kwargs)
+
+        return cls._bulk_load_points(points, **kwargs)
+
+    @classmethod
+    def _bulk_load(cls: Type[T], documents: list["VectorBaseDocument"], **kwargs) -> bool:
+        return cls._bulk_load_points([doc.to_point() for doc in documents], **kwargs)
+
+    @classmethod
+    def _bulk_load_points(
+        cls: Type[T],
+        points: list[PointStruct],
+        batch_size: int = 256,
+        max_batch_bytes: int | None = None,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        collection_name: str | None = None,
+    ) -> bool:
+        collection_name = collection_name or cls.get_collection_name()
+        if len(points) == 0:
+            return True
+
+        batches = list(cls._split_points(points, batch_size=batch_size, max_batch_bytes=max_batch_bytes))
+        # Batches are fired with `wait=False`. The last one is sent with `wait=True` only after all the others
+        # were acknowledged, acting as a consistency barrier: Qdrant applies the updates in order.
+        *async_batches, barrier_batch = batches
+
+        start_time = time.perf_counter()
+        failed_batches = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(cls._upsert_batch, collection_name, batch, wait=False, max_retries=max_retries)
+                for batch in async_batches
+            ]
+            for future in as_completed(futures):
+                if future.result() is False:
+                    failed_batches += 1
+
+        if cls._upsert_batch(collection_name, barrier_batch, wait=True, max_retries=max_retries) is False:
+            failed_batches += 1
+        # Even the failed loads may have written some of their batches.
+        cls._invalidate_search_cache(collection_name=collection_name)
+
+        elapsed_time = time.perf_counter() - start_time
+        logger.info(
+            f"Bulk loaded {len(points)} points into '{collection_name}' in {len(batches)} batches.",
+            elapsed_time=round(elapsed_time, 3),
+            points_per_second=round(len(points) / max(elapsed_time, 1e-9), 2),
+            failed_batches=failed_batches,
+        )
+
+        return failed_batches == 0
+
+    @classmethod
+    @contextmanager
+    def deferred_indexing(
+        cls: Type[T], collection_name: str | None = None, wait: bool = False, timeout: float | None = 600.0
+    ) -> Iterator[None]:
+        """
+        Disables the HNSW indexing of the collection for the duration of the block, so a bulk load does not
+        keep rebuilding the graph segment by segment. The indexing threshold is restored on exit, which
+        builds the index once over all the loaded points.
+
+        The setting is collection-wide: writers outside the block are not indexed until it exits.
+
+        Args:
+            collection_name (str | None): The collection to load. Defaults to the class's collection.
+            wait (bool): Whether to block on exit until the optimizers are done (see `wait_for_indexing`).
+                Defaults to False.
+            timeout (float | None): The maximum number of seconds to wait. Defaults to 600.
+        """
+
+        collection_name = collection_name or cls.get_collection_name()
+        optimizer_config = connection.get_collection(collection_name=collection_name).config.optimizer_config
+        indexing_threshold = optimizer_config.indexing_threshold
+        if indexing_threshold is None:
+            indexing_threshold = DEFAULT_INDEXING_THRESHOLD
+
+        connection.update_collection(
+            collection_name=collection_name, optimizers_config=OptimizersConfigDiff(indexing_threshold=0)
+        )
+        logger.info(f"Deferred the indexing of '{collection_name}'.")
+
+        try:
+            yield
+        finally:
+            connection.update_collection(
+                collection_name=collection_name,
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=indexing_threshold),
+            )
+            logger.info(f"Restored the indexing of '{collection_name}'.", indexing_threshold=indexing_threshold)
+
+        if wait is True:
+            cls.wait_for_indexing(collection_name=collection_name, timeout=timeout)
+
+    @classmethod
+    def _upsert_batch(
+        cls: Type[T], collection_name: str, points: list[PointStruct], wait: bool = True, max_retries: int = 3
+    ) -> bool:
+        for attempt in range(max_retries + 1):
+            try:
+                connection.upsert(collection_name=collection_name, points=points, wait=wait)
+
+                return True
+            except (exceptions.UnexpectedResponse, exceptions.ResponseHandlingException):
+                if attempt == max_retries:
+                    break
+
+                logger.warning(f"Failed to upsert a batch of {len(points)} points in '{collection_name}'. Retrying...")
+                time.sleep(0.5 * 2**attempt)
+
+        logger.error(f"Failed to upsert a batch of {len(points)} points in '{collection_name}'.")
+
+        return False
+
+    @classmethod
+    def _split_points(
+        cls: Type[T], points: list[PointStruct], batch_size: int, max_batch_bytes: int | None = None
+    ) -> Generator[list[PointStruct], None, None]:
+        batch, batch_bytes = [], 0
+        for point in points:
+            point_bytes = cls._estimate_point_size(point) if max_batch_bytes is not None else 0
+
+            is_batch_full = len(batch) >= batch_size
+            is_batch_too_large = max_batch_bytes is not None and batch_bytes + point_bytes > max_batch_bytes
+            if batch and (is_batch_full or is_batch_too_large):
+                yield batch
+
+                batch, batch_bytes = [], 0
+
+            batch.append(point)
+            batch_bytes += point_bytes
+
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _estimate_point_size(point: PointStruct) -> int:
+        vectors = point.vector.values() if isinstance(point.vector, dict) else [point.vector]
+        vector_size = sum(
+            len(vector.indices) * 2 if isinstance(vector, SparseVector) else len(vector or []) for vector in vectors
+        )
+        payload_size = len(json.dumps(point.payload, default=str)) if point.payload else 0
+
+        # A float is serialized as ~10 characters in the JSON body of the request.
+        return vector_size * 10 + payload_size
 
     @classmethod
     def bulk_find(cls: Type[T], limit: int = 10, **kwargs) -> tuple[list[T], UUID | None]:
@@ -119,35 +530,230 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
         offset = kwargs.pop("offset", None)
         offset = str(offset) if offset else None
+        trusted = kwargs.pop("trusted", False)
+        projection, as_tuples = cls._pop_projection(kwargs)
 
         records, next_offset = connection.scroll(
             collection_name=collection_name,
+            scroll_filter=cls._filter_by_category(kwargs.pop("scroll_filter", None)),
             limit=limit,
             with_payload=kwargs.pop("with_payload", True),
             with_vectors=kwargs.pop("with_vectors", False),
             offset=offset,
             **kwargs,
         )
-        documents = [cls.from_record(record) for record in records]
+        documents = cls.from_records(records, trusted=trusted, projection=projection, as_tuples=as_tuples)
         if next_offset is not None:
             next_offset = UUID(next_offset, version=4)
 
         return documents, next_offset
 
     @classmethod
-    def search(cls: Type[T], query_vector: list, limit: int = 10, **kwargs) -> list[T]:
+    def scroll_iter(cls: Type[T], batch_size: int = 256, prefetch: bool = True, **kwargs) -> Generator[T, None, None]:
+        """
+        Lazily iterates over all the documents of the collection, page by page.
+
+        Args:
+            batch_size (int): The number of points requested from Qdrant per scroll call. Defaults to 256.
+            prefetch (bool): Whether to fetch the next page on a background thread while the current
+                one is consumed. Defaults to True.
+            **kwargs: Extra arguments forwarded to the scroll call (e.g. `scroll_filter`, `with_vectors`, `trusted`),
+                and `projection` and `as_tuples` to fetch only some fields (see `_pop_projection`).
+
+        Yields:
+            T: The documents of the collection, partial or as tuples when projected.
+        """
+
+        offset = kwargs.pop("offset", None)
+
+        if not prefetch:
+            while True:
+                try:
+                    documents, offset = cls._bulk_find(limit=batch_size, offset=offset, **kwargs)
+                except exceptions.UnexpectedResponse:
+                    logger.error(f"Failed to scroll documents in '{cls.get_collection_name()}'.")
+
+                    return
+
+                yield from documents
+
+                if offset is None:
+                    return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(cls._bulk_find, limit=batch_size, offset=offset, **kwargs)
+            while future is not None:
+                try:
+                    documents, offset = future.result()
+                except exceptions.UnexpectedResponse:
+                    logger.error(f"Failed to scroll documents in '{cls.get_collection_name()}'.")
+
+                    return
+
+                if offset is not None:
+                    future = executor.submit(cls._bulk_find, limit=batch_size, offset=offset, **kwargs)
+                else:
+                    future = None
+
+                yield from documents
+
+    @classmethod
+    def iter_all(cls: Type[T], batch_size: int = 256, prefetch: bool = True, **kwargs) -> Generator[T, None, None]:
+        return cls.scroll_iter(batch_size=batch_size, prefetch=prefetch, **kwargs)
+
+    @classmethod
+    def find_existing_ids(cls: Type[T], ids: list[UUID | str], batch_size: int = 1000) -> set[UUID]:
+        """
+        Checks which of the given point IDs are already stored in the collection.
+        Only the IDs are requested, without any payload or vector.
+
+        Args:
+            ids (list[UUID | str]): The point IDs to check.
+            batch_size (int): The number of IDs checked per request. Defaults to 1000.
+
+        Returns:
+            set[UUID]: The subset of IDs that exist in the collection.
+        """
+
+        collection_name = cls.get_collection_name()
+        if len(ids) == 0 or not connection.collection_exists(collection_name=collection_name):
+            return set()
+
+        # In a shared collection, the same ID could belong to another category.
+        is_shared = cls.get_shared_collection_name() is not None
+        category = str(cls.get_category()) if is_shared else None
+
+        existing_ids = set()
+        for i in range(0, len(ids), batch_size):
+            records = connection.retrieve(
+                collection_name=collection_name,
+                ids=[str(_id) for _id in ids[i : i + batch_size]],
+                with_payload=["category"] if is_shared else False,
+                with_vectors=False,
+            )
+            existing_ids.update(
+                UUID(str(record.id))
+                for record in records
+                if not is_shared or record.payload.get("category") == category
+            )
+
+        return existing_ids
+
+    @classmethod
+    def delete_stale(cls: Type[T], documents: list["VectorBaseDocument"], key: str = "document_id") -> bool:
+        """
+        Synchronizes the collection with freshly produced documents, e.g. the chunks of re-processed source
+        documents. For every `key` value found in `documents`, deletes the points with that value whose IDs
+        are not among the fresh ones. It runs as a single filtered delete call.
+
+        Args:
+            documents (list[VectorBaseDocument]): The fresh documents, with the same IDs as their points.
+            key (str): The payload field identifying a source document. Defaults to "document_id".
+
+        Returns:
+            bool: Whether the stale points were deleted successfully.
+        """
+
+        collection_name = cls.get_collection_name()
+        grouped_documents = cls._group_by(documents, selector=lambda doc: str(getattr(doc, key)))
+        if len(grouped_documents) == 0 or not connection.collection_exists(collection_name=collection_name):
+            return True
+
+        category_filter = cls._filter_by_category(None)
+        stale_points_filter = Filter(
+            must=[category_filter] if category_filter is not None else None,
+            should=[
+                Filter(
+                    must=[FieldCondition(key=key, match=MatchValue(value=value))],
+                    must_not=[HasIdCondition(has_id=[str(doc.id) for doc in fresh_documents])],
+                )
+                for value, fresh_documents in grouped_documents.items()
+            ],
+        )
         try:
-            documents = cls._search(query_vector=query_vector, limit=limit, **kwargs)
+            connection.delete(
+                collection_name=collection_name, points_selector=FilterSelector(filter=stale_points_filter), wait=True
+            )
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to delete the stale points of '{collection_name}'.")
+
+            return False
+        finally:
+            cls._invalidate_search_cache()
+
+        logger.info(f"Deleted the stale points of {len(grouped_documents)} documents from '{collection_name}'.")
+
+        return True
+
+    @classmethod
+    def search(
+        cls: Type[T],
+        query_vector: list,
+        limit: int = 10,
+        query_sparse_vector: SparseEmbedding | SparseVector | None = None,
+        **kwargs,
+    ) -> list[T]:
+        """
+        Searches the class's collection for the points closest to the query vector.
+
+        Args:
+            query_vector (list): The query embedding.
+            limit (int): The number of documents to return. Defaults to 10.
+            query_sparse_vector (SparseEmbedding | SparseVector | None): The sparse query embedding. When set,
+                the search runs in hybrid mode: the dense and sparse candidates are fused server-side
+                (see `_build_hybrid_query_request`). Defaults to None, a dense-only search.
+            **kwargs: Extra arguments forwarded to the search call. Besides the Qdrant ones, it accepts
+                `hnsw_ef`, `exact`, `oversampling` and `rescore` to tune the search per query, `using` to pick
+                the named vector of an embedding model (see `get_vector_name`), `prefetch_limit` and
+                `fusion` to tune the hybrid mode, `projection` and `as_tuples` to fetch only some fields
+                (see `_pop_projection`), and `use_cache=False` to bypass the search cache (see `set_search_cache`).
+
+        Returns:
+            list[T]: The retrieved documents, partial or as tuples when projected.
+        """
+
+        request = VectorSearchRequest(
+            cls,
+            query_vector,
+            query_filter=kwargs.pop("query_filter", None),
+            limit=limit,
+            query_sparse_vector=query_sparse_vector,
+        )
+        cache_keys, (documents,) = cls._get_cached_results([request], kwargs)
+        if documents is not None:
+            return documents
+
+        try:
+            if query_sparse_vector is not None:
+                documents = cls._query_batch([request], **kwargs)[0]
+            else:
+                documents = cls._search(
+                    query_vector=query_vector, limit=limit, query_filter=request.query_filter, **kwargs
+                )
         except exceptions.UnexpectedResponse:
             logger.error(f"Failed to search documents in '{cls.get_collection_name()}'.")
 
-            documents = []
+            return []
+
+        cls._set_cached_results(cache_keys, [documents])
 
         return documents
 
     @classmethod
     def _search(cls: Type[T], query_vector: list, limit: int = 10, **kwargs) -> list[T]:
         collection_name = cls.get_collection_name()
+        vector_name = cls.get_vector_name(kwargs.pop("using", None))
+        if vector_name:
+            query_vector = NamedVector(name=vector_name, vector=np.asarray(query_vector, dtype=np.float32).tolist())
+        kwargs["query_filter"] = cls._filter_by_category(kwargs.pop("query_filter", None))
+        projection, as_tuples = cls._pop_projection(kwargs)
+        kwargs["search_params"] = cls._build_search_params(
+            search_params=kwargs.pop("search_params", None),
+            hnsw_ef=kwargs.pop("hnsw_ef", None),
+            exact=kwargs.pop("exact", False),
+            oversampling=kwargs.pop("oversampling", None),
+            rescore=kwargs.pop("rescore", None),
+        )
         records = connection.search(
             collection_name=collection_name,
             query_vector=query_vector,
@@ -156,17 +762,564 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
             with_vectors=kwargs.pop("with_vectors", False),
             **kwargs,
         )
-        documents = [cls.from_record(record) for record in records]
+        documents = cls.from_records(records, projection=projection, as_tuples=as_tuples)
 
         return documents
 
     @classmethod
-    def get_or_create_collection(cls: Type[T]) -> CollectionInfo:
+    def search_groups(
+        cls: Type[T],
+        query_vector: list,
+        group_by: str = "document_id",
+        limit: int = 10,
+        group_size: int = 1,
+        query_sparse_vector: SparseEmbedding | SparseVector | None = None,
+        **kwargs,
+    ) -> list[list[T]]:
+        """
+        Searches the class's collection and groups the hits by a payload field, e.g. to retrieve the top
+        `limit` source documents with their best `group_size` chunks each, instead of neighbouring chunks
+        of the same document crowding the results.
+
+        Args:
+            query_vector (list): The query embedding.
+            group_by (str): The (keyword-indexed) payload field to group by. Defaults to "document_id".
+            limit (int): The number of groups to return. Defaults to 10.
+            group_size (int): The maximum number of documents per group. Defaults to 1.
+            query_sparse_vector (SparseEmbedding | SparseVector | None): The sparse query embedding of a hybrid
+                search (see `search`). Defaults to None.
+            **kwargs: The same extra arguments as `search` (e.g. `query_filter`, `hnsw_ef`, `using`).
+
+        Returns:
+            list[list[T]]: The documents of each group, from the best group to the worst.
+        """
+
+        try:
+            groups = cls._search_groups(
+                query_vector=query_vector,
+                group_by=group_by,
+                limit=limit,
+                group_size=group_size,
+                query_sparse_vector=query_sparse_vector,
+                **kwargs,
+            )
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to search document groups in '{cls.get_collection_name()}'.")
+
+            groups = []
+
+        return groups
+
+    @classmethod
+    def _search_groups(
+        cls: Type[T],
+        query_vector: list,
+        group_by: str,
+        limit: int,
+        group_size: int,
+        query_sparse_vector: SparseEmbedding | SparseVector | None = None,
+        **kwargs,
+    ) -> list[list[T]]:
+        collection_name = cls.get_collection_name()
+        query_filter = kwargs.pop("query_filter", None)
+
+        if query_sparse_vector is None:
+            vector_name = cls.get_vector_name(kwargs.pop("using", None))
+            query_vector = np.asarray(query_vector, dtype=np.float32).tolist()
+            search_params = cls._build_search_params(
+                search_params=kwargs.pop("search_params", None),
+                hnsw_ef=kwargs.pop("hnsw_ef", None),
+                exact=kwargs.pop("exact", False),
+                oversampling=kwargs.pop("oversampling", None),
+                rescore=kwargs.pop("rescore", None),
+            )
+            result = connection.search_groups(
+                collection_name=collection_name,
+                query_vector=NamedVector(name=vector_name, vector=query_vector) if vector_name else query_vector,
+                group_by=group_by,
+                query_filter=cls._filter_by_category(query_filter),
+                search_params=search_params,
+                limit=limit,
+                group_size=group_size,
+                with_payload=kwargs.pop("with_payload", True),
+                with_vectors=kwargs.pop("with_vectors", False),
+                **kwargs,
+            )
+        else:
+            # Every group needs up to `group_size` candidates, so the prefetches are sized for all of them.
+            request = VectorSearchRequest(cls, query_vector, query_filter, limit * group_size, query_sparse_vector)
+            query_request = cls._build_query_requests([request], **kwargs)[0]
+            result = connection.query_points_groups(
+                collection_name=collection_name,
+                group_by=group_by,
+                prefetch=query_request.prefetch,
+                query=query_request.query,
+                limit=limit,
+                group_size=group_size,
+                with_payload=query_request.with_payload,
+                with_vectors=query_request.with_vector,
+            )
+
+        return [[cls.from_record(hit) for hit in group.hits] for group in result.groups]
+
+    @classmethod
+    def search_groups_batch(
+        cls,
+        requests: list[VectorSearchRequest | tuple],
+        group_by: str = "document_id",
+        group_size: int = 1,
+        max_workers: int | None = None,
+        **kwargs,
+    ) -> list[list[list["VectorBaseDocument"]]]:
+        """
+        Runs many grouped searches concurrently. Qdrant has no batch endpoint for grouped searches,
+        so each request is a round trip, issued from a thread pool.
+
+        Args:
+            requests (list[VectorSearchRequest | tuple]): The search requests. Their limit is the number of groups.
+            group_by (str): The payload field to group by. Defaults to "document_id".
+            group_size (int): The maximum number of documents per group. Defaults to 1.
+            max_workers (int | None): The maximum number of concurrent searches. Defaults to one per request.
+            **kwargs: Search arguments applied to all the requests (see `search_groups`).
+
+        Returns:
+            list[list[list[VectorBaseDocument]]]: The groups of each request, in the order of the requests.
+        """
+
+        requests = [VectorSearchRequest(*request) for request in requests]
+        if len(requests) == 0:
+            return []
+
+        def _search_groups(request: VectorSearchRequest) -> list[list[VectorBaseDocument]]:
+            return request.document_class.search_groups(
+                request.query_vector,
+                group_by=group_by,
+                limit=request.limit,
+                group_size=group_size,
+                query_sparse_vector=request.query_sparse_vector,
+                query_filter=request.query_filter,
+                **kwargs,
+            )
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(requests)) as executor:
+            return list(executor.map(_search_groups, requests))
+
+    @classmethod
+    def search_with_quotas(
+        cls, requests: list[VectorQuotaSearchRequest | tuple], **kwargs
+    ) -> list[list["VectorBaseDocument"]]:
+        """
+        Searches several document classes sharing one collection (see `get_shared_collection_name`) with a single
+        query per request. Each class is a prefetch filtered on its category and limited to its quota, and the
+        prefetches are merged server-side, so all the requests cost one round trip.
+
+        Args:
+            requests (list[VectorQuotaSearchRequest | tuple]): The (quotas, query_vector, query_filter,
+                query_sparse_vector) search requests, `quotas` mapping each document class to its number of results.
+            **kwargs: Search tuning arguments applied to all the requests (see `search`).
+
+        Returns:
+            list[list[VectorBaseDocument]]: The retrieved documents of each request, in the order of the requests.
+        """
+
+        requests = [VectorQuotaSearchRequest(*request) for request in requests]
+        if len(requests) == 0:
+            return []
+
+        collection_names = {
+            document_class.get_collection_name() for request in requests for document_class in request.quotas
+        }
+        if len(collection_names) != 1:
+            raise ImproperlyConfigured("Quota searches require all the document classes to share one collection.")
+        collection_name = collection_names.pop()
+
+        query_requests = []
+        for request in requests:
+            prefetches = []
+            for document_class, quota in request.quotas.items():
+                search_request = VectorSearchRequest(
+                    document_class, request.query_vector, request.query_filter, quota, request.query_sparse_vector
+                )
+                category_request = document_class._build_query_requests([search_request], **kwargs)[0]
+                prefetches.append(
+                    Prefetch(
+                        prefetch=category_request.prefetch,
+                        query=category_request.query,
+                        using=category_request.using,
+                        filter=category_request.filter,
+                        params=category_request.params,
+                        limit=quota,
+                    )
+                )
+
+            query_requests.append(
+                QueryRequest(
+                    prefetch=prefetches,
+                    query=FusionQuery(fusion=Fusion.RRF),
+                    limit=sum(request.quotas.values()),
+                    offset=0,
+                    with_payload=kwargs.get("with_payload", True),
+                    with_vector=kwargs.get("with_vectors", False),
+                )
+            )
+
+        try:
+            responses = connection.query_batch_points(collection_name=collection_name, requests=query_requests)
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to search documents in '{collection_name}'.")
+
+            return [[] for _ in requests]
+
+        return [
+            [
+                cls.collection_name_to_class(collection_name, category=point.payload["category"]).from_record(point)
+                for point in response.points
+            ]
+            for response in responses
+        ]
+
+    @classmethod
+    def search_batch(
+        cls, requests: list[VectorSearchRequest | tuple], max_workers: int | None = None, **kwargs
+    ) -> list[list["VectorBaseDocument"]]:
+        """
+        Runs many searches, possibly over different collections, with one Qdrant round trip per collection.
+
+        The requests are grouped by collection, each group is sent as a single Qdrant `search_batch` call,
+        and the groups are issued concurrently.
+
+        Args:
+            requests (list[VectorSearchRequest | tuple]): The (document_class, query_vector, query_filter, limit,
+                query_sparse_vector) search requests. The ones with a sparse vector run in hybrid mode.
+            max_workers (int | None): The maximum number of collections queried concurrently. Defaults to one
+                worker per collection.
+            **kwargs: Search tuning arguments applied to all the requests (`hnsw_ef`, `exact`, `oversampling`,
+                `rescore`, `using`, `with_payload`, `with_vectors`, `projection`, `as_tuples`).
+
+        Returns:
+            list[list[VectorBaseDocument]]: The retrieved documents of each request, in the order of the requests.
+        """
+
+        requests = [VectorSearchRequest(*request) for request in requests]
+        grouped_request_indices = cls._group_by(
+            list(range(len(requests))), selector=lambda idx: requests[idx].document_class
+        )
+
+        results: list[list[VectorBaseDocument]] = [[] for _ in requests]
+        if len(grouped_request_indices) == 0:
+            return results
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(grouped_request_indices)) as executor:
+            future_to_indices = {
+                executor.submit(
+                    document_class._search_batch, [requests[idx] for idx in request_indices], **kwargs
+                ): request_indices
+                for document_class, request_indices in grouped_request_indices.items()
+            }
+            for future in as_completed(future_to_indices):
+                for idx, documents in zip(future_to_indices[future], future.result(), strict=True):
+                    results[idx] = documents
+
+        return results
+
+    @classmethod
+    def _search_batch(cls: Type[T], requests: list[VectorSearchRequest], **kwargs) -> list[list[T]]:
         collection_name = cls.get_collection_name()
+        cache_keys, results = cls._get_cached_results(requests, kwargs)
+        missed_indices = [idx for idx, documents in enumerate(results) if documents is None]
+        if len(missed_indices) == 0:
+            return results
 
+        missed_requests = [requests[idx] for idx in missed_indices]
         try:
-            return connection.get_collection(collection_name=collection_name)
+            if any(request.query_sparse_vector is not None for request in missed_requests):
+                missed_results = cls._query_batch(missed_requests, **kwargs)
+            else:
+                projection, as_tuples = cls._pop_projection(kwargs)
+                search_requests = cls._build_search_requests(missed_requests, **kwargs)
+                batch_records = connection.search_batch(collection_name=collection_name, requests=search_requests)
+                missed_results = [
+                    cls.from_records(records, projection=projection, as_tuples=as_tuples) for records in batch_records
+                ]
         except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to search documents in '{collection_name}'.")
+
+            return [documents if documents is not None else [] for documents in results]
+
+        return cls._merge_cached_results(cache_keys, results, missed_indices, missed_results)
+
+    @classmethod
+    def _query_batch(cls: Type[T], requests: list[VectorSearchRequest], **kwargs) -> list[list[T]]:
+        projection, as_tuples = cls._pop_projection(kwargs)
+        query_requests = cls._build_query_requests(requests, **kwargs)
+        responses = connection.query_batch_points(collection_name=cls.get_collection_name(), requests=query_requests)
+
+        return [cls.from_records(response.points, projection=projection, as_tuples=as_tuples) for response in responses]
+
+    @classmethod
+    def set_search_cache(cls, search_cache: SearchCache | None) -> None:
+        """
+        Replaces the cache of the search results, shared by all the classes. It defaults to the one selected
+        by the `VECTOR_SEARCH_CACHE` setting.
+
+        Only `search`, `search_batch` and their async versions are cached. The results of a collection are
+        invalidated by the ODM's writes to it (`bulk_insert`, `delete_stale`, reindexing...), through its
+        generation in the cache backend. A shared backend invalidates them for all the processes.
+
+        Args:
+            search_cache (SearchCache | None): The cache, e.g. over a custom `SearchCacheBackend`. None disables it.
+        """
+
+        VectorBaseDocument._search_cache = search_cache
+
+    @classmethod
+    def get_search_cache_stats(cls) -> SearchCacheStats | None:
+        """Returns the hits and misses of the search cache in this process, or None when it is disabled."""
+
+        search_cache = VectorBaseDocument._search_cache
+
+        return search_cache.stats() if search_cache is not None else None
+
+    @classmethod
+    def _get_cached_results(
+        cls: Type[T], requests: list[VectorSearchRequest], kwargs: dict
+    ) -> tuple[list[str] | None, list[list[T] | None]]:
+        """
+        Looks the search requests up in the search cache, popping `use_cache` from their `kwargs`.
+
+        Returns:
+            tuple[list[str] | None, list[list[T] | None]]: The cache keys of the requests, None when the
+                cache is not used, and their cached results, None for the misses.
+        """
+
+        search_cache = VectorBaseDocument._search_cache
+        if kwargs.pop("use_cache", True) is False or search_cache is None:
+            return None, [None for _ in requests]
+
+        collection_name = cls.get_collection_name()
+        # Read before searching: a write racing with the search bumps the generation past its results.
+        generation = search_cache.get_generation(collection_name)
+        cache_keys = [
+            search_cache.build_key(
+                collection_name,
+                generation,
+                request.query_vector,
+                document_class=cls.__name__,
+                query_filter=request.query_filter,
+                limit=request.limit,
+                query_sparse_vector=request.query_sparse_vector,
+                **kwargs,
+            )
+            for request in requests
+        ]
+
+        return cache_keys, [search_cache.get(cache_key) for cache_key in cache_keys]
+
+    @classmethod
+    def _set_cached_results(cls: Type[T], cache_keys: list[str] | None, results: list[list[T]]) -> None:
+        search_cache = VectorBaseDocument._search_cache
+        if cache_keys is None or search_cache is None:
+            return
+
+        for cache_key, documents in zip(cache_keys, results, strict=True):
+            search_cache.set(cache_key, documents)
+
+    @classmethod
+    def _merge_cached_results(
+        cls: Type[T],
+        cache_keys: list[str] | None,
+        results: list[list[T] | None],
+        missed_indices: list[int],
+        missed_results: list[list[T]],
+    ) -> list[list[T]]:
+        if cache_keys is not None:
+            cls._set_cached_results([cache_keys[idx] for idx in missed_indices], missed_results)
+
+        for idx, documents in zip(missed_indices, missed_results, strict=True):
+            results[idx] = documents
+
+        return results
+
+    @classmethod
+    def _invalidate_search_cache(cls: Type[T], collection_name: str | None = None) -> None:
+        search_cache = VectorBaseDocument._search_cache
+        if search_cache is not None:
+            search_cache.invalidate(collection_name or cls.get_collection_name())
+
+    @classmethod
+    def _pop_projection(cls: Type[T], kwargs: dict) -> tuple[tuple[str, ...] | None, bool]:
+        """
+        Pops the projection arguments of a read from its `kwargs`:
+            - `projection`: the document fields to fetch. Only their payload keys are requested, and partial
+                documents are returned, without validation. The vector fields still depend on `with_vectors`.
+            - `as_tuples`: whether to return lightweight `(id, *projected values)` tuples instead. Without a
+                projection, only the IDs are fetched.
+        With a projection, `with_payload` is replaced in `kwargs` by the matching include list.
+
+        Returns:
+            tuple[tuple[str, ...] | None, bool]: The projection and `as_tuples`, to pass to `from_records`.
+        """
+
+        projection = kwargs.pop("projection", None)
+        as_tuples = kwargs.pop("as_tuples", False)
+        if as_tuples and projection is None:
+            projection = ()
+        if projection is None:
+            return None, False
+
+        projection = tuple(projection)
+        vector_fields = {"embedding", "sparse_embedding", "extra_embeddings"}
+        aliases = {field.name: field.alias or field.name for field in cls.get_metadata().trusted_fields}
+        payload_keys = [
+            aliases.get(field, field) for field in projection if field != "id" and field not in vector_fields
+        ]
+        kwargs["with_payload"] = payload_keys or False
+
+        return projection, as_tuples
+
+    @classmethod
+    def _build_search_requests(cls: Type[T], requests: list[VectorSearchRequest], **kwargs) -> list[SearchRequest]:
+        search_params = cls._build_search_params(
+            search_params=kwargs.pop("search_params", None),
+            hnsw_ef=kwargs.pop("hnsw_ef", None),
+            exact=kwargs.pop("exact", False),
+            oversampling=kwargs.pop("oversampling", None),
+            rescore=kwargs.pop("rescore", None),
+        )
+        vector_name = cls.get_vector_name(kwargs.pop("using", None))
+        with_payload = kwargs.pop("with_payload", True)
+        with_vectors = kwargs.pop("with_vectors", False)
+
+        def _to_query_vector(query_vector: Any) -> list[float] | NamedVector:
+            query_vector = np.asarray(query_vector, dtype=np.float32).tolist()
+
+            return NamedVector(name=vector_name, vector=query_vector) if vector_name else query_vector
+
+        return [
+            SearchRequest(
+                vector=_to_query_vector(request.query_vector),
+                filter=cls._filter_by_category(request.query_filter),
+                limit=request.limit,
+                params=search_params,
+                with_payload=with_payload,
+                with_vector=with_vectors,
+            )
+            for request in requests
+        ]
+
+    @classmethod
+    def _build_query_requests(cls: Type[T], requests: list[VectorSearchRequest], **kwargs) -> list[QueryRequest]:
+        search_params = cls._build_search_params(
+            search_params=kwargs.pop("search_params", None),
+            hnsw_ef=kwargs.pop("hnsw_ef", None),
+            exact=kwargs.pop("exact", False),
+            oversampling=kwargs.pop("oversampling", None),
+            rescore=kwargs.pop("rescore", None),
+        )
+        vector_name = cls.get_vector_name(kwargs.pop("using", None)) or None
+        prefetch_limit = kwargs.pop("prefetch_limit", None)
+        fusion = Fusion(kwargs.pop("fusion", Fusion.RRF))
+        with_payload = kwargs.pop("with_payload", True)
+        with_vectors = kwargs.pop("with_vectors", False)
+
+        query_requests = []
+        for request in requests:
+            query_vector = np.asarray(request.query_vector, dtype=np.float32).tolist()
+            query_filter = cls._filter_by_category(request.query_filter)
+            if request.query_sparse_vector is None:
+                query_request = QueryRequest(
+                    query=query_vector, using=vector_name, filter=query_filter, params=search_params
+                )
+            else:
+                query_request = cls._build_hybrid_query_request(
+                    query_vector,
+                    request.query_sparse_vector,
+                    vector_name=vector_name,
+                    query_filter=query_filter,
+                    prefetch_limit=prefetch_limit or 4 * request.limit,
+                    fusion=fusion,
+                    search_params=search_params,
+                )
+
+            query_request.limit = request.limit
+            query_request.offset = 0
+            query_request.with_payload = with_payload
+            query_request.with_vector = with_vectors
+            query_requests.append(query_request)
+
+        return query_requests
+
+    @classmethod
+    def _build_hybrid_query_request(
+        cls: Type[T],
+        query_vector: list[float],
+        query_sparse_vector: SparseEmbedding | SparseVector,
+        vector_name: str | None,
+        query_filter: Filter | None,
+        prefetch_limit: int,
+        fusion: Fusion = Fusion.RRF,
+        search_params: SearchParams | None = None,
+    ) -> QueryRequest:
+        """
+        The dense and sparse vectors each prefetch `prefetch_limit` filtered candidates, which Qdrant then fuses
+        (Reciprocal Rank Fusion by default), so a chunk matching the query's exact terms can surface even when
+        its dense similarity is low.
+        """
+
+        sparse_vector_name = cls.get_sparse_vector_name()
+        if sparse_vector_name is None:
+            raise ImproperlyConfigured(
+                f"'{cls.__name__}' does not define a sparse vector. Set the 'sparse_vector' property of its Config."
+            )
+
+        return QueryRequest(
+            prefetch=[
+                Prefetch(
+                    query=query_vector,
+                    using=vector_name,
+                    filter=query_filter,
+                    limit=prefetch_limit,
+                    params=search_params,
+                ),
+                Prefetch(
+                    query=SparseVector(indices=query_sparse_vector.indices, values=query_sparse_vector.values),
+                    using=sparse_vector_name,
+                    filter=query_filter,
+                    limit=prefetch_limit,
+                ),
+            ],
+            query=FusionQuery(fusion=fusion),
+        )
+
+    @classmethod
+    def _build_search_params(
+        cls: Type[T],
+        search_params: SearchParams | None = None,
+        hnsw_ef: int | None = None,
+        exact: bool = False,
+        oversampling: float | None = None,
+        rescore: bool | None = None,
+    ) -> SearchParams | None:
+        if search_params is not None:
+            return search_params
+
+        if rescore is None and cls.get_quantization_config() is not None:
+            rescore = cls._get_config_attribute("quantization_rescore", True)
+
+        quantization_params = None
+        if oversampling is not None or rescore is not None:
+            quantization_params = QuantizationSearchParams(oversampling=oversampling, rescore=rescore)
+
+        if hnsw_ef is None and exact is False and quantization_params is None:
+            return None
+
+        return SearchParams(hnsw_ef=hnsw_ef, exact=exact, quantization=quantization_params)
+
+    @classmethod
+    def get_or_create_collection(cls: Type[T]) -> CollectionInfo:
+        collection_name = cls.get_collection_name()
+
+        if not connection.collection_exists(collection_name=collection_name):
             use_vector_index = cls.get_use_vector_index()
 
             collection_created = cls._create_collection(
@@ -174,8 +1327,10 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
             )
             if collection_created is False:
                 raise RuntimeError(f"Couldn't create collection {collection_name}") from None
+        else:
+            cls.create_payload_indexes(collection_name=collection_name)
 
-            return connection.get_collection(collection_name=collection_name)
+        return connection.get_collection(collection_name=collection_name)
 
     @classmethod
     def create_collection(cls: Type[T]) -> bool:
@@ -186,12 +1341,562 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
     @classmethod
     def _create_collection(cls, collection_name: str, use_vector_index: bool = True) -> bool:
+        setup = cls._build_collection_setup(collection_name=collection_name, use_vector_index=use_vector_index)
+
+        collection_created = connection.create_collection(collection_name=collection_name, **setup.create_kwargs)
+        if collection_created is True:
+            for field_name, field_schema in setup.payload_indexes.items():
+                connection.create_payload_index(
+                    collection_name=collection_name, field_name=field_name, field_schema=field_schema, wait=True
+                )
+            if setup.metadata_point is not None:
+                cls._save_collection_metadata_point(setup.metadata_point)
+
+        return collection_created
+
+    @classmethod
+    def _build_collection_setup(cls: Type[T], collection_name: str, use_vector_index: bool = True) -> CollectionSetup:
+        """
+        Builds the creation arguments and the post-creation writes of a collection, shared by the sync and
+        async APIs: the dense and sparse vectors with their HNSW and quantization settings, `on_disk_payload`,
+        the payload indexes and the metadata point.
+
+        Args:
+            collection_name (str): The physical collection.
+            use_vector_index (bool): Whether the collection stores vectors. Defaults to True.
+
+        Returns:
+            CollectionSetup: The collection's setup.
+        """
+
         if use_vector_index is True:
-            vectors_config = VectorParams(size=EmbeddingModelSingleton().embedding_size, distance=Distance.COSINE)
+            vectors_config = cls.get_vector_params()
+            sparse_vectors_config = cls.get_sparse_vectors_config()
+            quantization_config = cls.get_quantization_config()
         else:
             vectors_config = {}
+            sparse_vectors_config = None
+            quantization_config = None
+
+        collection_metadata = cls.build_collection_metadata()
+
+        return CollectionSetup(
+            create_kwargs={
+                "vectors_config": vectors_config,
+                "sparse_vectors_config": sparse_vectors_config,
+                "quantization_config": quantization_config,
+                "on_disk_payload": cls._get_config_attribute("on_disk_payload", None),
+            },
+            payload_indexes=cls.get_payload_indexes(),
+            metadata_point=(
+                cls._to_collection_metadata_point(collection_name, collection_metadata) if collection_metadata else None
+            ),
+        )
+
+    @classmethod
+    def create_payload_indexes(cls: Type[T], collection_name: str | None = None) -> list[str]:
+        """
+        Creates the payload indexes declared in `Config.payload_indexes` that are missing from the collection.
+
+        Args:
+            collection_name (str | None): The collection to index. Defaults to the class's collection.
+
+        Returns:
+            list[str]: The names of the newly indexed payload fields.
+        """
+
+        collection_name = collection_name or cls.get_collection_name()
+        payload_indexes = cls.get_payload_indexes()
+        if len(payload_indexes) == 0:
+            return []
+
+        payload_schema = connection.get_collection(collection_name=collection_name).payload_schema or {}
+
+        indexed_fields = []
+        for field_name, field_schema in cls._get_missing_payload_indexes(payload_indexes, payload_schema).items():
+            connection.create_payload_index(
+                collection_name=collection_name, field_name=field_name, field_schema=field_schema, wait=True
+            )
+            indexed_fields.append(field_name)
+
+        if len(indexed_fields) > 0:
+            logger.info(f"Created payload indexes on '{collection_name}'.", fields=indexed_fields)
+
+        return indexed_fields
+
+    @staticmethod
+    def _get_missing_payload_indexes(
+        payload_indexes: dict[str, PayloadSchemaType], payload_schema: dict
+    ) -> dict[str, PayloadSchemaType]:
+        return {
+            field_name: field_schema
+            for field_name, field_schema in payload_indexes.items()
+            if field_name not in payload_schema
+        }
+
+    # --- Blue/green reindexing: `Config.name` becomes an alias to the live `<name>__vN` collection, so ---
+    # --- every read and write going through `get_collection_name()` follows the swap. ---
+
+    @classmethod
+    def reindex(
+        cls: Type[T],
+        documents: Iterable["VectorBaseDocument"],
+        keep_versions: int = 1,
+        wait_timeout: float | None = 600.0,
+        documents_per_load: int = 4096,
+        **kwargs,
+    ) -> str:
+        """
+        Loads the documents into a new version of the collection, with the indexing deferred, and switches
+        the alias to it once indexed. Queries keep hitting the previous version until the swap, which is atomic
+        (except on the first reindex of a collection created before the versioning, see `swap_collection_alias`).
+        If the loading fails, or the indexing is not done within `wait_timeout`, the new version is deleted and
+        the alias is left unchanged.
+
+        Args:
+            documents (Iterable[VectorBaseDocument]): All the documents of the new version, e.g. a generator, so
+                they don't have to fit in memory. For a shared collection, the documents of all the classes
+                sharing it.
+            keep_versions (int): The number of previous versions kept for rollbacks. Defaults to 1.
+            wait_timeout (float | None): The maximum number of seconds to wait for the indexing before the
+                swap. None waits indefinitely. Defaults to 600.
+            documents_per_load (int): The number of documents consumed per bulk load. Defaults to 4096.
+            **kwargs: Extra arguments forwarded to `_bulk_load` (e.g. `batch_size`, `max_workers`).
+
+        Returns:
+            str: The name of the new live collection.
+        """
+
+        collection_name = cls.create_collection_version()
+
+        documents = iter(documents)
+        loaded = indexed = False
+        try:
+            # The new version is not live yet, so it is loaded at full speed and indexed once at the end.
+            with cls.deferred_indexing(collection_name=collection_name):
+                loaded = True
+                while loaded and (load_documents := list(itertools.islice(documents, documents_per_load))):
+                    loaded = cls._bulk_load(load_documents, collection_name=collection_name, **kwargs)
+
+            indexed = loaded and cls.wait_for_indexing(collection_name=collection_name, timeout=wait_timeout)
+        finally:
+            # Also when the documents' generator failed: a partial or unindexed version is never made live.
+            if indexed is False:
+                connection.delete_collection(collection_name=collection_name)
+                cls.delete_collection_metadata(collection_name=collection_name)
+
+        if loaded is False:
+            raise RuntimeError(f"Failed to load the documents in '{collection_name}'. The alias was left unchanged.")
+        if indexed is False:
+            raise RuntimeError(
+                f"'{collection_name}' was not indexed within {wait_timeout} seconds. The alias was left unchanged."
+            )
+
+        cls.swap_collection_alias(collection_name)
+        cls.delete_collection_versions(keep=keep_versions)
+
+        return collection_name
+
+    @classmethod
+    def get_collection_versions(cls: Type[T]) -> list[str]:
+        """Returns the `<name>__vN` collections of the class, from the oldest to the newest."""
+
+        version_pattern = re.compile(rf"^{re.escape(cls.get_collection_name())}__v(\d+)$")
+
+        versions = []
+        for collection in connection.get_collections().collections:
+            match = version_pattern.match(collection.name)
+            if match is not None:
+                versions.append((int(match.group(1)), collection.name))
+
+        return [collection_name for _, collection_name in sorted(versions)]
+
+    @classmethod
+    def get_live_collection_name(cls: Type[T]) -> str | None:
+        """Returns the collection the alias points to, or None if `Config.name` is not an alias."""
+
+        alias_name = cls.get_collection_name()
+        for alias in connection.get_aliases().aliases:
+            if alias.alias_name == alias_name:
+                return alias.collection_name
+
+        return None
+
+    @classmethod
+    def create_collection_version(cls: Type[T]) -> str:
+        versions = cls.get_collection_versions()
+        version = int(versions[-1].rsplit("__v", 1)[1]) + 1 if versions else 1
+        collection_name = f"{cls.get_collection_name()}__v{version}"
+
+        collection_created = cls._create_collection(
+            collection_name=collection_name, use_vector_index=cls.get_use_vector_index()
+        )
+        if collection_created is False:
+            raise RuntimeError(f"Couldn't create collection {collection_name}") from None
+
+        return collection_name
+
+    @classmethod
+    def wait_for_indexing(
+        cls: Type[T], collection_name: str | None = None, timeout: float | None = 600.0, poll_interval: float = 1.0
+    ) -> bool:
+        """
+        Blocks until the collection's optimizers are done, i.e. its status is green.
+
+        Returns:
+            bool: Whether the collection is green. False if the timeout expired first.
+        """
+
+        collection_name = collection_name or cls.get_collection_name()
+
+        start_time = time.monotonic()
+        while connection.get_collection(collection_name=collection_name).status != CollectionStatus.GREEN:
+            if timeout is not None and time.monotonic() - start_time > timeout:
+                logger.warning(
+                    f"Timed out after {timeout} seconds while waiting for '{collection_name}' to be indexed."
+                )
+
+                return False
+
+            time.sleep(poll_interval)
+
+        return True
+
+    @classmethod
+    def swap_collection_alias(cls: Type[T], collection_name: str) -> None:
+        """
+        Points the `Config.name` alias to the collection. The swap is a single, atomic alias update.
+
+        The only exception is the first swap of a collection created before the versioning, under the name the
+        alias takes over: Qdrant can't replace a collection with an alias atomically, so it is deleted right before
+        the alias is created, and the queries fail during this brief window. Run that first reindex while the
+        collection is not queried, e.g. during a maintenance window.
+        """
+
+        alias_name = cls.get_collection_name()
+
+        operations = []
+        legacy_collection_name = None
+        if cls.get_live_collection_name() is not None:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias_name)))
+        elif connection.collection_exists(collection_name=alias_name):
+            legacy_collection_name = alias_name
+        operations.append(
+            CreateAliasOperation(create_alias=CreateAlias(collection_name=collection_name, alias_name=alias_name))
+        )
+
+        if legacy_collection_name is not None:
+            logger.warning(
+                f"Deleting the '{alias_name}' collection to replace it with an alias to '{collection_name}'. "
+                "The queries fail until the alias is created."
+            )
+            connection.delete_collection(collection_name=legacy_collection_name)
+
+        # All the operations of a single request are applied atomically.
+        connection.update_collection_aliases(change_aliases_operations=operations)
+        cls._invalidate_search_cache()
+        if legacy_collection_name is not None:
+            # Cleaned up only once the alias serves the queries again.
+            cls.delete_collection_metadata(collection_name=legacy_collection_name)
+
+        logger.info(f"Swapped the '{alias_name}' alias to '{collection_name}'.")
+
+    @classmethod
+    def delete_collection_versions(cls: Type[T], keep: int = 1) -> list[str]:
+        """
+        Deletes the versions older than the live one, except the `keep` most recent ones. Newer versions,
+        e.g. one being loaded by a concurrent reindex, are never deleted.
+
+        Returns:
+            list[str]: The names of the deleted collections.
+        """
+
+        live_collection_name = cls.get_live_collection_name()
+        versions = cls.get_collection_versions()
+        if live_collection_name not in versions:
+            return []
+
+        previous_versions = versions[: versions.index(live_collection_name)]
+        deleted_versions = previous_versions[: max(len(previous_versions) - keep, 0)]
+        for collection_name in deleted_versions:
+            connection.delete_collection(collection_name=collection_name)
+            cls.delete_collection_metadata(collection_name=collection_name)
+
+        if len(deleted_versions) > 0:
+            logger.info(f"Deleted {len(deleted_versions)} old versions of '{cls.get_collection_name()}'.")
+
+        return deleted_versions
+
+    # --- Collection-level metadata, e.g. the embedding model of the vectors. It is stored once per collection, ---
+    # --- as a vectorless point of a sidecar collection, instead of being copied into the payload of every point. ---
+
+    @classmethod
+    def build_collection_metadata(cls: Type[T]) -> dict:
+        """Returns the metadata shared by all the points of the class's collection. Empty by default."""
+
+        return {}
+
+    @classmethod
+    def get_collection_metadata(cls: Type[T], collection_name: str | None = None) -> dict:
+        """
+        Reads the metadata stored for a collection when it was created.
+
+        Args:
+            collection_name (str | None): The physical collection. Defaults to the live collection of the class.
+
+        Returns:
+            dict: The metadata, empty if none was stored.
+        """
+
+        collection_name = collection_name or cls.get_live_collection_name() or cls.get_collection_name()
+        metadata_collection_name = settings.QDRANT_METADATA_COLLECTION_NAME
+        if not connection.collection_exists(collection_name=metadata_collection_name):
+            return {}
+
+        records = connection.retrieve(
+            collection_name=metadata_collection_name,
+            ids=[cls._get_collection_metadata_id(collection_name)],
+            with_payload=True,
+            with_vectors=False,
+        )
+        if len(records) == 0:
+            return {}
+
+        return {key: value for key, value in records[0].payload.items() if key != "collection_name"}
+
+    @classmethod
+    def save_collection_metadata(
+        cls: Type[T], collection_name: str | None = None, metadata: dict | None = None
+    ) -> bool:
+        """
+        Stores the metadata of a collection, replacing the previous one.
+
+        Args:
+            collection_name (str | None): The physical collection. Defaults to the live collection of the class.
+            metadata (dict | None): The metadata. Defaults to `build_collection_metadata()`.
+
+        Returns:
+            bool: Whether the metadata was stored successfully, or there was nothing to store.
+        """
+
+        collection_name = collection_name or cls.get_live_collection_name() or cls.get_collection_name()
+        metadata = metadata if metadata is not None else cls.build_collection_metadata()
+        if not metadata:
+            return True
+
+        return cls._save_collection_metadata_point(cls._to_collection_metadata_point(collection_name, metadata))
+
+    @classmethod
+    def _save_collection_metadata_point(cls: Type[T], metadata_point: PointStruct) -> bool:
+        metadata_collection_name = settings.QDRANT_METADATA_COLLECTION_NAME
+        try:
+            if not connection.collection_exists(collection_name=metadata_collection_name):
+                connection.create_collection(collection_name=metadata_collection_name, vectors_config={})
+            connection.upsert(collection_name=metadata_collection_name, points=[metadata_point])
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to store the metadata of '{metadata_point.payload['collection_name']}'.")
+
+            return False
+
+        return True
+
+    @classmethod
+    def delete_collection_metadata(cls: Type[T], collection_name: str) -> None:
+        metadata_collection_name = settings.QDRANT_METADATA_COLLECTION_NAME
+        if not connection.collection_exists(collection_name=metadata_collection_name):
+            return
+
+        connection.delete(
+            collection_name=metadata_collection_name,
+            points_selector=[cls._get_collection_metadata_id(collection_name)],
+        )
+
+    @classmethod
+    def _to_collection_metadata_point(cls: Type[T], collection_name: str, metadata: dict) -> PointStruct:
+        return PointStruct(
+            id=cls._get_collection_metadata_id(collection_name),
+            vector={},
+            payload={"collection_name": collection_name, **metadata},
+        )
+
+    @staticmethod
+    def _get_collection_metadata_id(collection_name: str) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"qdrant://collections/{collection_name}"))
+
+    # --- Async API, backed by a lazily created `AsyncQdrantClient`. ---
+    # --- It shares the `Config` metadata of the sync API, so the same ODM classes work in both modes. ---
+
+    @classmethod
+    async def aget_or_create_collection(cls: Type[T]) -> CollectionInfo:
+        aconnection = AsyncQdrantDatabaseConnector()
+        collection_name = cls.get_collection_name()
+
+        if not await aconnection.collection_exists(collection_name=collection_name):
+            setup = cls._build_collection_setup(
+                collection_name=collection_name, use_vector_index=cls.get_use_vector_index()
+            )
+
+            collection_created = await aconnection.create_collection(
+                collection_name=collection_name, **setup.create_kwargs
+            )
+            if collection_created is False:
+                raise RuntimeError(f"Couldn't create collection {collection_name}") from None
+
+            for field_name, field_schema in setup.payload_indexes.items():
+                await aconnection.create_payload_index(
+                    collection_name=collection_name, field_name=field_name, field_schema=field_schema, wait=True
+                )
+            if setup.metadata_point is not None:
+                metadata_collection_name = settings.QDRANT_METADATA_COLLECTION_NAME
+                try:
+                    if not await aconnection.collection_exists(collection_name=metadata_collection_name):
+                        await aconnection.create_collection(collection_name=metadata_collection_name, vectors_config={})
+                    await aconnection.upsert(collection_name=metadata_collection_name, points=[setup.metadata_point])
+                except exceptions.UnexpectedResponse:
+                    logger.error(f"Failed to store the metadata of '{collection_name}'.")
+        else:
+            payload_schema = (await aconnection.get_collection(collection_name=collection_name)).payload_schema or {}
+            missing_payload_indexes = cls._get_missing_payload_indexes(cls.get_payload_indexes(), payload_schema)
+            for field_name, field_schema in missing_payload_indexes.items():
+                await aconnection.create_payload_index(
+                    collection_name=collection_name, field_name=field_name, field_schema=field_schema, wait=True
+                )
+
+        return await aconnection.get_collection(collection_name=collection_name)
 
-        return connection.create_collection(collection_name=collection_name, vectors_config=vectors_config)
+    @classmethod
+    async def abulk_insert(
+        cls: Type[T], documents: list["VectorBaseDocument"], batch_size: int = 256, max_concurrency: int = 4
+    ) -> bool:
+        aconnection = AsyncQdrantDatabaseConnector()
+        collection_name = cls.get_collection_name()
+
+        await cls.aget_or_create_collection()
+
+        points = [doc.to_point() for doc in documents]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _upsert(batch: list[PointStruct]) -> None:
+            async with semaphore:
+                await aconnection.upsert(collection_name=collection_name, points=batch)
+
+        try:
+            await asyncio.gather(*[_upsert(batch) for batch in cls._split_points(points, batch_size=batch_size)])
+        except (exceptions.UnexpectedResponse, exceptions.ResponseHandlingException):
+            logger.error(f"Failed to insert documents in '{collection_name}'.")
+
+            return False
+        finally:
+            cls._invalidate_search_cache()
+
+        return True
+
+    @classmethod
+    async def abulk_find(cls: Type[T], limit: int = 10, **kwargs) -> tuple[list[T], UUID | None]:
+        aconnection = AsyncQdrantDatabaseConnector()
+        collection_name = cls.get_collection_name()
+
+        offset = kwargs.pop("offset", None)
+        offset = str(offset) if offset else None
+        trusted = kwargs.pop("trusted", False)
+        projection, as_tuples = cls._pop_projection(kwargs)
+
+        try:
+            records, next_offset = await aconnection.scroll(
+                collection_name=collection_name,
+                scroll_filter=cls._filter_by_category(kwargs.pop("scroll_filter", None)),
+                limit=limit,
+                with_payload=kwargs.pop("with_payload", True),
+                with_vectors=kwargs.pop("with_vectors", False),
+                offset=offset,
+                **kwargs,
+            )
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to search documents in '{collection_name}'.")
+
+            return [], None
+
+        documents = cls.from_records(records, trusted=trusted, projection=projection, as_tuples=as_tuples)
+        if next_offset is not None:
+            next_offset = UUID(next_offset, version=4)
+
+        return documents, next_offset
+
+    @classmethod
+    async def asearch(
+        cls: Type[T],
+        query_vector: list,
+        limit: int = 10,
+        query_sparse_vector: SparseEmbedding | SparseVector | None = None,
+        **kwargs,
+    ) -> list[T]:
+        query_filter = kwargs.pop("query_filter", None)
+        request = VectorSearchRequest(
+            cls, query_vector, query_filter=query_filter, limit=limit, query_sparse_vector=query_sparse_vector
+        )
+        results = await cls._asearch_batch([request], **kwargs)
+
+        return results[0]
+
+    @classmethod
+    async def asearch_batch(
+        cls, requests: list[VectorSearchRequest | tuple], **kwargs
+    ) -> list[list["VectorBaseDocument"]]:
+        """Async version of `search_batch`: one `search_batch` call per collection, awaited concurrently."""
+
+        requests = [VectorSearchRequest(*request) for request in requests]
+        grouped_request_indices = cls._group_by(
+            list(range(len(requests))), selector=lambda idx: requests[idx].document_class
+        )
+
+        grouped_results = await asyncio.gather(
+            *[
+                document_class._asearch_batch([requests[idx] for idx in request_indices], **kwargs)
+                for document_class, request_indices in grouped_request_indices.items()
+            ]
+        )
+
+        results: list[list[VectorBaseDocument]] = [[] for _ in requests]
+        for request_indices, group_results in zip(grouped_request_indices.values(), grouped_results, strict=True):
+            for idx, documents in zip(request_indices, group_results, strict=True):
+                results[idx] = documents
+
+        return results
+
+    @classmethod
+    async def _asearch_batch(cls: Type[T], requests: list[VectorSearchRequest], **kwargs) -> list[list[T]]:
+        aconnection = AsyncQdrantDatabaseConnector()
+        collection_name = cls.get_collection_name()
+        cache_keys, results = cls._get_cached_results(requests, kwargs)
+        missed_indices = [idx for idx, documents in enumerate(results) if documents is None]
+        if len(missed_indices) == 0:
+            return results
+
+        missed_requests = [requests[idx] for idx in missed_indices]
+        projection, as_tuples = cls._pop_projection(kwargs)
+
+        try:
+            if any(request.query_sparse_vector is not None for request in missed_requests):
+                query_requests = cls._build_query_requests(missed_requests, **kwargs)
+                responses = await aconnection.query_batch_points(
+                    collection_name=collection_name, requests=query_requests
+                )
+                batch_records = [response.points for response in responses]
+            else:
+                search_requests = cls._build_search_requests(missed_requests, **kwargs)
+                batch_records = await aconnection.search_batch(
+                    collection_name=collection_name, requests=search_requests
+                )
+        except exceptions.UnexpectedResponse:
+            logger.error(f"Failed to search documents in '{collection_name}'.")
+
+            return [documents if documents is not None else [] for documents in results]
+
+        missed_results = [
+            cls.from_records(records, projection=projection, as_tuples=as_tuples) for records in batch_records
+        ]
+
+        return cls._merge_cached_results(cache_keys, results, missed_indices, missed_results)
 
     @classmethod
     def get_category(cls: Type[T]) -> DataCategory:
@@ -210,7 +1915,27 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
                 "The class should define a Config class with" "the 'name' property that reflects the collection's name."
             )
 
-        return cls.Config.name
+        return cls.get_shared_collection_name() or cls.Config.name
+
+    @classmethod
+    def get_shared_collection_name(cls: Type[T]) -> str | None:
+        """
+        Returns the collection shared with the other categories, set through `Config.shared_collection`.
+        Its points carry a `category` payload field that every read of the class filters on.
+        """
+
+        return cls._get_config_attribute("shared_collection", None)
+
+    @classmethod
+    def _filter_by_category(cls: Type[T], query_filter: Filter | None) -> Filter | None:
+        if cls.get_shared_collection_name() is None:
+            return query_filter
+
+        category_condition = FieldCondition(key="category", match=MatchValue(value=str(cls.get_category())))
+        if query_filter is None:
+            return Filter(must=[category_condition])
+
+        return Filter(must=[category_condition, query_filter])
 
     @classmethod
     def get_use_vector_index(cls: Type[T]) -> bool:
@@ -219,6 +1944,116 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
 
         return cls.Config.use_vector_index
 
+    @classmethod
+    def get_payload_indexes(cls: Type[T]) -> dict[str, PayloadSchemaType]:
+        payload_indexes = dict(cls._get_config_attribute("payload_indexes", {}))
+        if cls.get_shared_collection_name() is not None:
+            payload_indexes["category"] = PayloadSchemaType.KEYWORD
+
+        return {field_name: PayloadSchemaType(field_schema) for field_name, field_schema in payload_indexes.items()}
+
+    @classmethod
+    def get_embedding_models(cls: Type[T]) -> list[str]:
+        """
+        Returns the embedding models stored as named vectors, the first one filling the `embedding` field.
+        Empty for collections with a single unnamed vector.
+        """
+
+        return list(cls._get_config_attribute("embedding_models", []))
+
+    @classmethod
+    def get_vector_name(cls: Type[T], model_id: str | None = None) -> str:
+        """
+        Returns the name of the dense vector holding the embeddings of the given model.
+
+        Args:
+            model_id (str | None): The embedding model ID. Defaults to the first of `Config.embedding_models`.
+
+        Returns:
+            str: The vector name, "" for the unnamed vector of collections without `Config.embedding_models`.
+        """
+
+        embedding_models = cls.get_embedding_models()
+        if len(embedding_models) == 0:
+            if model_id is not None and model_id != EmbeddingModelSingleton().model_id:
+                raise ImproperlyConfigured(f"'{cls.__name__}' only stores the embeddings of the default model.")
+
+            return ""
+
+        if model_id is None:
+            return embedding_models[0]
+        if model_id not in embedding_models:
+            raise ImproperlyConfigured(
+                f"'{cls.__name__}' does not store the embeddings of '{model_id}'. Add it to its Config.embedding_models."
+            )
+
+        return model_id
+
+    @classmethod
+    def get_vector_params(cls: Type[T]) -> VectorParams | dict[str, VectorParams]:
+        embedding_models = cls.get_embedding_models()
+        if len(embedding_models) == 0:
+            return cls._get_vector_params(embedding_size=EmbeddingModelSingleton().embedding_size)
+
+        return {
+            model_id: cls._get_vector_params(embedding_size=get_embedding_model(model_id).embedding_size)
+            for model_id in embedding_models
+        }
+
+    @classmethod
+    def _get_vector_params(cls: Type[T], embedding_size: int) -> VectorParams:
+        hnsw_m = cls._get_config_attribute("hnsw_m", None)
+        hnsw_ef_construct = cls._get_config_attribute("hnsw_ef_construct", None)
+        hnsw_config = None
+        if hnsw_m is not None or hnsw_ef_construct is not None:
+            hnsw_config = HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct)
+
+        return VectorParams(
+            size=embedding_size,
+            distance=Distance.COSINE,
+            hnsw_config=hnsw_config,
+            on_disk=cls._get_config_attribute("on_disk", None),
+            datatype=Datatype(cls._get_config_attribute("vector_datatype", Datatype.FLOAT32)),
+        )
+
+    @classmethod
+    def get_sparse_vector_name(cls: Type[T]) -> str | None:
+        return cls._get_config_attribute("sparse_vector", None)
+
+    @classmethod
+    def get_sparse_vectors_config(cls: Type[T]) -> dict[str, SparseVectorParams] | None:
+        sparse_vector_name = cls.get_sparse_vector_name()
+        if sparse_vector_name is None:
+            return None
+
+        # The sparse embeddings only hold the term frequencies. The IDF is computed by Qdrant over the collection.
+        return {sparse_vector_name: SparseVectorParams(modifier=Modifier.IDF)}
+
+    @classmethod
+    def get_quantization_config(cls: Type[T]) -> QuantizationConfig | None:
+        quantization = cls._get_config_attribute("quantization", None)
+        always_ram = cls._get_config_attribute("quantization_always_ram", True)
+
+        if quantization is None:
+            return None
+        elif quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=always_ram)
+            )
+        elif quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=always_ram))
+        else:
+            raise ImproperlyConfigured(
+                f"Unsupported quantization '{quantization}'. The 'quantization' property should be 'scalar' or 'binary'."
+            )
+
+    @classmethod
+    def _get_config_attribute(cls: Type[T], attribute_name: str, default: Any) -> Any:
+        if not hasattr(cls, "Config") or not hasattr(cls.Config, attribute_name):
+            return default
+
+        return getattr(cls.Config, attribute_name)
+
     @classmethod
     def group_by_class(
         cls: Type["VectorBaseDocument"], documents: list["VectorBaseDocument"]
@@ -242,28 +2077,27 @@ class VectorBaseDocument(BaseModel, Generic[T], ABC):
         return grouped
 
     @classmethod
-    def collection_name_to_class(cls: Type["VectorBaseDocument"], collection_name: str) -> type["VectorBaseDocument"]:
-        for subclass in cls.__subclasses__():
-            try:
-                if subclass.get_collection_name() == collection_name:
-                    return subclass
-            except ImproperlyConfigured:
-                pass
-
-            try:
-                return subclass.collection_name_to_class(collection_name)
-            except ValueError:
-                continue
-
-        raise ValueError(f"No subclass found for collection name: {collection_name}")
+    def collection_name_to_class(
+        cls: Type["VectorBaseDocument"], collection_name: str, category: DataCategory | str | None = None
+    ) -> type["VectorBaseDocument"]:
+        subclass = None
+        if category is not None:
+            # Shared collections hold several classes, told apart by the `category` payload field.
+            subclass = VectorBaseDocument._shared_collection_registry.get((collection_name, DataCategory(category)))
+        if subclass is None:
+            subclass = VectorBaseDocument._collection_registry.get(collection_name)
+        if subclass is None or not issubclass(subclass, cls):
+            raise ValueError(f"No subclass found for collection name: {collection_name}")
+
+        return subclass
 
     @classmethod
-    def _has_class_attribute(cls: Type[T], attribute_name: str) -> bool:
-        if attribute_name in cls.__annotations__:
-            return True
+    def get_metadata(cls: Type[T]) -> VectorDocumentMetadata:
+        if cls._class_metadata is None:
+            raise ImproperlyConfigured(f"'{cls.__name__}' is an abstract document class without metadata.")
 
-        for base in cls.__bases__:
-            if hasattr(base, "_has_class_attribute") and base._has_class_attribute(attribute_name):
-                return True
+        return cls._class_metadata
 
-        return False
+    @classmethod
+    def get_registered_classes(cls: Type["VectorBaseDocument"]) -> list[type["VectorBaseDocument"]]:
+        return [subclass for subclass in VectorBaseDocument._collection_registry.values() if issubclass(subclass, cls)]
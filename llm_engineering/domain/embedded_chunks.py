@@ -1,21 +1,59 @@
 from abc import ABC
+from typing import ClassVar
 
 from pydantic import UUID4, Field
 
-from llm_engineering.domain.types import DataCategory
+from llm_engineering.application.networks.embeddings import SparseEmbeddingModelSingleton, get_embedding_model
+from llm_engineering.domain.types import DataCategory, Embedding, SparseEmbedding
+from llm_engineering.settings import settings
 
 from .base import VectorBaseDocument
 
+# Deployments can opt into a single collection for all the embedded chunks, the category becoming a payload field.
+SHARED_COLLECTION_NAME = (
+    settings.QDRANT_EMBEDDED_COLLECTION_NAME if settings.QDRANT_UNIFIED_EMBEDDED_COLLECTION is True else None
+)
+# Named vectors are only used once extra models are configured, otherwise the collections keep their single unnamed
+# vector. Setting TEXT_EMBEDDING_EXTRA_MODEL_IDS thus requires re-indexing the existing collections.
+EMBEDDING_MODELS = (
+    [settings.TEXT_EMBEDDING_MODEL_ID, *settings.TEXT_EMBEDDING_EXTRA_MODEL_ID_LIST]
+    if settings.TEXT_EMBEDDING_EXTRA_MODEL_ID_LIST
+    else []
+)
+# The BM25 sparse vector used by the hybrid search is opt-in.
+SPARSE_VECTOR_NAME = "bm25" if settings.RAG_SPARSE_VECTOR is True else None
+# So are the quantized copy of the vectors and the on-disk payloads, which otherwise follow the Qdrant defaults.
+VECTOR_QUANTIZATION = settings.RAG_VECTOR_QUANTIZATION
+ON_DISK_PAYLOAD = True if settings.RAG_ON_DISK_PAYLOAD is True else None
+
 
 class EmbeddedChunk(VectorBaseDocument, ABC):
     content: str
-    embedding: list[float] | None
+    embedding: Embedding | None
+    sparse_embedding: SparseEmbedding | None = None
+    extra_embeddings: dict[str, Embedding] = Field(default_factory=dict)
     platform: str
     document_id: UUID4
     author_id: UUID4
     author_full_name: str
     metadata: dict = Field(default_factory=dict)
 
+    @classmethod
+    def build_collection_metadata(cls) -> dict:
+        embedding_model_id, *extra_embedding_model_ids = cls.get_embedding_models() or [
+            settings.TEXT_EMBEDDING_MODEL_ID
+        ]
+        embedding_model = get_embedding_model(embedding_model_id)
+        sparse_vector_name = cls.get_sparse_vector_name()
+
+        return {
+            "embedding_model_id": embedding_model.model_id,
+            "embedding_size": embedding_model.embedding_size,
+            "max_input_length": embedding_model.max_input_length,
+            "extra_embedding_model_ids": extra_embedding_model_ids,
+            "sparse_embedding_model_id": SparseEmbeddingModelSingleton().model_id if sparse_vector_name else None,
+        }
+
     @classmethod
     def to_context(cls, chunks: list["EmbeddedChunk"]) -> str:
         context = ""
@@ -31,27 +69,45 @@ class EmbeddedChunk(VectorBaseDocument, ABC):
         return context
 
 
+class EmbeddedChunkConfig:
+    """The collection settings shared by the embedded chunk classes, whose `Config` only adds a name and a category."""
+
+    shared_collection = SHARED_COLLECTION_NAME
+    use_vector_index = True
+    embedding_models: ClassVar[list[str]] = EMBEDDING_MODELS
+    hnsw_m = 16
+    hnsw_ef_construct = 100
+    on_disk = False
+    vector_datatype = "float32"
+    quantization = VECTOR_QUANTIZATION
+    quantization_rescore = True
+    sparse_vector = SPARSE_VECTOR_NAME
+    on_disk_payload = ON_DISK_PAYLOAD
+    payload_indexes: ClassVar[dict[str, str]] = {
+        "author_id": "keyword",
+        "platform": "keyword",
+        "document_id": "keyword",
+    }
+
+
 class EmbeddedPostChunk(EmbeddedChunk):
-    class Config:
+    class Config(EmbeddedChunkConfig):
         name = "embedded_posts"
         category = DataCategory.POSTS
-        use_vector_index = True
 
 
 class EmbeddedArticleChunk(EmbeddedChunk):
     link: str
 
-    class Config:
+    class Config(EmbeddedChunkConfig):
         name = "embedded_articles"
         category = DataCategory.ARTICLES
-        use_vector_index = True
 
 
 class EmbeddedRepositoryChunk(EmbeddedChunk):
     name: str
     link: str
 
-    class Config:
+    class Config(EmbeddedChunkConfig):
         name = "embedded_repositories"
         category = DataCategory.REPOSITORIES
-        use_vector_index = True
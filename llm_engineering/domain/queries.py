@@ -1,7 +1,7 @@
 from pydantic import UUID4, Field
 
 from llm_engineering.domain.base import VectorBaseDocument
-from llm_engineering.domain.types import DataCategory
+from llm_engineering.domain.types import DataCategory, Embedding, SparseEmbedding
 
 
 class Query(VectorBaseDocument):
@@ -28,7 +28,9 @@ class Query(VectorBaseDocument):
 
 
 class EmbeddedQuery(Query):
-    embedding: list[float]
+    embedding: Embedding
+    sparse_embedding: SparseEmbedding | None = None
+    extra_embeddings: dict[str, Embedding] = Field(default_factory=dict)
 
     class Config:
         category = DataCategory.QUERIES
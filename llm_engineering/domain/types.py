@@ -1,4 +1,12 @@
+from array import array
 from enum import StrEnum
+from typing import Annotated, Any
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel, GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
 
 
 class DataCategory(StrEnum):
@@ -13,3 +21,54 @@ class DataCategory(StrEnum):
     POSTS = "posts"
     ARTICLES = "articles"
     REPOSITORIES = "repositories"
+
+
+def to_embedding_array(value: Any) -> NDArray[np.float32]:
+    """Convert any 1-D sequence of numbers into a contiguous float32 array, without copying when possible."""
+
+    # Pydantic only turns ValueErrors into ValidationErrors, so the non-numeric values are re-raised as such.
+    try:
+        if isinstance(value, list) and (len(value) == 0 or not isinstance(value[0], list)):
+            # Packing the Python floats through `array` is noticeably faster than `np.asarray` on plain lists.
+            return np.frombuffer(array("f", value), dtype=np.float32)
+
+        embedding = np.ascontiguousarray(value, dtype=np.float32)
+    except TypeError as e:
+        raise ValueError(f"Embeddings must be sequences of numbers: {e}.") from e
+
+    if embedding.ndim != 1:
+        raise ValueError(f"Embeddings must be 1-D arrays, got an array with shape {embedding.shape}.")
+
+    return embedding
+
+
+class _EmbeddingPydanticAnnotation:
+    """
+    Validates embeddings as contiguous float32 NumPy arrays.
+    They are kept as arrays when dumped in Python mode and serialized as lists of floats only in JSON mode.
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, _source_type: Any, _handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            to_embedding_array,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda array: array.tolist(), when_used="json"
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, _core_schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return handler(core_schema.list_schema(core_schema.float_schema()))
+
+
+Embedding = Annotated[NDArray[np.float32], _EmbeddingPydanticAnnotation]
+
+
+class SparseEmbedding(BaseModel):
+    """A sparse embedding, stored as its non-zero (index, value) pairs."""
+
+    indices: list[int]
+    values: list[float]
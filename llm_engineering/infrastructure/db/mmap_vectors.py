@@ -0,0 +1,1076 @@
+import asyncio
+import json
+import math
+import shutil
+import sqlite3
+from pathlib import Path
+from threading import RLock
+from typing import Any, Callable, Sequence
+
+import httpx
+import numpy as np
+import portalocker
+from loguru import logger
+from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.http.models import (
+    AliasDescription,
+    CollectionConfig,
+    CollectionDescription,
+    CollectionInfo,
+    CollectionParams,
+    CollectionStatus,
+    CollectionsAliasesResponse,
+    CollectionsResponse,
+    CountResult,
+    CreateAliasOperation,
+    DeleteAliasOperation,
+    Distance,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    Fusion,
+    FusionQuery,
+    GroupsResult,
+    HasIdCondition,
+    HnswConfig,
+    MatchAny,
+    MatchExcept,
+    MatchValue,
+    Modifier,
+    NamedSparseVector,
+    NamedVector,
+    OptimizersConfig,
+    OptimizersStatusOneOf,
+    PayloadIndexInfo,
+    PayloadSchemaType,
+    PayloadSelectorExclude,
+    PayloadSelectorInclude,
+    PointGroup,
+    PointIdsList,
+    PointStruct,
+    QueryRequest,
+    QueryResponse,
+    Record,
+    ScoredPoint,
+    SearchParams,
+    SearchRequest,
+    SparseVector,
+    SparseVectorParams,
+    UpdateResult,
+    UpdateStatus,
+    VectorParams,
+    WalConfig,
+)
+
+try:
+    import hnswlib
+except ModuleNotFoundError:
+    hnswlib = None
+
+# Qdrant's default `indexing_threshold`, in kilobytes of vectors.
+DEFAULT_INDEXING_THRESHOLD = 20000
+
+# Qdrant's Reciprocal Rank Fusion constant, so both backends rank the hybrid results alike.
+RRF_RANKING_CONSTANT = 2
+
+INITIAL_CAPACITY = 1024
+
+
+class MmapCollection:
+    """
+    A collection of the in-process backend, stored in its own directory:
+        - `config.json`: the vector, sparse vector, payload index and optimizer settings.
+        - `vectors-<i>.f32`: a memory-mapped (capacity, size) float32 matrix per dense vector, a point
+            keeping the same row in all of them.
+        - `points.sqlite`: the sidecar store mapping the point IDs to their rows, with their JSON payload
+            and sparse vectors.
+
+    Only the vectors (through the page cache), the IDs and the payload-indexed fields are held in memory,
+    so filtering on an indexed field is a vectorized comparison. The other fields are filtered in SQLite.
+    """
+
+    def __init__(self, path: Path, hnsw: bool = False) -> None:
+        self.path = path
+        self.config = json.loads((path / "config.json").read_text())
+        self.hnsw = hnsw and hnswlib is not None
+        self.lock = RLock()
+
+        self._db = sqlite3.connect(path / "points.sqlite", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS points "
+            "(row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, payload TEXT NOT NULL, vectors TEXT NOT NULL, "
+            "sparse_vectors TEXT)"
+        )
+
+        self._capacity = 0
+        self._num_rows = 0
+        self._ids: list[str | None] = []
+        self._id_to_row: dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._vectors: dict[str, np.memmap] = {}
+        self._has_vector: dict[str, np.ndarray] = {}
+        self._columns: dict[str, np.ndarray] = {}
+        self._sparse_vectors: dict[str, dict[int, tuple[np.ndarray, np.ndarray]]] = {
+            name: {} for name in self.config["sparse_vectors"]
+        }
+        self._sparse_postings: dict[str, dict[int, tuple[np.ndarray, np.ndarray]]] = {}
+        self._hnsw_indexes: dict[str, Any] = {}
+        # The (rows, IDs) of the points in the order of their IDs, rebuilt after adding or deleting points.
+        self._sorted_ids: tuple[np.ndarray, np.ndarray] | None = None
+
+        self._load()
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        vectors: dict[str, VectorParams],
+        sparse_vectors: dict[str, SparseVectorParams],
+        on_disk_payload: bool | None,
+        hnsw: bool = False,
+    ) -> "MmapCollection":
+        path.mkdir(parents=True)
+        config = {
+            "vectors": {
+                name: {"size": params.size, "distance": params.distance.value} for name, params in vectors.items()
+            },
+            "sparse_vectors": {
+                name: {"modifier": params.modifier.value if params.modifier else None}
+                for name, params in sparse_vectors.items()
+            },
+            "on_disk_payload": on_disk_payload,
+            "payload_schema": {},
+            "indexing_threshold": DEFAULT_INDEXING_THRESHOLD,
+        }
+        (path / "config.json").write_text(json.dumps(config))
+
+        return cls(path, hnsw=hnsw)
+
+    def close(self) -> None:
+        for vectors in self._vectors.values():
+            vectors.flush()
+        self._vectors.clear()
+        self._db.close()
+
+    # --- Storage ---
+
+    def _load(self) -> None:
+        rows = self._db.execute("SELECT row, id, vectors, sparse_vectors FROM points ORDER BY row").fetchall()
+        self._num_rows = rows[-1][0] + 1 if rows else 0
+        self._resize(max(INITIAL_CAPACITY, self._num_rows))
+
+        self._ids = [None] * self._num_rows
+        for row, point_id, vector_names, sparse_vectors in rows:
+            self._ids[row] = point_id
+            self._id_to_row[point_id] = row
+            self._alive[row] = True
+            for name in json.loads(vector_names):
+                self._has_vector[name][row] = True
+            for name, (indices, values) in json.loads(sparse_vectors or "{}").items():
+                self._sparse_vectors[name][row] = (np.asarray(indices, dtype=np.int64), np.asarray(values, np.float32))
+
+        for field_name in self.config["payload_schema"]:
+            self._build_column(field_name)
+
+    def _resize(self, capacity: int) -> None:
+        for i, (name, params) in enumerate(self.config["vectors"].items()):
+            # The vector names are model IDs, which are not valid file names.
+            vectors_path = self.path / f"vectors-{i}.f32"
+            if name in self._vectors:
+                self._vectors[name].flush()
+                del self._vectors[name]
+            with vectors_path.open("ab") as f:
+                f.truncate(capacity * params["size"] * 4)
+            self._vectors[name] = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(capacity, params["size"]))
+            self._has_vector[name] = _grow(self._has_vector.get(name, np.zeros(0, dtype=bool)), capacity)
+
+        self._alive = _grow(self._alive, capacity)
+        for field_name, column in self._columns.items():
+            self._columns[field_name] = _grow(column, capacity)
+        self._capacity = capacity
+
+    def _save_config(self) -> None:
+        (self.path / "config.json").write_text(json.dumps(self.config))
+
+    def upsert(self, points: Sequence[PointStruct]) -> None:
+        with self.lock:
+            if self._num_rows + len(points) > self._capacity:
+                self._resize(max(2 * self._capacity, self._num_rows + len(points)))
+
+            db_rows = []
+            for point in points:
+                point_id = str(point.id)
+                row = self._id_to_row.get(point_id)
+                if row is None:
+                    row = self._num_rows
+                    self._num_rows += 1
+                    self._ids.append(point_id)
+                    self._id_to_row[point_id] = row
+                    self._sorted_ids = None
+
+                vectors = point.vector if isinstance(point.vector, dict) else {"": point.vector}
+                dense_vectors, sparse_vectors = {}, {}
+                for name, vector in vectors.items():
+                    if isinstance(vector, SparseVector):
+                        sparse_vectors[name] = vector
+                    elif vector is not None and len(vector) > 0:
+                        dense_vectors[name] = vector
+
+                for name in self.config["vectors"]:
+                    has_vector = name in dense_vectors
+                    self._has_vector[name][row] = has_vector
+                    if has_vector:
+                        self._vectors[name][row] = self._prepare_vector(name, dense_vectors[name])
+                for name in self.config["sparse_vectors"]:
+                    if name in sparse_vectors:
+                        vector = sparse_vectors[name]
+                        self._sparse_vectors[name][row] = (
+                            np.asarray(vector.indices, dtype=np.int64),
+                            np.asarray(vector.values, dtype=np.float32),
+                        )
+                    else:
+                        self._sparse_vectors[name].pop(row, None)
+
+                payload = point.payload or {}
+                self._alive[row] = True
+                for field_name, column in self._columns.items():
+                    column[row] = _get_value(payload, field_name)
+
+                db_rows.append(
+                    (
+                        row,
+                        point_id,
+                        json.dumps(payload),
+                        json.dumps(list(dense_vectors)),
+                        json.dumps(
+                            {
+                                name: [vector.indices, vector.values]
+                                for name, vector in sparse_vectors.items()
+                                if name in self.config["sparse_vectors"]
+                            }
+                        ),
+                    )
+                )
+
+            self._db.executemany("INSERT OR REPLACE INTO points VALUES (?, ?, ?, ?, ?)", db_rows)
+            self._db.commit()
+            for vectors in self._vectors.values():
+                vectors.flush()
+            self._invalidate_indexes()
+
+    def delete(self, rows: np.ndarray) -> None:
+        with self.lock:
+            for row in rows.tolist():
+                point_id = self._ids[row]
+                self._ids[row] = None
+                self._id_to_row.pop(point_id, None)
+                self._alive[row] = False
+                for sparse_vectors in self._sparse_vectors.values():
+                    sparse_vectors.pop(row, None)
+
+            self._db.executemany("DELETE FROM points WHERE row = ?", [(row,) for row in rows.tolist()])
+            self._db.commit()
+            self._sorted_ids = None
+            self._invalidate_indexes()
+
+    def create_payload_index(self, field_name: str, field_schema: Any) -> None:
+        with self.lock:
+            self.config["payload_schema"][field_name] = PayloadSchemaType(field_schema).value
+            self._save_config()
+            self._build_column(field_name)
+
+    def _build_column(self, field_name: str) -> None:
+        self._columns[field_name] = self._read_column(field_name)
+
+    def _read_column(self, field_name: str) -> np.ndarray:
+        column = np.full(self._capacity, None, dtype=object)
+        for row, value in self._db.execute("SELECT row, json_extract(payload, ?) FROM points", (f"$.{field_name}",)):
+            column[row] = value
+
+        return column
+
+    def _prepare_vector(self, name: str, vector: Any) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.config["vectors"][name]["distance"] == Distance.COSINE.value:
+            # As Qdrant does, the vectors are normalized once, so the cosine similarity is a dot product.
+            norm = np.linalg.norm(vector)
+            vector = vector / norm if norm > 0 else vector
+
+        return vector
+
+    def _invalidate_indexes(self) -> None:
+        self._sparse_postings.clear()
+        self._hnsw_indexes.clear()
+
+    # --- Reads ---
+
+    @property
+    def points_count(self) -> int:
+        return len(self._id_to_row)
+
+    def rows_to_ids(self, rows: Sequence[int]) -> list[str]:
+        return [self._ids[row] for row in rows]
+
+    def sorted_ids(self) -> tuple[np.ndarray, np.ndarray]:
+        with self.lock:
+            if self._sorted_ids is None:
+                rows = np.flatnonzero(self._alive[: self._num_rows])
+                ids = np.asarray(self.rows_to_ids(rows), dtype=object)
+                order = np.argsort(ids, kind="stable")
+                self._sorted_ids = (rows[order], ids[order])
+
+            return self._sorted_ids
+
+    def ids_to_rows(self, ids: Sequence[Any]) -> list[int]:
+        return [self._id_to_row[str(point_id)] for point_id in ids if str(point_id) in self._id_to_row]
+
+    def load_payloads(self, rows: Sequence[int]) -> dict[int, dict]:
+        payloads = {}
+        rows = list(rows)
+        for i in range(0, len(rows), 500):
+            batch = rows[i : i + 500]
+            query = f"SELECT row, payload FROM points WHERE row IN ({','.join('?' * len(batch))})"
+            for row, payload in self._db.execute(query, batch):
+                payloads[row] = json.loads(payload)
+
+        return payloads
+
+    def load_vectors(self, row: int, names: set[str] | None = None) -> list[float] | dict[str, Any]:
+        vectors = {
+            name: vectors[row].tolist()
+            for name, vectors in self._vectors.items()
+            if self._has_vector[name][row] and (names is None or name in names)
+        }
+        for name, sparse_vectors in self._sparse_vectors.items():
+            if row in sparse_vectors and (names is None or name in names):
+                indices, values = sparse_vectors[row]
+                vectors[name] = SparseVector(indices=indices.tolist(), values=values.tolist())
+
+        if list(self.config["vectors"]) == [""] and len(self.config["sparse_vectors"]) == 0:
+            return vectors.get("", [])
+
+        return vectors
+
+    def filter_mask(self, query_filter: Filter | None) -> np.ndarray:
+        mask = self._alive[: self._num_rows].copy()
+        if query_filter is not None:
+            mask &= self._match_filter(query_filter)
+
+        return mask
+
+    def _match_filter(self, query_filter: Filter) -> np.ndarray:
+        mask = np.ones(self._num_rows, dtype=bool)
+        for condition in _as_list(query_filter.must):
+            mask &= self._match_condition(condition)
+        should_conditions = _as_list(query_filter.should)
+        if len(should_conditions) > 0:
+            mask &= np.logical_or.reduce([self._match_condition(condition) for condition in should_conditions])
+        for condition in _as_list(query_filter.must_not):
+            mask &= ~self._match_condition(condition)
+
+        return mask
+
+    def _match_condition(self, condition: Any) -> np.ndarray:
+        if isinstance(condition, Filter):
+            return self._match_filter(condition)
+
+        if isinstance(condition, HasIdCondition):
+            mask = np.zeros(self._num_rows, dtype=bool)
+            mask[self.ids_to_rows(condition.has_id)] = True
+
+            return mask
+
+        if isinstance(condition, FieldCondition) and condition.match is not None:
+            column = self._columns.get(condition.key)
+            if column is None:
+                column = self._read_column(condition.key)
+            column = column[: self._num_rows]
+
+            match = condition.match
+            if isinstance(match, MatchValue):
+                return column == match.value
+            if isinstance(match, MatchAny):
+                values = set(match.any)
+
+                return np.fromiter((value in values for value in column), dtype=bool, count=len(column))
+            if isinstance(match, MatchExcept):
+                values = set(match.except_)
+
+                return np.fromiter((value not in values for value in column), dtype=bool, count=len(column))
+
+        raise ValueError(f"Unsupported filter condition for the in-process vector backend: {condition}")
+
+    def score_dense(
+        self, name: str, query_vector: Any, mask: np.ndarray, limit: int, search_params: SearchParams | None = None
+    ) -> list[tuple[int, float]]:
+        if name not in self.config["vectors"]:
+            raise ValueError(f"Unknown vector '{name}'.")
+
+        mask = mask & self._has_vector[name][: self._num_rows]
+        if limit <= 0 or not mask.any():
+            return []
+
+        query_vector = self._prepare_vector(name, query_vector)
+        exact = search_params is not None and search_params.exact is True
+        if not exact and self._use_hnsw(name):
+            hnsw_ef = search_params.hnsw_ef if search_params is not None else None
+            try:
+                return self._search_hnsw(name, query_vector, mask, limit, hnsw_ef)
+            except RuntimeError:
+                # The graph search found fewer than `limit` points passing a selective filter.
+                logger.debug(f"Falling back to an exact search in '{self.path.name}'.", vector_name=name)
+
+        rows = np.flatnonzero(mask)
+        vectors = self._vectors[name][: self._num_rows]
+        distance = self.config["vectors"][name]["distance"]
+        if distance == Distance.EUCLID.value:
+            scores = -np.linalg.norm(vectors[rows] - query_vector, axis=1)
+        elif distance == Distance.MANHATTAN.value:
+            scores = -np.abs(vectors[rows] - query_vector).sum(axis=1)
+        else:
+            # A full matrix product is faster than gathering the rows, unless the filter is selective.
+            scores = (vectors @ query_vector)[rows] if len(rows) > self._num_rows // 2 else vectors[rows] @ query_vector
+
+        top_rows, top_scores = _top_k(rows, scores, limit)
+        if distance in (Distance.EUCLID.value, Distance.MANHATTAN.value):
+            # Qdrant returns the distances themselves, the closest first.
+            top_scores = -top_scores
+
+        return list(zip(top_rows.tolist(), top_scores.tolist(), strict=True))
+
+    def score_sparse(
+        self, name: str, query_vector: SparseVector, mask: np.ndarray, limit: int
+    ) -> list[tuple[int, float]]:
+        if name not in self.config["sparse_vectors"]:
+            raise ValueError(f"Unknown sparse vector '{name}'.")
+
+        postings = self._get_sparse_postings(name)
+        use_idf = self.config["sparse_vectors"][name]["modifier"] == Modifier.IDF.value
+        num_documents = len(self._sparse_vectors[name])
+
+        scores = np.zeros(self._num_rows, dtype=np.float32)
+        matched = np.zeros(self._num_rows, dtype=bool)
+        for index, value in zip(query_vector.indices, query_vector.values, strict=True):
+            if index not in postings:
+                continue
+
+            rows, values = postings[index]
+            if use_idf:
+                document_frequency = len(rows)
+                value *= math.log((num_documents - document_frequency + 0.5) / (document_frequency + 0.5) + 1)
+            scores[rows] += values * value
+            matched[rows] = True
+
+        rows = np.flatnonzero(matched & mask)
+        top_rows, top_scores = _top_k(rows, scores[rows], limit)
+
+        return list(zip(top_rows.tolist(), top_scores.tolist(), strict=True))
+
+    def _get_sparse_postings(self, name: str) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        with self.lock:
+            if name not in self._sparse_postings:
+                postings: dict[int, tuple[list[int], list[float]]] = {}
+                for row, (indices, values) in self._sparse_vectors[name].items():
+                    for index, value in zip(indices.tolist(), values.tolist(), strict=True):
+                        rows, row_values = postings.setdefault(index, ([], []))
+                        rows.append(row)
+                        row_values.append(value)
+                self._sparse_postings[name] = {
+                    index: (np.asarray(rows, dtype=np.int64), np.asarray(values, dtype=np.float32))
+                    for index, (rows, values) in postings.items()
+                }
+
+            return self._sparse_postings[name]
+
+    # --- Optional HNSW graph, for the collections above Qdrant's indexing threshold. ---
+
+    def _use_hnsw(self, name: str) -> bool:
+        if not self.hnsw or self.config["vectors"][name]["distance"] not in (Distance.COSINE.value, Distance.DOT.value):
+            return False
+
+        indexing_threshold = self.config["indexing_threshold"]
+        vectors_kb = self.points_count * self.config["vectors"][name]["size"] * 4 / 1024
+
+        return indexing_threshold != 0 and vectors_kb >= indexing_threshold
+
+    def _search_hnsw(
+        self, name: str, query_vector: np.ndarray, mask: np.ndarray, limit: int, hnsw_ef: int | None
+    ) -> list[tuple[int, float]]:
+        with self.lock:
+            index = self._hnsw_indexes.get(name)
+            if index is None:
+                rows = np.flatnonzero(self._alive[: self._num_rows] & self._has_vector[name][: self._num_rows])
+                index = hnswlib.Index(space="ip", dim=self.config["vectors"][name]["size"])
+                index.init_index(max_elements=max(len(rows), 1), M=16, ef_construction=100)
+                index.add_items(self._vectors[name][rows], rows)
+                self._hnsw_indexes[name] = index
+
+                logger.info(f"Built the HNSW graph of '{self.path.name}'.", vector_name=name, num_vectors=len(rows))
+
+        limit = min(limit, int(mask.sum()))
+        index.set_ef(max(hnsw_ef or 0, limit, 64))
+        labels, distances = index.knn_query(query_vector, k=limit, num_threads=1, filter=lambda row: bool(mask[row]))
+
+        # The inner product space returns `1 - dot`.
+        return list(zip(labels[0].tolist(), (1 - distances[0]).tolist(), strict=True))
+
+    def info(self) -> CollectionInfo:
+        vectors = {
+            name: VectorParams(size=params["size"], distance=Distance(params["distance"]))
+            for name, params in self.config["vectors"].items()
+        }
+        sparse_vectors = {
+            name: SparseVectorParams(modifier=Modifier(params["modifier"]) if params["modifier"] else None)
+            for name, params in self.config["sparse_vectors"].items()
+        }
+
+        return CollectionInfo(
+            status=CollectionStatus.GREEN,
+            optimizer_status=OptimizersStatusOneOf.OK,
+            indexed_vectors_count=0,
+            points_count=self.points_count,
+            segments_count=1,
+            payload_schema={
+                field_name: PayloadIndexInfo(data_type=PayloadSchemaType(data_type), points=self.points_count)
+                for field_name, data_type in self.config["payload_schema"].items()
+            },
+            config=CollectionConfig(
+                params=CollectionParams(
+                    vectors=vectors.get("") if list(vectors) == [""] else vectors,
+                    sparse_vectors=sparse_vectors or None,
+                    on_disk_payload=self.config["on_disk_payload"],
+                ),
+                hnsw_config=HnswConfig(m=16, ef_construct=100, full_scan_threshold=10000),
+                optimizer_config=OptimizersConfig(
+                    deleted_threshold=0.2,
+                    vacuum_min_vector_number=1000,
+                    default_segment_number=0,
+                    indexing_threshold=self.config["indexing_threshold"],
+                    flush_interval_sec=5,
+                ),
+                wal_config=WalConfig(wal_capacity_mb=32, wal_segments_ahead=0),
+            ),
+        )
+
+
+class MmapVectorClient:
+    """
+    In-process, Qdrant-free vector backend for single-node deployments and CI, selected with
+    `VECTOR_DB_BACKEND=mmap`. It implements the subset of the `QdrantClient` API used by the vector ODM,
+    with the same models, so the ODM and the retriever run unchanged on top of it.
+
+    The searches are exact, vectorized NumPy top-k over memory-mapped matrices (see `MmapCollection`).
+    With `hnsw` and `hnswlib` installed, the collections above Qdrant's indexing threshold are searched
+    through an in-memory HNSW graph instead, built on the first search after a write.
+
+    As Qdrant local mode, the storage folder is used by a single client, in a single process: the rows of the
+    points and the in-memory indexes aren't shared, so the client holds an exclusive lock on the folder and
+    fails fast when it is already opened. Use the Qdrant server when both the pipelines and the inference
+    server access the vectors.
+    """
+
+    def __init__(self, path: str | Path, hnsw: bool = False) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock_file = (self.path / ".lock").open("a")
+        try:
+            portalocker.lock(self._lock_file, portalocker.LockFlags.EXCLUSIVE | portalocker.LockFlags.NON_BLOCKING)
+        except portalocker.exceptions.LockException:
+            self._lock_file.close()
+
+            raise RuntimeError(
+                f"The vector database folder '{self.path}' is already opened by another client. "
+                "The in-process backend supports a single process, use Qdrant for concurrent access."
+            ) from None
+
+        if hnsw and hnswlib is None:
+            logger.warning(
+                "Couldn't load hnswlib. Run 'pip install hnswlib' to search the large collections with HNSW."
+            )
+        self.hnsw = hnsw
+
+        self._lock = RLock()
+        self._collections: dict[str, MmapCollection] = {}
+        aliases_path = self.path / "aliases.json"
+        self._aliases: dict[str, str] = json.loads(aliases_path.read_text()) if aliases_path.exists() else {}
+
+    def close(self, **kwargs) -> None:
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
+
+            if not self._lock_file.closed:
+                portalocker.unlock(self._lock_file)
+                self._lock_file.close()
+
+    # --- Collections ---
+
+    def get_collections(self, **kwargs) -> CollectionsResponse:
+        return CollectionsResponse(
+            collections=[
+                CollectionDescription(name=path.name)
+                for path in sorted(self.path.iterdir())
+                if (path / "config.json").exists()
+            ]
+        )
+
+    def collection_exists(self, collection_name: str, **kwargs) -> bool:
+        return (self.path / self._aliases.get(collection_name, collection_name) / "config.json").exists()
+
+    def get_collection(self, collection_name: str, **kwargs) -> CollectionInfo:
+        return self._get_collection(collection_name).info()
+
+    def create_collection(
+        self,
+        collection_name: str,
+        vectors_config: VectorParams | dict[str, VectorParams],
+        sparse_vectors_config: dict[str, SparseVectorParams] | None = None,
+        on_disk_payload: bool | None = None,
+        **kwargs,
+    ) -> bool:
+        with self._lock:
+            if self.collection_exists(collection_name):
+                raise _error(409, f"Collection `{collection_name}` already exists!")
+
+            vectors = vectors_config if isinstance(vectors_config, dict) else {"": vectors_config}
+            self._collections[collection_name] = MmapCollection.create(
+                self.path / collection_name,
+                vectors=vectors,
+                sparse_vectors=sparse_vectors_config or {},
+                on_disk_payload=on_disk_payload,
+                hnsw=self.hnsw,
+            )
+
+        return True
+
+    def delete_collection(self, collection_name: str, **kwargs) -> bool:
+        with self._lock:
+            if not (self.path / collection_name / "config.json").exists():
+                return False
+
+            collection = self._collections.pop(collection_name, None)
+            if collection is not None:
+                collection.close()
+            shutil.rmtree(self.path / collection_name)
+
+            aliases = {alias: name for alias, name in self._aliases.items() if name != collection_name}
+            if aliases != self._aliases:
+                self._save_aliases(aliases)
+
+        return True
+
+    def update_collection(self, collection_name: str, optimizers_config: Any = None, **kwargs) -> bool:
+        collection = self._get_collection(collection_name)
+        if optimizers_config is not None and optimizers_config.indexing_threshold is not None:
+            with collection.lock:
+                collection.config["indexing_threshold"] = optimizers_config.indexing_threshold
+                collection._save_config()
+
+        return True
+
+    def create_payload_index(
+        self, collection_name: str, field_name: str, field_schema: Any = None, **kwargs
+    ) -> UpdateResult:
+        self._get_collection(collection_name).create_payload_index(
+            field_name, field_schema or PayloadSchemaType.KEYWORD
+        )
+
+        return UpdateResult(operation_id=0, status=UpdateStatus.COMPLETED)
+
+    def get_aliases(self, **kwargs) -> CollectionsAliasesResponse:
+        return CollectionsAliasesResponse(
+            aliases=[
+                AliasDescription(alias_name=alias, collection_name=collection_name)
+                for alias, collection_name in self._aliases.items()
+            ]
+        )
+
+    def update_collection_aliases(self, change_aliases_operations: Sequence[Any], **kwargs) -> bool:
+        with self._lock:
+            aliases = dict(self._aliases)
+            for operation in change_aliases_operations:
+                if isinstance(operation, CreateAliasOperation):
+                    aliases[operation.create_alias.alias_name] = operation.create_alias.collection_name
+                elif isinstance(operation, DeleteAliasOperation):
+                    aliases.pop(operation.delete_alias.alias_name, None)
+                else:
+                    raise ValueError(f"Unsupported alias operation: {operation}")
+            self._save_aliases(aliases)
+
+        return True
+
+    def _save_aliases(self, aliases: dict[str, str]) -> None:
+        (self.path / "aliases.json").write_text(json.dumps(aliases))
+        self._aliases = aliases
+
+    def _get_collection(self, collection_name: str) -> MmapCollection:
+        name = self._aliases.get(collection_name, collection_name)
+        with self._lock:
+            if name not in self._collections:
+                if not (self.path / name / "config.json").exists():
+                    raise _error(404, f"Collection `{collection_name}` doesn't exist!")
+
+                self._collections[name] = MmapCollection(self.path / name, hnsw=self.hnsw)
+
+            return self._collections[name]
+
+    # --- Points ---
+
+    def upsert(self, collection_name: str, points: Sequence[PointStruct], **kwargs) -> UpdateResult:
+        self._get_collection(collection_name).upsert(points)
+
+        return UpdateResult(operation_id=0, status=UpdateStatus.COMPLETED)
+
+    def delete(self, collection_name: str, points_selector: Any, **kwargs) -> UpdateResult:
+        collection = self._get_collection(collection_name)
+        with collection.lock:
+            if isinstance(points_selector, FilterSelector):
+                rows = np.flatnonzero(collection.filter_mask(points_selector.filter))
+            else:
+                point_ids = points_selector.points if isinstance(points_selector, PointIdsList) else points_selector
+                rows = np.asarray(collection.ids_to_rows(point_ids), dtype=np.int64)
+            collection.delete(rows)
+
+        return UpdateResult(operation_id=0, status=UpdateStatus.COMPLETED)
+
+    def retrieve(
+        self, collection_name: str, ids: Sequence[Any], with_payload: Any = True, with_vectors: Any = False, **kwargs
+    ) -> list[Record]:
+        collection = self._get_collection(collection_name)
+        with collection.lock:
+            rows = collection.ids_to_rows(ids)
+
+            return [
+                Record(id=id_, payload=payload, vector=vector)
+                for id_, payload, vector in self._load_points(collection, rows, with_payload, with_vectors)
+            ]
+
+    def scroll(
+        self,
+        collection_name: str,
+        scroll_filter: Filter | None = None,
+        limit: int = 10,
+        offset: Any = None,
+        with_payload: Any = True,
+        with_vectors: Any = False,
+        **kwargs,
+    ) -> tuple[list[Record], str | None]:
+        collection = self._get_collection(collection_name)
+        with collection.lock:
+            # As Qdrant does, the points are scrolled in the order of their IDs, the offset being the first ID.
+            rows, ids = collection.sorted_ids()
+            start = int(np.searchsorted(ids, str(offset))) if offset is not None else 0
+            rows, ids = rows[start:], ids[start:]
+            if scroll_filter is not None:
+                matched = collection.filter_mask(scroll_filter)[rows]
+                rows, ids = rows[matched], ids[matched]
+
+            page_rows = rows[:limit].tolist()
+            next_offset = ids[limit] if limit < len(ids) else None
+            records = [
+                Record(id=id_, payload=payload, vector=vector)
+                for id_, payload, vector in self._load_points(collection, page_rows, with_payload, with_vectors)
+            ]
+
+        return records, next_offset
+
+    def count(self, collection_name: str, count_filter: Filter | None = None, **kwargs) -> CountResult:
+        collection = self._get_collection(collection_name)
+        with collection.lock:
+            if count_filter is None:
+                return CountResult(count=collection.points_count)
+
+            return CountResult(count=int(collection.filter_mask(count_filter).sum()))
+
+    # --- Searches ---
+
+    def search(
+        self,
+        collection_name: str,
+        query_vector: Any,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+        limit: int = 10,
+        offset: int | None = None,
+        with_payload: Any = True,
+        with_vectors: Any = False,
+        **kwargs,
+    ) -> list[ScoredPoint]:
+        collection = self._get_collection(collection_name)
+        with collection.lock:
+            mask = collection.filter_mask(query_filter)
+            scored_rows = self._score(collection, query_vector, None, mask, limit + (offset or 0), search_params)
+
+            return self._to_scored_points(collection, scored_rows[offset or 0 :], with_payload, with_vectors)
+
+    def search_batch(
+        self, collection_name: str, requests: Sequence[SearchRequest], **kwargs
+    ) -> list[list[ScoredPoint]]:
+        return [
+            self.search(
+                collection_name,
+                query_vector=request.vector,
+                query_filter=request.filter,
+                search_params=request.params,
+                limit=request.limit,
+                offset=request.offset,
+                with_payload=request.with_payload if request.with_payload is not None else False,
+                with_vectors=request.with_vector or False,
+            )
+            for request in requests
+        ]
+
+    def search_groups(
+        self,
+        collection_name: str,
+        query_vector: Any,
+        group_by: str,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+        limit: int = 10,
+        group_size: int = 1,
+        with_payload: Any = True,
+        with_vectors: Any = False,
+        **kwargs,
+    ) -> GroupsResult:
+        collection = self._get_collection(collection_name)
+        with collection.lock:
+            mask = collection.filter_mask(query_filter)
+            scored_rows = self._score(collection, query_vector, None, mask, collection.points_count, search_params)
+
+            return self._group(collection, scored_rows, group_by, limit, group_size, with_payload, with_vectors)
+
+    def query_batch_points(
+        self, collection_name: str, requests: Sequence[QueryRequest], **kwargs
+    ) -> list[QueryResponse]:
+        collection = self._get_collection(collection_name)
+        responses = []
+        with collection.lock:
+            for request in requests:
+                offset = request.offset or 0
+                limit = (request.limit or 10) + offset
+                scored_rows = self._query(collection, request, collection.filter_mask(None), limit)
+                responses.append(
+                    QueryResponse(
+                        points=self._to_scored_points(
+                            collection,
+                            scored_rows[offset:],
+                            request.with_payload if request.with_payload is not None else True,
+                            request.with_vector or False,
+                        )
+                    )
+                )
+
+        return responses
+
+    def query_points_groups(
+        self,
+        collection_name: str,
+        group_by: str,
+        query: Any = None,
+        prefetch: Any = None,
+        query_filter: Filter | None = None,
+        search_params: SearchParams | None = None,
+        limit: int = 10,
+        group_size: int = 3,
+        with_payload: Any = True,
+        with_vectors: Any = False,
+        using: str | None = None,
+        **kwargs,
+    ) -> GroupsResult:
+        collection = self._get_collection(collection_name)
+        request = QueryRequest(prefetch=prefetch, query=query, using=using, filter=query_filter, params=search_params)
+        with collection.lock:
+            scored_rows = self._query(collection, request, collection.filter_mask(None), collection.points_count)
+
+            return self._group(collection, scored_rows, group_by, limit, group_size, with_payload, with_vectors)
+
+    def _query(self, collection: MmapCollection, request: Any, mask: np.ndarray, limit: int) -> list[tuple[int, float]]:
+        """Runs a `QueryRequest` or a `Prefetch`: its prefetches first, then its query over their candidates."""
+
+        if request.filter is not None:
+            mask = mask & collection.filter_mask(request.filter)
+
+        prefetches = request.prefetch if isinstance(request.prefetch, list) else _as_list(request.prefetch)
+        candidates = [self._query(collection, prefetch, mask, prefetch.limit or 10) for prefetch in prefetches]
+
+        query = request.query
+        if isinstance(query, FusionQuery):
+            if query.fusion != Fusion.RRF:
+                raise ValueError(f"Unsupported fusion for the in-process vector backend: {query.fusion}")
+
+            return _reciprocal_rank_fusion(candidates, limit)
+
+        if len(candidates) > 0:
+            # Rescoring: the query only ranks the candidates of the prefetches.
+            candidates_mask = np.zeros_like(mask)
+            for scored_rows in candidates:
+                candidates_mask[[row for row, _ in scored_rows]] = True
+            mask = mask & candidates_mask
+
+        return self._score(collection, getattr(query, "nearest", query), request.using, mask, limit, request.params)
+
+    def _score(
+        self,
+        collection: MmapCollection,
+        query_vector: Any,
+        using: str | None,
+        mask: np.ndarray,
+        limit: int,
+        search_params: SearchParams | None,
+    ) -> list[tuple[int, float]]:
+        if isinstance(query_vector, NamedSparseVector):
+            return collection.score_sparse(query_vector.name, query_vector.vector, mask, limit)
+        if isinstance(query_vector, SparseVector):
+            return collection.score_sparse(using or "", query_vector, mask, limit)
+        if isinstance(query_vector, NamedVector):
+            using, query_vector = query_vector.name, query_vector.vector
+        elif isinstance(query_vector, tuple):
+            using, query_vector = query_vector
+
+        return collection.score_dense(using or "", query_vector, mask, limit, search_params)
+
+    def _group(
+        self,
+        collection: MmapCollection,
+        scored_rows: list[tuple[int, float]],
+        group_by: str,
+        limit: int,
+        group_size: int,
+        with_payload: Any,
+        with_vectors: Any,
+    ) -> GroupsResult:
+        group_keys = collection.load_payloads([row for row, _ in scored_rows])
+        groups: dict[Any, list[tuple[int, float]]] = {}
+        for row, score in scored_rows:
+            group_id = _get_value(group_keys[row], group_by)
+            if group_id is None or isinstance(group_id, (list, dict)):
+                continue
+            if group_id not in groups and len(groups) == limit:
+                continue
+
+            if len(groups.setdefault(group_id, [])) < group_size:
+                groups[group_id].append((row, score))
+
+        return GroupsResult(
+            groups=[
+                PointGroup(id=group_id, hits=self._to_scored_points(collection, hits, with_payload, with_vectors))
+                for group_id, hits in groups.items()
+            ]
+        )
+
+    def _to_scored_points(
+        self, collection: MmapCollection, scored_rows: list[tuple[int, float]], with_payload: Any, with_vectors: Any
+    ) -> list[ScoredPoint]:
+        points = self._load_points(collection, [row for row, _ in scored_rows], with_payload, with_vectors)
+
+        return [
+            ScoredPoint(id=id_, version=0, score=score, payload=payload, vector=vector)
+            for (id_, payload, vector), (_, score) in zip(points, scored_rows, strict=True)
+        ]
+
+    def _load_points(
+        self, collection: MmapCollection, rows: list[int], with_payload: Any, with_vectors: Any
+    ) -> list[tuple[str, dict | None, Any]]:
+        select_payload = _payload_selector(with_payload)
+        payloads = collection.load_payloads(rows) if select_payload is not None else {}
+        vector_names = set(with_vectors) if isinstance(with_vectors, list) else None
+
+        return [
+            (
+                id_,
+                select_payload(payloads[row]) if select_payload is not None else None,
+                collection.load_vectors(row, vector_names) if with_vectors else None,
+            )
+            for id_, row in zip(collection.rows_to_ids(rows), rows, strict=True)
+        ]
+
+
+class AsyncMmapVectorClient:
+    """
+    Async facade of `MmapVectorClient`, running its methods on worker threads, like `AsyncQdrantClient`.
+    It also wraps the `QdrantClient` of Qdrant local mode, whose storage folder can't be opened twice.
+    """
+
+    def __init__(self, client: MmapVectorClient | QdrantClient) -> None:
+        self._client = client
+
+    def __getattr__(self, name: str) -> Callable:
+        method = getattr(self._client, name)
+
+        async def _run(*args, **kwargs) -> Any:
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return _run
+
+
+def _error(status_code: int, message: str) -> UnexpectedResponse:
+    # Raise the same exception as the Qdrant REST client, which is what the ODM handles.
+    content = json.dumps({"status": {"error": message}}).encode()
+
+    return UnexpectedResponse(status_code=status_code, reason_phrase=message, content=content, headers=httpx.Headers())
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    if len(array) >= capacity:
+        return array
+
+    grown = np.full(capacity, None, dtype=object) if array.dtype == object else np.zeros(capacity, dtype=array.dtype)
+    grown[: len(array)] = array
+
+    return grown
+
+
+def _as_list(value: Any) -> list:
+    if value is None:
+        return []
+
+    return value if isinstance(value, list) else [value]
+
+
+def _get_value(payload: dict, key: str) -> Any:
+    value = payload
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+
+    return value
+
+
+def _payload_selector(with_payload: Any) -> Callable[[dict], dict] | None:
+    if with_payload is True:
+        return lambda payload: payload
+    if with_payload is False or with_payload is None:
+        return None
+    if isinstance(with_payload, PayloadSelectorExclude):
+        excluded_keys = set(with_payload.exclude)
+
+        return lambda payload: {key: value for key, value in payload.items() if key not in excluded_keys}
+
+    keys = with_payload.include if isinstance(with_payload, PayloadSelectorInclude) else with_payload
+
+    return lambda payload: {key: payload[key] for key in keys if key in payload}
+
+
+def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    k = min(k, len(rows))
+    if k <= 0:
+        return rows[:0], scores[:0]
+
+    top = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+    # Ties are broken by insertion order.
+    top = top[np.lexsort((rows[top], -scores[top]))]
+
+    return rows[top], scores[top]
+
+
+def _reciprocal_rank_fusion(rankings: list[list[tuple[int, float]]], limit: int) -> list[tuple[int, float]]:
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for position, (row, _) in enumerate(ranking):
+            scores[row] = scores.get(row, 0.0) + 1 / (RRF_RANKING_CONSTANT + position)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
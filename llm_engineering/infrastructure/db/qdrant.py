@@ -1,41 +1,120 @@
+from threading import Lock
+
+import httpx
 from loguru import logger
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 from llm_engineering.settings import settings
 
+from .mmap_vectors import AsyncMmapVectorClient, MmapVectorClient
+
 
 class QdrantDatabaseConnector:
+    """
+    Thread-safe singleton around a pooled `QdrantClient`.
+    The same client is shared by all the threads of the process (e.g., the retriever and the bulk loader).
+    """
+
     _instance: QdrantClient | None = None
+    _lock: Lock = Lock()
 
     def __new__(cls, *args, **kwargs) -> QdrantClient:
-        if cls._instance is None:
-            try:
-                if settings.USE_QDRANT_CLOUD:
-                    cls._instance = QdrantClient(
-                        url=settings.QDRANT_CLOUD_URL,
-                        api_key=settings.QDRANT_APIKEY,
-                    )
-
-                    uri = settings.QDRANT_CLOUD_URL
-                else:
-                    cls._instance = QdrantClient(
-                        host=settings.QDRANT_DATABASE_HOST,
-                        port=settings.QDRANT_DATABASE_PORT,
-                    )
-
-                    uri = f"{settings.QDRANT_DATABASE_HOST}:{settings.QDRANT_DATABASE_PORT}"
-
-                logger.info(f"Connection to Qdrant DB with URI successful: {uri}")
-            except UnexpectedResponse:
-                logger.exception(
-                    "Couldn't connect to Qdrant.",
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls._create_client(QdrantClient)
+
+        return cls._instance
+
+    @classmethod
+    def _create_client(cls, client_class: type[QdrantClient] | type[AsyncQdrantClient]):
+        if settings.VECTOR_DB_BACKEND == "mmap":
+            return cls._create_mmap_client(client_class)
+
+        if settings.QDRANT_LOCAL_PATH is not None:
+            if client_class is AsyncQdrantClient:
+                # A second local client can't open the storage folder locked by the first one, so share it.
+                return AsyncMmapVectorClient(QdrantDatabaseConnector())
+
+            # Local mode runs exact searches only, which is enough for tests and benchmark dry runs.
+            logger.info(f"Using Qdrant in local mode, stored in '{settings.QDRANT_LOCAL_PATH}'.")
+
+            return client_class(path=settings.QDRANT_LOCAL_PATH)
+
+        client_kwargs = {
+            "prefer_grpc": settings.QDRANT_PREFER_GRPC,
+            "grpc_port": settings.QDRANT_GRPC_PORT,
+            "timeout": settings.QDRANT_TIMEOUT,
+            "limits": httpx.Limits(
+                max_connections=settings.QDRANT_CONNECTION_POOL_SIZE,
+                max_keepalive_connections=settings.QDRANT_CONNECTION_POOL_SIZE,
+            ),
+        }
+
+        try:
+            if settings.USE_QDRANT_CLOUD:
+                client = client_class(
+                    url=settings.QDRANT_CLOUD_URL,
+                    api_key=settings.QDRANT_APIKEY,
+                    **client_kwargs,
+                )
+
+                uri = settings.QDRANT_CLOUD_URL
+            else:
+                client = client_class(
                     host=settings.QDRANT_DATABASE_HOST,
                     port=settings.QDRANT_DATABASE_PORT,
-                    url=settings.QDRANT_CLOUD_URL,
+                    **client_kwargs,
                 )
 
-                raise
+                uri = f"{settings.QDRANT_DATABASE_HOST}:{settings.QDRANT_DATABASE_PORT}"
+
+            logger.info(
+                f"Connection to Qdrant DB with URI successful: {uri}",
+                client=client_class.__name__,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                connection_pool_size=settings.QDRANT_CONNECTION_POOL_SIZE,
+            )
+        except UnexpectedResponse:
+            logger.exception(
+                "Couldn't connect to Qdrant.",
+                host=settings.QDRANT_DATABASE_HOST,
+                port=settings.QDRANT_DATABASE_PORT,
+                url=settings.QDRANT_CLOUD_URL,
+            )
+
+            raise
+
+        return client
+
+    @classmethod
+    def _create_mmap_client(
+        cls, client_class: type[QdrantClient] | type[AsyncQdrantClient]
+    ) -> MmapVectorClient | AsyncMmapVectorClient:
+        if client_class is AsyncQdrantClient:
+            # Both APIs must share the same in-process storage.
+            return AsyncMmapVectorClient(QdrantDatabaseConnector())
+
+        logger.info(
+            f"Using the in-process vector database stored in '{settings.MMAP_VECTOR_DB_PATH}'.",
+            hnsw=settings.MMAP_VECTOR_DB_HNSW,
+        )
+
+        return MmapVectorClient(path=settings.MMAP_VECTOR_DB_PATH, hnsw=settings.MMAP_VECTOR_DB_HNSW)
+
+
+class AsyncQdrantDatabaseConnector(QdrantDatabaseConnector):
+    """
+    Lazily created singleton around an `AsyncQdrantClient`, used by the async methods of the vector ODM.
+    """
+
+    _instance: AsyncQdrantClient | None = None
+    _lock: Lock = Lock()
+
+    def __new__(cls, *args, **kwargs) -> AsyncQdrantClient:
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls._create_client(AsyncQdrantClient)
 
         return cls._instance
 
@@ -0,0 +1,332 @@
+import hashlib
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from enum import Enum
+from threading import Lock
+from typing import Any, NamedTuple
+from uuid import UUID
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel
+
+from llm_engineering.domain.exceptions import ImproperlyConfigured
+from llm_engineering.settings import settings
+
+try:
+    import redis
+except ModuleNotFoundError:
+    redis = None
+
+
+class SearchCacheStats(NamedTuple):
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+
+        return self.hits / total if total > 0 else 0.0
+
+
+class SearchCacheBackend(ABC):
+    """
+    Stores the cached search results and the generation counter of each collection. The counters must be
+    shared by all the processes writing to the collections, so a write invalidates their cached results too.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None: ...
+
+    @abstractmethod
+    def get_generation(self, namespace: str) -> int: ...
+
+    @abstractmethod
+    def bump_generation(self, namespace: str) -> int: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class InMemorySearchCacheBackend(SearchCacheBackend):
+    """
+    An in-process LRU cache, whose entries also expire after `ttl` seconds.
+
+    It only supports a single process: its generation counters are not shared, so the writes of another
+    process (e.g. a pipeline reindexing the collections read by the inference server) don't invalidate its
+    entries, which are served stale until they expire. Use `RedisSearchCacheBackend` when several processes
+    use the ODM.
+
+    The cached values are returned as is, not copied: the callers must not mutate them.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+
+                return None
+
+            self._entries.move_to_end(key)
+
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str) -> int:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+            return self._generations[namespace]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisSearchCacheBackend(SearchCacheBackend):
+    """
+    A cache shared by all the processes connected to the same Redis server. The values are serialized to JSON
+    (see `_to_json_value`), never unpickled: a value read from the server can't run code.
+
+    The entries expire after `ttl` seconds. The LRU eviction is left to the server's `maxmemory-policy`.
+    """
+
+    def __init__(self, url: str, ttl: float | None = None, prefix: str = "vector_search_cache") -> None:
+        if redis is None:
+            raise ImproperlyConfigured("The 'redis' package is required to share the vector search cache.")
+
+        self.ttl = ttl
+        self.prefix = prefix
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Any | None:
+        value = self._client.get(f"{self.prefix}:results:{key}")
+
+        return _from_json_value(json.loads(value)) if value is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            encoded_value = json.dumps(_to_json_value(value))
+        except TypeError:
+            logger.warning("Couldn't cache the search results: they can't be serialized to JSON.", exc_info=True)
+
+            return
+
+        ttl = int(self.ttl) if self.ttl is not None else None
+        self._client.set(f"{self.prefix}:results:{key}", encoded_value, ex=ttl)
+
+    def get_generation(self, namespace: str) -> int:
+        return int(self._client.get(f"{self.prefix}:generation:{namespace}") or 0)
+
+    def bump_generation(self, namespace: str) -> int:
+        return self._client.incr(f"{self.prefix}:generation:{namespace}")
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=f"{self.prefix}:results:*"):
+            self._client.delete(key)
+
+
+class SearchCache:
+    """
+    Caches search results in a backend, keyed on the searched collection, its generation, the query vector
+    and the search parameters.
+
+    The query vectors are rounded to `decimals` before being hashed, so the re-computed embeddings of the
+    same query, which can differ in their last bits, share an entry. Writing to a collection bumps its
+    generation: the keys change, and the results cached before the write are never served again.
+    """
+
+    def __init__(self, backend: SearchCacheBackend, decimals: int = 4) -> None:
+        self.backend = backend
+        self.decimals = decimals
+
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def build_key(self, namespace: str, generation: int, query_vector: Any, **params) -> str:
+        quantized_vector = np.round(np.asarray(query_vector, dtype=np.float64) * 10**self.decimals).astype(np.int64)
+
+        digest = hashlib.blake2b(quantized_vector.tobytes(), digest_size=16)
+        digest.update(json.dumps(params, sort_keys=True, default=self._to_json).encode())
+
+        return f"{namespace}:{generation}:{digest.hexdigest()}"
+
+    def get(self, key: str) -> Any | None:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.backend.set(key, value)
+
+    def get_generation(self, namespace: str) -> int:
+        return self.backend.get_generation(namespace)
+
+    def invalidate(self, namespace: str) -> None:
+        self.backend.bump_generation(namespace)
+
+    def stats(self) -> SearchCacheStats:
+        with self._lock:
+            return SearchCacheStats(hits=self._hits, misses=self._misses)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    @staticmethod
+    def _to_json(value: Any) -> Any:
+        if isinstance(value, BaseModel):
+            return value.model_dump(mode="json", exclude_none=True)
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, (set, frozenset)):
+            return sorted(value, key=str)
+        if isinstance(value, (UUID, Enum)):
+            return str(value)
+
+        return repr(value)
+
+
+# --- JSON encoding of the cached search results: documents (possibly partial), tuples, UUIDs and embeddings. ---
+# --- The types JSON can't represent are tagged. Only classes already imported by the process are rebuilt. ---
+
+
+def _to_json_value(value: Any) -> Any:
+    if value is None or (isinstance(value, (bool, int, float, str)) and not isinstance(value, Enum)):
+        return value
+    if isinstance(value, list):
+        return [_to_json_value(item) for item in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [_to_json_value(item) for item in value]}
+    if isinstance(value, dict):
+        return {"__dict__": [[_to_json_value(key), _to_json_value(item)] for key, item in value.items()]}
+    if isinstance(value, UUID):
+        return {"__uuid__": str(value)}
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, Enum):
+        return {"__enum__": _get_class_path(value.__class__), "value": _to_json_value(value.value)}
+    if isinstance(value, BaseModel):
+        return {
+            "__model__": _get_class_path(value.__class__),
+            # Only the fields of the instance: a partial document stays partial.
+            "fields": {name: _to_json_value(item) for name, item in value.__dict__.items()},
+            "fields_set": sorted(value.model_fields_set),
+        }
+
+    raise TypeError(f"Can't serialize a {type(value).__name__} to JSON.")
+
+
+def _from_json_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_from_json_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    if "__tuple__" in value:
+        return tuple(_from_json_value(item) for item in value["__tuple__"])
+    if "__dict__" in value:
+        return {_from_json_value(key): _from_json_value(item) for key, item in value["__dict__"]}
+    if "__uuid__" in value:
+        return UUID(value["__uuid__"])
+    if "__ndarray__" in value:
+        return np.asarray(value["__ndarray__"], dtype=np.dtype(value["dtype"]))
+    if "__enum__" in value:
+        return _resolve_class(value["__enum__"], Enum)(_from_json_value(value["value"]))
+    if "__model__" in value:
+        model_class = _resolve_class(value["__model__"], BaseModel)
+        # Rebuilt without validation nor defaults, as the instance was cached.
+        instance = model_class.__new__(model_class)
+        object.__setattr__(
+            instance, "__dict__", {name: _from_json_value(item) for name, item in value["fields"].items()}
+        )
+        object.__setattr__(instance, "__pydantic_fields_set__", set(value["fields_set"]))
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+
+        return instance
+
+    raise ValueError(f"Unknown cached value: {value}.")
+
+
+def _get_class_path(value_class: type) -> str:
+    return f"{value_class.__module__}:{value_class.__qualname__}"
+
+
+def _resolve_class(class_path: str, base_class: type) -> type:
+    module_name, qualname = class_path.split(":", 1)
+    # Unlike unpickling, nothing is imported: the class must already be loaded.
+    value_class = sys.modules.get(module_name)
+    for name in qualname.split("."):
+        value_class = getattr(value_class, name, None)
+
+    if not isinstance(value_class, type) or not issubclass(value_class, base_class):
+        raise ValueError(f"Can't rebuild a cached '{class_path}'.")
+
+    return value_class
+
+
+def create_search_cache() -> SearchCache | None:
+    if not settings.VECTOR_SEARCH_CACHE:
+        return None
+
+    if settings.VECTOR_SEARCH_CACHE == "memory":
+        backend = InMemorySearchCacheBackend(
+            max_size=settings.VECTOR_SEARCH_CACHE_MAX_SIZE, ttl=settings.VECTOR_SEARCH_CACHE_TTL
+        )
+    elif settings.VECTOR_SEARCH_CACHE == "redis":
+        backend = RedisSearchCacheBackend(
+            url=settings.VECTOR_SEARCH_CACHE_REDIS_URL, ttl=settings.VECTOR_SEARCH_CACHE_TTL
+        )
+    else:
+        raise ImproperlyConfigured(f"Unknown vector search cache backend: '{settings.VECTOR_SEARCH_CACHE}'.")
+
+    logger.info(
+        f"Caching the vector search results with {backend.__class__.__name__}.",
+        ttl=settings.VECTOR_SEARCH_CACHE_TTL,
+        decimals=settings.VECTOR_SEARCH_CACHE_DECIMALS,
+    )
+
+    return SearchCache(backend, decimals=settings.VECTOR_SEARCH_CACHE_DECIMALS)
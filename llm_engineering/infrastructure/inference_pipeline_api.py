@@ -1,3 +1,5 @@
+import asyncio
+
 import opik
 from fastapi import FastAPI, HTTPException
 from opik import opik_context
@@ -34,12 +36,12 @@ def call_llm_service(query: str, context: str | None) -> str:
 
 
 @opik.track
-def rag(query: str) -> str:
+async def rag(query: str) -> str:
     retriever = ContextRetriever(mock=False)
-    documents = retriever.search(query, k=3)
+    documents = await retriever.asearch(query, k=3)
     context = EmbeddedChunk.to_context(documents)
 
-    answer = call_llm_service(query, context)
+    answer = await asyncio.to_thread(call_llm_service, query, context)
 
     opik_context.update_current_trace(
         tags=["rag"],
@@ -59,7 +61,7 @@ def rag(query: str) -> str:
 @app.post("/rag", response_model=QueryResponse)
 async def rag_endpoint(request: QueryRequest):
     try:
-        answer = rag(query=request.query)
+        answer = await rag(query=request.query)
 
         return {"answer": answer}
     except Exception as e:
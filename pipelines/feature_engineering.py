@@ -4,13 +4,23 @@ from steps import feature_engineering as fe_steps
 
 
 @pipeline
-def feature_engineering(author_full_names: list[str], wait_for: str | list[str] | None = None) -> list[str]:
+def feature_engineering(
+    author_full_names: list[str],
+    wait_for: str | list[str] | None = None,
+    incremental: bool = False,
+    defer_indexing: bool = False,
+    delete_stale_chunks: bool = True,
+) -> list[str]:
     raw_documents = fe_steps.query_data_warehouse(author_full_names, after=wait_for)
 
     cleaned_documents = fe_steps.clean_documents(raw_documents)
-    last_step_1 = fe_steps.load_to_vector_db(cleaned_documents)
+    last_step_1 = fe_steps.load_to_vector_db(cleaned_documents, defer_indexing=defer_indexing)
 
-    embedded_documents = fe_steps.chunk_and_embed(cleaned_documents)
-    last_step_2 = fe_steps.load_to_vector_db(embedded_documents)
+    embedded_documents = fe_steps.chunk_and_embed(cleaned_documents, incremental=incremental)
+    last_step_2 = fe_steps.load_to_vector_db(embedded_documents, defer_indexing=defer_indexing)
+
+    if delete_stale_chunks:
+        # Depends on the load's outcome: it only deletes once all the new chunks are loaded successfully.
+        last_step_2 = fe_steps.delete_stale_chunks(cleaned_documents, loaded=last_step_2)
 
     return [last_step_1.invocation_id, last_step_2.invocation_id]
@@ -1,4 +1,5 @@
 from .clean import clean_documents
+from .delete_stale_chunks import delete_stale_chunks
 from .load_to_vector_db import load_to_vector_db
 from .query_data_warehouse import query_data_warehouse
 from .rag import chunk_and_embed
@@ -8,4 +9,5 @@ __all__ = [
     "load_to_vector_db",
     "query_data_warehouse",
     "chunk_and_embed",
+    "delete_stale_chunks",
 ]
@@ -0,0 +1,47 @@
+from loguru import logger
+from typing_extensions import Annotated
+from zenml import get_step_context, step
+
+from llm_engineering.application.preprocessing import ChunkingDispatcher
+from llm_engineering.domain.base import VectorBaseDocument
+from llm_engineering.domain.embedded_chunks import EmbeddedChunk
+
+
+@step
+def delete_stale_chunks(
+    cleaned_documents: Annotated[list, "cleaned_documents"],
+    loaded: Annotated[bool, "loaded"],
+) -> Annotated[bool, "successful"]:
+    # Chunk IDs are the md5 of their content, so an edited document gets new chunks and the old ones must be deleted.
+    # Re-chunking is cheap and, unlike the embedded documents, also covers the chunks skipped by the incremental mode.
+
+    if not loaded:
+        # The new chunks of the edited documents may be missing: deleting their old ones would lose them.
+        logger.error("Skipping the deletion of the stale chunks, as the new chunks failed to load.")
+
+        return False
+
+    chunks = []
+    for document in cleaned_documents:
+        chunks.extend(ChunkingDispatcher.dispatch(document))
+
+    embedded_chunk_classes = {
+        embedded_chunk_class.get_category(): embedded_chunk_class
+        for embedded_chunk_class in EmbeddedChunk.get_registered_classes()
+    }
+
+    metadata = {}
+    successful = True
+    for category, category_chunks in VectorBaseDocument.group_by_category(chunks).items():
+        embedded_chunk_class = embedded_chunk_classes[category]
+        if not embedded_chunk_class.delete_stale(category_chunks, key="document_id"):
+            logger.error(f"Failed to delete the stale chunks of {embedded_chunk_class.get_collection_name()}")
+
+            successful = False
+
+        metadata[category] = {"num_documents": len({chunk.document_id for chunk in category_chunks})}
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(output_name="successful", metadata=metadata)
+
+    return successful
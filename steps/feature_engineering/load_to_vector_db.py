@@ -2,25 +2,36 @@ from loguru import logger
 from typing_extensions import Annotated
 from zenml import step
 
-from llm_engineering.application import utils
 from llm_engineering.domain.base import VectorBaseDocument
 
 
 @step
 def load_to_vector_db(
     documents: Annotated[list, "documents"],
+    batch_size: int = 256,
+    max_workers: int = 4,
+    defer_indexing: bool = False,
 ) -> Annotated[bool, "successful"]:
     logger.info(f"Loading {len(documents)} documents into the vector database.")
 
     grouped_documents = VectorBaseDocument.group_by_class(documents)
     for document_class, documents in grouped_documents.items():
         logger.info(f"Loading documents into {document_class.get_collection_name()}")
-        for documents_batch in utils.misc.batch(documents, size=4):
-            try:
-                document_class.bulk_insert(documents_batch)
-            except Exception:
-                logger.error(f"Failed to insert documents into {document_class.get_collection_name()}")
+        try:
+            successful = document_class.bulk_insert(
+                documents,
+                bulk_load=True,
+                defer_indexing=defer_indexing,
+                wait_for_indexing=defer_indexing,
+                batch_size=batch_size,
+                max_workers=max_workers,
+            )
+        except Exception:
+            successful = False
 
-                return False
+        if not successful:
+            logger.error(f"Failed to insert documents into {document_class.get_collection_name()}")
+
+            return False
 
     return True
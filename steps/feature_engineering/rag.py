@@ -1,8 +1,10 @@
+from loguru import logger
 from typing_extensions import Annotated
 from zenml import get_step_context, step
 
 from llm_engineering.application import utils
 from llm_engineering.application.preprocessing import ChunkingDispatcher, EmbeddingDispatcher
+from llm_engineering.domain.base import VectorBaseDocument
 from llm_engineering.domain.chunks import Chunk
 from llm_engineering.domain.embedded_chunks import EmbeddedChunk
 
@@ -10,20 +12,30 @@ from llm_engineering.domain.embedded_chunks import EmbeddedChunk
 @step
 def chunk_and_embed(
     cleaned_documents: Annotated[list, "cleaned_documents"],
+    incremental: bool = False,
 ) -> Annotated[list, "embedded_documents"]:
     metadata = {"chunking": {}, "embedding": {}, "num_documents": len(cleaned_documents)}
 
-    embedded_chunks = []
+    chunks = []
     for document in cleaned_documents:
-        chunks = ChunkingDispatcher.dispatch(document)
-        metadata["chunking"] = _add_chunks_metadata(chunks, metadata["chunking"])
+        document_chunks = ChunkingDispatcher.dispatch(document)
+        metadata["chunking"] = _add_chunks_metadata(document_chunks, metadata["chunking"])
+
+        chunks.extend(document_chunks)
+
+    num_chunks = len(chunks)
+    if incremental is True:
+        chunks = _filter_stored_chunks(chunks)
 
-        for batched_chunks in utils.misc.batch(chunks, 10):
+    embedded_chunks = []
+    for category_chunks in VectorBaseDocument.group_by_category(chunks).values():
+        for batched_chunks in utils.misc.batch(category_chunks, 10):
             batched_embedded_chunks = EmbeddingDispatcher.dispatch(batched_chunks)
             embedded_chunks.extend(batched_embedded_chunks)
 
     metadata["embedding"] = _add_embeddings_metadata(embedded_chunks, metadata["embedding"])
-    metadata["num_chunks"] = len(embedded_chunks)
+    metadata["num_chunks"] = num_chunks
+    metadata["num_skipped_chunks"] = num_chunks - len(chunks)
     metadata["num_embedded_chunks"] = len(embedded_chunks)
 
     step_context = get_step_context()
@@ -32,6 +44,28 @@ def chunk_and_embed(
     return embedded_chunks
 
 
+def _filter_stored_chunks(chunks: list[Chunk]) -> list[Chunk]:
+    """Drop the chunks already stored in their embedded collection. Chunk IDs are the md5 of their content."""
+
+    embedded_chunk_classes = {
+        embedded_chunk_class.get_category(): embedded_chunk_class
+        for embedded_chunk_class in EmbeddedChunk.get_registered_classes()
+    }
+
+    new_chunks = []
+    for category, category_chunks in VectorBaseDocument.group_by_category(chunks).items():
+        embedded_chunk_class = embedded_chunk_classes[category]
+        existing_ids = embedded_chunk_class.find_existing_ids([chunk.id for chunk in category_chunks])
+        new_chunks.extend(chunk for chunk in category_chunks if chunk.id not in existing_ids)
+
+        logger.info(
+            f"Skipping {len(existing_ids)} chunks already stored in '{embedded_chunk_class.get_collection_name()}'.",
+            num_new_chunks=len(category_chunks) - len(existing_ids),
+        )
+
+    return new_chunks
+
+
 def _add_chunks_metadata(chunks: list[Chunk], metadata: dict) -> dict:
     for chunk in chunks:
         category = chunk.get_category()
@@ -54,7 +88,7 @@ def _add_embeddings_metadata(embedded_chunks: list[EmbeddedChunk], metadata: dic
     for embedded_chunk in embedded_chunks:
         category = embedded_chunk.get_category()
         if category not in metadata:
-            metadata[category] = embedded_chunk.metadata
+            metadata[category] = embedded_chunk.build_collection_metadata()
         if "authors" not in metadata[category]:
             metadata[category]["authors"] = list()
 
@@ -1,7 +1,6 @@
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from loguru import logger
-from qdrant_client.http import exceptions
 from typing_extensions import Annotated
 from zenml import step
 
@@ -64,14 +63,5 @@ def __fetch_repositories() -> list[CleanedDocument]:
     return __fetch(CleanedRepositoryDocument)
 
 
-def __fetch(cleaned_document_type: type[CleanedDocument], limit: int = 1) -> list[CleanedDocument]:
-    try:
-        cleaned_documents, next_offset = cleaned_document_type.bulk_find(limit=limit)
-    except exceptions.UnexpectedResponse:
-        return []
-
-    while next_offset:
-        documents, next_offset = cleaned_document_type.bulk_find(limit=limit, offset=next_offset)
-        cleaned_documents.extend(documents)
-
-    return cleaned_documents
+def __fetch(cleaned_document_type: type[CleanedDocument], batch_size: int = 256) -> list[CleanedDocument]:
+    return list(cleaned_document_type.scroll_iter(batch_size=batch_size))
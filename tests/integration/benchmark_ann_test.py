@@ -0,0 +1,78 @@
+import asyncio
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.infrastructure.db import qdrant as qdrant_connector
+from llm_engineering.infrastructure.db.mmap_vectors import AsyncMmapVectorClient
+from llm_engineering.infrastructure.db.search_cache import InMemorySearchCacheBackend, SearchCache
+from llm_engineering.settings import settings
+from tools import benchmark_ann
+
+from .documents import ChunkDocument
+
+
+@pytest.fixture
+def chunks(qdrant, make_chunks) -> list[ChunkDocument]:
+    chunks = make_chunks(20)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+
+    return chunks
+
+
+def test_load_vectors_returns_the_ids_and_embeddings(chunks) -> None:
+    ids, vectors = benchmark_ann.__load_vectors(ChunkDocument)
+
+    embeddings = {chunk.id: chunk.embedding for chunk in chunks}
+    assert set(ids) == set(embeddings)
+    assert vectors.dtype == np.float32
+    for point_id, vector in zip(ids, vectors, strict=True):
+        # Qdrant stores the cosine vectors normalized.
+        expected_vector = embeddings[point_id] / np.linalg.norm(embeddings[point_id])
+        assert vector / np.linalg.norm(vector) == pytest.approx(expected_vector, abs=1e-6)
+
+
+def test_exact_top_k_ranks_by_cosine_similarity() -> None:
+    ids = ["a", "b", "c"]
+    vectors = np.array([[1.0, 0.0], [10.0, 1.0], [0.0, 1.0]], dtype=np.float32)
+    query_vectors = np.array([[1.0, 0.0], [0.0, 2.0]], dtype=np.float32)
+
+    assert benchmark_ann.__exact_top_k(ids, vectors, query_vectors, k=2) == [{"a", "b"}, {"b", "c"}]
+    assert benchmark_ann.__exact_top_k(ids, vectors, query_vectors, k=5) == [{"a", "b", "c"}] * 2
+
+
+def test_benchmark_measures_the_recall_without_the_search_cache(chunks) -> None:
+    search_cache_backend = InMemorySearchCacheBackend()
+    VectorBaseDocument.set_search_cache(SearchCache(search_cache_backend))
+    ids, vectors = benchmark_ann.__load_vectors(ChunkDocument)
+    ground_truth = benchmark_ann.__exact_top_k(ids, vectors, vectors, k=5)
+
+    for search_settings in (benchmark_ann.SearchSettings(exact=True), benchmark_ann.SearchSettings(hnsw_ef=16)):
+        recall, latencies = benchmark_ann.__benchmark(ChunkDocument, vectors, ground_truth, 5, search_settings)
+
+        # Qdrant local mode always searches exactly.
+        assert recall == pytest.approx(1.0)
+        assert latencies.shape == (len(vectors),)
+    assert ChunkDocument.get_search_cache_stats() == (0, 0)
+    assert len(search_cache_backend) == 0
+
+
+def test_async_connector_shares_the_local_mode_client(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "VECTOR_DB_BACKEND", "qdrant")
+    monkeypatch.setattr(settings, "QDRANT_LOCAL_PATH", str(tmp_path / "qdrant"))
+    monkeypatch.setattr(qdrant_connector.QdrantDatabaseConnector, "_instance", None)
+    monkeypatch.setattr(qdrant_connector.AsyncQdrantDatabaseConnector, "_instance", None)
+
+    client = qdrant_connector.QdrantDatabaseConnector()
+    try:
+        aclient = qdrant_connector.AsyncQdrantDatabaseConnector()
+        client.create_collection(collection_name="test_chunks", vectors_config=ChunkDocument.get_vector_params())
+
+        assert isinstance(client, QdrantClient)
+        assert isinstance(aclient, AsyncMmapVectorClient)
+        assert asyncio.run(aclient.collection_exists(collection_name="test_chunks")) is True
+    finally:
+        client.close()
@@ -0,0 +1,58 @@
+import uuid
+from pathlib import Path
+from typing import Callable, Generator
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+from llm_engineering.domain.base import vector
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.infrastructure.db.mmap_vectors import MmapVectorClient
+
+from .documents import EMBEDDING_SIZE, ChunkDocument
+
+
+@pytest.fixture
+def qdrant(monkeypatch: pytest.MonkeyPatch) -> Generator[QdrantClient, None, None]:
+    """Backs the vector ODM with an in-memory Qdrant, in local mode, without a search cache."""
+
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr(vector, "connection", client)
+    monkeypatch.setattr(VectorBaseDocument, "_search_cache", None)
+
+    yield client
+
+    client.close()
+
+
+@pytest.fixture
+def mmap_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Generator[MmapVectorClient, None, None]:
+    """Backs the vector ODM with the in-process backend, in a temporary folder, without a search cache."""
+
+    client = MmapVectorClient(tmp_path / "vector_db")
+    monkeypatch.setattr(vector, "connection", client)
+    monkeypatch.setattr(VectorBaseDocument, "_search_cache", None)
+
+    yield client
+
+    client.close()
+
+
+@pytest.fixture
+def make_chunks() -> Callable[..., list[ChunkDocument]]:
+    rng = np.random.default_rng(seed=0)
+
+    def _make_chunks(num_chunks: int, document_id: uuid.UUID | None = None) -> list[ChunkDocument]:
+        document_id = document_id or uuid.uuid4()
+
+        return [
+            ChunkDocument(
+                content=f"chunk {i}",
+                document_id=document_id,
+                embedding=rng.random(EMBEDDING_SIZE, dtype=np.float32),
+            )
+            for i in range(num_chunks)
+        ]
+
+    return _make_chunks
@@ -0,0 +1,21 @@
+from pydantic import UUID4
+from qdrant_client.http.models import VectorParams
+
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.types import Embedding
+
+EMBEDDING_SIZE = 4
+
+
+class ChunkDocument(VectorBaseDocument):
+    content: str
+    document_id: UUID4
+    embedding: Embedding | None = None
+
+    class Config:
+        name = "test_chunks"
+
+    @classmethod
+    def get_vector_params(cls) -> VectorParams:
+        # A fixed size, so the tests don't load the embedding model only to read its embedding size.
+        return cls._get_vector_params(embedding_size=EMBEDDING_SIZE)
@@ -0,0 +1,70 @@
+import uuid
+from typing import ClassVar
+
+import pytest
+from fastapi.testclient import TestClient
+
+from llm_engineering.application.utils import misc
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk
+from llm_engineering.infrastructure import inference_pipeline_api
+
+
+class FakeContextRetriever:
+    queries: ClassVar[list[tuple[str, int]]] = []
+
+    def __init__(self, mock: bool = False) -> None:
+        pass
+
+    async def asearch(self, query: str, k: int = 3) -> list[EmbeddedArticleChunk]:
+        self.queries.append((query, k))
+
+        return [
+            EmbeddedArticleChunk(
+                content="Qdrant stores the vectors.",
+                embedding=None,
+                platform="medium",
+                link="https://medium.com/article",
+                document_id=uuid.uuid4(),
+                author_id=uuid.uuid4(),
+                author_full_name="first last",
+            )
+        ]
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    FakeContextRetriever.queries = []
+    monkeypatch.setattr(inference_pipeline_api, "ContextRetriever", FakeContextRetriever)
+    monkeypatch.setattr(misc, "compute_num_tokens", lambda text: len(text.split()))
+
+    return TestClient(inference_pipeline_api.app)
+
+
+def test_rag_answers_with_the_retrieved_context(client, monkeypatch) -> None:
+    contexts = []
+
+    def _call_llm_service(query: str, context: str | None) -> str:
+        contexts.append(context)
+
+        return "an answer"
+
+    monkeypatch.setattr(inference_pipeline_api, "call_llm_service", _call_llm_service)
+
+    response = client.post("/rag", json={"query": "Where are the vectors stored?"})
+
+    assert response.status_code == 200
+    assert response.json() == {"answer": "an answer"}
+    assert FakeContextRetriever.queries == [("Where are the vectors stored?", 3)]
+    assert "Qdrant stores the vectors." in contexts[0]
+
+
+def test_rag_reports_the_failures_as_server_errors(client, monkeypatch) -> None:
+    def _call_llm_service(query: str, context: str | None) -> str:
+        raise RuntimeError("endpoint unavailable")
+
+    monkeypatch.setattr(inference_pipeline_api, "call_llm_service", _call_llm_service)
+
+    response = client.post("/rag", json={"query": "query"})
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "endpoint unavailable"}
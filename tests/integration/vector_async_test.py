@@ -0,0 +1,80 @@
+import asyncio
+from typing import Generator
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.infrastructure.db.qdrant import AsyncQdrantDatabaseConnector
+
+from .documents import EMBEDDING_SIZE, ChunkDocument
+
+
+class OtherChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_other_async_chunks"
+
+
+@pytest.fixture
+def aqdrant(monkeypatch: pytest.MonkeyPatch) -> Generator[AsyncQdrantClient, None, None]:
+    """Backs the async API of the vector ODM with an in-memory `AsyncQdrantClient`, without a search cache."""
+
+    client = AsyncQdrantClient(":memory:")
+    monkeypatch.setattr(AsyncQdrantDatabaseConnector, "_instance", client)
+    monkeypatch.setattr(VectorBaseDocument, "_search_cache", None)
+
+    yield client
+
+    asyncio.run(client.close())
+
+
+def test_async_insert_find_and_search(aqdrant, make_chunks) -> None:
+    chunks = make_chunks(7)
+
+    async def _run() -> None:
+        assert await ChunkDocument.abulk_insert(chunks, batch_size=3) is True
+
+        documents, next_offset = await ChunkDocument.abulk_find(limit=4)
+        next_documents, last_offset = await ChunkDocument.abulk_find(limit=4, offset=next_offset)
+        assert {document.id for document in documents + next_documents} == {chunk.id for chunk in chunks}
+        assert last_offset is None
+
+        for chunk in chunks:
+            assert (await ChunkDocument.asearch(chunk.embedding, limit=1))[0].id == chunk.id
+
+    asyncio.run(_run())
+
+
+def test_async_search_batch_returns_the_results_of_each_request_in_order(aqdrant, make_chunks) -> None:
+    chunks = make_chunks(4)
+    other_chunks = [OtherChunkDocument(**chunk.model_dump()) for chunk in make_chunks(4)]
+
+    async def _run() -> list[list[VectorBaseDocument]]:
+        await ChunkDocument.abulk_insert(chunks)
+        await OtherChunkDocument.abulk_insert(other_chunks)
+
+        return await VectorBaseDocument.asearch_batch(
+            [
+                (OtherChunkDocument, other_chunks[2].embedding, None, 2),
+                (ChunkDocument, chunks[1].embedding, None, 3),
+                (OtherChunkDocument, other_chunks[0].embedding, None, 1),
+            ]
+        )
+
+    results = asyncio.run(_run())
+
+    assert [len(documents) for documents in results] == [2, 3, 1]
+    assert [documents[0].id for documents in results] == [other_chunks[2].id, chunks[1].id, other_chunks[0].id]
+    assert all(isinstance(document, OtherChunkDocument) for document in results[0] + results[2])
+
+
+def test_async_get_or_create_collection_is_idempotent(aqdrant) -> None:
+    async def _run() -> None:
+        await ChunkDocument.aget_or_create_collection()
+        await ChunkDocument.aget_or_create_collection()
+
+        assert (
+            await aqdrant.get_collection(collection_name="test_chunks")
+        ).config.params.vectors.size == EMBEDDING_SIZE
+
+    asyncio.run(_run())
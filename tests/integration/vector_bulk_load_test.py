@@ -0,0 +1,44 @@
+import pytest
+
+from .documents import ChunkDocument
+
+
+def test_bulk_load_sends_the_last_batch_as_a_wait_barrier(qdrant, make_chunks, monkeypatch) -> None:
+    upsert_batch = ChunkDocument._upsert_batch
+    upserted_batches = []
+
+    def _upsert_batch(collection_name, points, wait=True, max_retries=3):
+        upserted_batches.append((len(points), wait))
+
+        return upsert_batch(collection_name, points, wait=wait, max_retries=max_retries)
+
+    monkeypatch.setattr(ChunkDocument, "_upsert_batch", _upsert_batch)
+
+    chunks = make_chunks(10)
+    loaded = ChunkDocument.bulk_insert(chunks, bulk_load=True, batch_size=3, max_workers=1)
+
+    assert loaded is True
+    assert sorted(upserted_batches[:-1]) == [(3, False), (3, False), (3, False)]
+    assert upserted_batches[-1] == (1, True)
+    # The barrier returned, so all the points are visible.
+    assert qdrant.count(collection_name="test_chunks").count == len(chunks)
+
+
+@pytest.mark.parametrize("failed_batch", [0, 3])
+def test_bulk_load_reports_failed_batches(qdrant, make_chunks, monkeypatch, failed_batch) -> None:
+    upsert_batch = ChunkDocument._upsert_batch
+    upserted_batches = []
+
+    def _upsert_batch(collection_name, points, wait=True, max_retries=3):
+        upserted_batches.append(points)
+        if len(upserted_batches) - 1 == failed_batch:
+            return False
+
+        return upsert_batch(collection_name, points, wait=wait, max_retries=max_retries)
+
+    monkeypatch.setattr(ChunkDocument, "_upsert_batch", _upsert_batch)
+
+    loaded = ChunkDocument.bulk_insert(make_chunks(10), bulk_load=True, batch_size=3, max_workers=1)
+
+    assert loaded is False
+    assert len(upserted_batches) == 4
@@ -0,0 +1,62 @@
+from qdrant_client.http.models import ScalarQuantization
+
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk, EmbeddedPostChunk, EmbeddedRepositoryChunk
+
+from .documents import ChunkDocument
+
+
+class QuantizedChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_quantized_chunks"
+        hnsw_m = 8
+        hnsw_ef_construct = 50
+        on_disk = False
+        quantization = "scalar"
+        on_disk_payload = True
+
+
+def test_embedded_chunks_share_their_collection_settings() -> None:
+    for chunk_class in (EmbeddedPostChunk, EmbeddedArticleChunk, EmbeddedRepositoryChunk):
+        assert chunk_class.get_payload_indexes().keys() == {"author_id", "platform", "document_id"}
+        assert chunk_class.get_use_vector_index() is True
+        # Opt-in through RAG_VECTOR_QUANTIZATION and RAG_ON_DISK_PAYLOAD.
+        assert chunk_class.get_quantization_config() is None
+        assert chunk_class._get_config_attribute("on_disk_payload", None) is None
+
+    assert {chunk_class.get_collection_name() for chunk_class in (EmbeddedPostChunk, EmbeddedArticleChunk)} == {
+        "embedded_posts",
+        "embedded_articles",
+    }
+
+
+def test_collection_is_created_with_the_configured_params(qdrant, monkeypatch) -> None:
+    create_kwargs = {}
+    create_collection = qdrant.create_collection
+
+    def _create_collection(**kwargs) -> bool:
+        create_kwargs.update(kwargs)
+
+        return create_collection(**kwargs)
+
+    monkeypatch.setattr(qdrant, "create_collection", _create_collection)
+
+    QuantizedChunkDocument.get_or_create_collection()
+
+    vectors_config = create_kwargs["vectors_config"]
+    assert (vectors_config.hnsw_config.m, vectors_config.hnsw_config.ef_construct) == (8, 50)
+    assert vectors_config.on_disk is False
+    assert isinstance(create_kwargs["quantization_config"], ScalarQuantization)
+    assert create_kwargs["on_disk_payload"] is True
+    params = qdrant.get_collection(collection_name="test_quantized_chunks").config.params
+    assert params.vectors.hnsw_config.m == 8
+
+
+def test_search_with_quantization_returns_the_nearest_neighbours(qdrant, make_chunks) -> None:
+    chunks = [QuantizedChunkDocument(**chunk.model_dump()) for chunk in make_chunks(20)]
+    QuantizedChunkDocument.get_or_create_collection()
+    QuantizedChunkDocument.bulk_insert(chunks)
+
+    for chunk in chunks[:5]:
+        documents = QuantizedChunkDocument.search(chunk.embedding.tolist(), limit=3)
+
+        assert documents[0].id == chunk.id
@@ -0,0 +1,64 @@
+import pytest
+
+from llm_engineering.application.preprocessing import embedding_data_handlers
+from llm_engineering.settings import settings
+
+from .documents import ChunkDocument
+
+COLLECTION_METADATA = {"embedding_model_id": "model-a", "embedding_size": 4, "extra_embedding_model_ids": []}
+
+
+class ModelChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_model_chunks"
+
+    @classmethod
+    def build_collection_metadata(cls) -> dict:
+        return dict(COLLECTION_METADATA)
+
+
+def test_metadata_is_stored_once_in_the_sidecar_collection(qdrant, make_chunks) -> None:
+    chunks = [ModelChunkDocument(**chunk.model_dump()) for chunk in make_chunks(3)]
+    ModelChunkDocument.get_or_create_collection()
+    ModelChunkDocument.bulk_insert(chunks)
+
+    assert ModelChunkDocument.get_collection_metadata() == COLLECTION_METADATA
+    assert qdrant.count(collection_name=settings.QDRANT_METADATA_COLLECTION_NAME).count == 1
+    records, _ = qdrant.scroll(collection_name="test_model_chunks", with_payload=True)
+    assert all("embedding_model_id" not in record.payload for record in records)
+
+
+def test_metadata_is_replaced_and_deleted(qdrant) -> None:
+    ModelChunkDocument.get_or_create_collection()
+
+    assert ModelChunkDocument.save_collection_metadata(metadata={"embedding_model_id": "model-b"}) is True
+    assert ModelChunkDocument.get_collection_metadata() == {"embedding_model_id": "model-b"}
+
+    ModelChunkDocument.delete_collection_metadata("test_model_chunks")
+    assert ModelChunkDocument.get_collection_metadata() == {}
+
+
+def test_classes_without_metadata_write_no_sidecar_point(qdrant) -> None:
+    ChunkDocument.get_or_create_collection()
+
+    assert ChunkDocument.get_collection_metadata() == {}
+    assert not qdrant.collection_exists(collection_name=settings.QDRANT_METADATA_COLLECTION_NAME)
+
+
+def test_every_reindexed_version_gets_its_metadata(qdrant, make_chunks) -> None:
+    chunks = [ModelChunkDocument(**chunk.model_dump()) for chunk in make_chunks(3)]
+    ModelChunkDocument.reindex(chunks)
+    ModelChunkDocument.reindex(chunks)
+
+    assert ModelChunkDocument.get_live_collection_name() == "test_model_chunks__v2"
+    assert ModelChunkDocument.get_collection_metadata() == COLLECTION_METADATA
+    assert ModelChunkDocument.get_collection_metadata("test_model_chunks__v1") == COLLECTION_METADATA
+
+
+@pytest.mark.parametrize("per_point_metadata", [False, True])
+def test_points_only_copy_the_metadata_when_enabled(monkeypatch, per_point_metadata) -> None:
+    monkeypatch.setattr(settings, "RAG_PER_POINT_EMBEDDING_METADATA", per_point_metadata)
+
+    point_metadata = embedding_data_handlers._build_point_metadata(ModelChunkDocument)
+
+    assert point_metadata == (COLLECTION_METADATA if per_point_metadata else {})
@@ -0,0 +1,41 @@
+import pytest
+
+from .documents import ChunkDocument
+
+
+def _indexing_threshold(client) -> int | None:
+    return client.get_collection(collection_name="test_chunks").config.optimizer_config.indexing_threshold
+
+
+def test_deferred_indexing_disables_then_restores_the_indexing(mmap_client) -> None:
+    ChunkDocument.get_or_create_collection()
+    indexing_threshold = _indexing_threshold(mmap_client)
+
+    with ChunkDocument.deferred_indexing():
+        assert _indexing_threshold(mmap_client) == 0
+
+    assert _indexing_threshold(mmap_client) == indexing_threshold
+
+
+def test_deferred_indexing_restores_the_indexing_when_the_load_fails(mmap_client) -> None:
+    ChunkDocument.get_or_create_collection()
+    indexing_threshold = _indexing_threshold(mmap_client)
+
+    with pytest.raises(RuntimeError), ChunkDocument.deferred_indexing():
+        raise RuntimeError("load failed")
+
+    assert _indexing_threshold(mmap_client) == indexing_threshold
+
+
+def test_nested_deferred_indexing_keeps_the_indexing_disabled(mmap_client) -> None:
+    ChunkDocument.get_or_create_collection()
+    indexing_threshold = _indexing_threshold(mmap_client)
+
+    with ChunkDocument.deferred_indexing():
+        with ChunkDocument.deferred_indexing():
+            pass
+
+        # The inner block restores the threshold it found, 0, not the default one.
+        assert _indexing_threshold(mmap_client) == 0
+
+    assert _indexing_threshold(mmap_client) == indexing_threshold
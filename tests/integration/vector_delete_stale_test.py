@@ -0,0 +1,35 @@
+from .documents import ChunkDocument
+
+
+def _stored_ids(qdrant) -> set[str]:
+    records, _ = qdrant.scroll(collection_name="test_chunks", limit=100)
+
+    return {str(record.id) for record in records}
+
+
+def test_delete_stale_only_deletes_the_stale_points_of_the_fresh_documents(qdrant, make_chunks) -> None:
+    processed_chunks = make_chunks(3)
+    other_chunks = make_chunks(2)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(processed_chunks + other_chunks)
+
+    # The document was re-processed: its first chunk is kept, the two others were replaced by a new one.
+    fresh_chunks = [processed_chunks[0], *make_chunks(1, document_id=processed_chunks[0].document_id)]
+    ChunkDocument.bulk_insert(fresh_chunks)
+
+    assert ChunkDocument.delete_stale(fresh_chunks) is True
+    assert _stored_ids(qdrant) == {str(chunk.id) for chunk in fresh_chunks + other_chunks}
+
+
+def test_delete_stale_without_fresh_documents_deletes_nothing(qdrant, make_chunks) -> None:
+    chunks = make_chunks(3)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+
+    assert ChunkDocument.delete_stale([]) is True
+    assert _stored_ids(qdrant) == {str(chunk.id) for chunk in chunks}
+
+
+def test_delete_stale_on_a_missing_collection(qdrant, make_chunks) -> None:
+    assert ChunkDocument.delete_stale(make_chunks(2)) is True
+    assert not qdrant.collection_exists(collection_name="test_chunks")
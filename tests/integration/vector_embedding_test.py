@@ -0,0 +1,56 @@
+import uuid
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from .documents import EMBEDDING_SIZE, ChunkDocument
+
+
+@pytest.mark.parametrize(
+    "embedding",
+    [[0.1, 0.2, 0.3, 0.4], (0.1, 0.2, 0.3, 0.4), np.array([0.1, 0.2, 0.3, 0.4], dtype=np.float64)],
+)
+def test_embeddings_are_validated_as_float32_arrays(embedding) -> None:
+    chunk = ChunkDocument(content="chunk", document_id=uuid.uuid4(), embedding=embedding)
+
+    assert isinstance(chunk.embedding, np.ndarray)
+    assert chunk.embedding.dtype == np.float32
+    assert chunk.embedding.flags.c_contiguous
+    assert chunk.embedding.tolist() == pytest.approx([0.1, 0.2, 0.3, 0.4])
+
+
+def test_float32_embeddings_are_not_copied() -> None:
+    embeddings = np.ones((2, EMBEDDING_SIZE), dtype=np.float32)
+
+    chunk = ChunkDocument(content="chunk", document_id=uuid.uuid4(), embedding=embeddings[1])
+
+    assert np.shares_memory(chunk.embedding, embeddings)
+
+
+@pytest.mark.parametrize("embedding", [["a", "b"], [[0.1, 0.2], [0.3, 0.4]], [None, 0.1]])
+def test_invalid_embeddings_raise_validation_errors(embedding) -> None:
+    with pytest.raises(ValidationError, match="embedding"):
+        ChunkDocument(content="chunk", document_id=uuid.uuid4(), embedding=embedding)
+
+
+def test_embeddings_are_dumped_as_arrays_and_serialized_as_lists(make_chunks) -> None:
+    (chunk,) = make_chunks(1)
+
+    assert isinstance(chunk.model_dump()["embedding"], np.ndarray)
+    assert chunk.model_dump(mode="json")["embedding"] == pytest.approx(chunk.embedding.tolist())
+    assert ChunkDocument.model_validate_json(chunk.model_dump_json()).embedding.dtype == np.float32
+
+
+def test_embeddings_round_trip_through_qdrant(qdrant, make_chunks) -> None:
+    chunks = make_chunks(3)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+
+    documents = ChunkDocument.search(chunks[0].embedding, limit=3, with_vectors=True)
+
+    assert {document.id for document in documents} == {chunk.id for chunk in chunks}
+    for document in documents:
+        assert document.embedding.dtype == np.float32
+        assert document.embedding.shape == (EMBEDDING_SIZE,)
+    assert documents[0].embedding == pytest.approx(chunks[0].embedding, abs=1e-6)
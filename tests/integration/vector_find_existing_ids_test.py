@@ -0,0 +1,45 @@
+import uuid
+
+from llm_engineering.domain.types import DataCategory
+
+from .documents import ChunkDocument
+
+
+class SharedChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_shared_chunks"
+        shared_collection = "test_shared_collection"
+        category = DataCategory.POSTS
+
+
+class OtherSharedChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_other_shared_chunks"
+        shared_collection = "test_shared_collection"
+        category = DataCategory.ARTICLES
+
+
+def test_find_existing_ids_returns_the_stored_ids(qdrant, make_chunks) -> None:
+    chunks = make_chunks(5)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks[:3])
+
+    existing_ids = ChunkDocument.find_existing_ids([chunk.id for chunk in chunks], batch_size=2)
+
+    assert existing_ids == {chunk.id for chunk in chunks[:3]}
+    assert ChunkDocument.find_existing_ids([str(chunks[0].id)]) == {chunks[0].id}
+
+
+def test_find_existing_ids_on_a_missing_collection(qdrant) -> None:
+    assert ChunkDocument.find_existing_ids([uuid.uuid4()]) == set()
+    assert ChunkDocument.find_existing_ids([]) == set()
+
+
+def test_find_existing_ids_ignores_the_other_categories_of_a_shared_collection(qdrant, make_chunks) -> None:
+    chunks = make_chunks(2)
+    SharedChunkDocument.get_or_create_collection()
+    OtherSharedChunkDocument.bulk_insert([OtherSharedChunkDocument(**chunks[0].model_dump())])
+    SharedChunkDocument.bulk_insert([SharedChunkDocument(**chunks[1].model_dump())])
+
+    assert SharedChunkDocument.find_existing_ids([chunk.id for chunk in chunks]) == {chunks[1].id}
+    assert OtherSharedChunkDocument.find_existing_ids([chunk.id for chunk in chunks]) == {chunks[0].id}
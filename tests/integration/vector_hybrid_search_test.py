@@ -0,0 +1,79 @@
+import uuid
+
+import pytest
+from qdrant_client.http.models import Modifier
+
+from llm_engineering.domain.base.vector import VectorBaseDocument, VectorSearchRequest
+from llm_engineering.domain.exceptions import ImproperlyConfigured
+from llm_engineering.domain.types import SparseEmbedding
+
+from .documents import ChunkDocument
+
+# The last chunk is the farthest from the first one, but the only one sharing the query's terms.
+EMBEDDINGS = [[1.0, 0.0, 0.0, 0.0], [0.9, 0.1, 0.0, 0.0], [0.8, 0.2, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+SPARSE_EMBEDDINGS = [([1, 2], [0.5, 0.5]), ([2, 3], [0.5, 0.5]), ([3, 4], [0.5, 0.5]), ([7, 8], [0.7, 0.3])]
+
+
+class SparseChunkDocument(ChunkDocument):
+    sparse_embedding: SparseEmbedding | None = None
+
+    class Config:
+        name = "test_sparse_chunks"
+        sparse_vector = "bm25"
+
+
+@pytest.fixture
+def chunks(qdrant) -> list[SparseChunkDocument]:
+    chunks = [
+        SparseChunkDocument(
+            content=f"chunk {i}",
+            document_id=uuid.uuid4(),
+            embedding=embedding,
+            sparse_embedding=SparseEmbedding(indices=indices, values=values),
+        )
+        for i, (embedding, (indices, values)) in enumerate(zip(EMBEDDINGS, SPARSE_EMBEDDINGS, strict=True))
+    ]
+    SparseChunkDocument.get_or_create_collection()
+    SparseChunkDocument.bulk_insert(chunks)
+
+    return chunks
+
+
+def test_collection_stores_a_sparse_vector_with_idf(qdrant, chunks) -> None:
+    params = qdrant.get_collection(collection_name="test_sparse_chunks").config.params
+
+    assert params.sparse_vectors["bm25"].modifier == Modifier.IDF
+    (document,) = SparseChunkDocument.search(chunks[0].embedding, limit=1, with_vectors=True)
+    assert document.sparse_embedding == chunks[0].sparse_embedding
+
+
+def test_hybrid_search_fuses_the_dense_and_sparse_candidates(chunks) -> None:
+    query_sparse_vector = SparseEmbedding(indices=[7], values=[1.0])
+
+    dense_documents = SparseChunkDocument.search(chunks[0].embedding, limit=2)
+    hybrid_documents = SparseChunkDocument.search(chunks[0].embedding, limit=2, query_sparse_vector=query_sparse_vector)
+
+    assert [document.id for document in dense_documents] == [chunks[0].id, chunks[1].id]
+    # Both are ranked first by one retriever, so Reciprocal Rank Fusion ties them ahead of the others.
+    assert {document.id for document in hybrid_documents} == {chunks[0].id, chunks[3].id}
+
+
+def test_search_batch_runs_the_sparse_requests_in_hybrid_mode(chunks) -> None:
+    requests = [
+        VectorSearchRequest(SparseChunkDocument, chunks[0].embedding, limit=2),
+        VectorSearchRequest(
+            SparseChunkDocument, chunks[0].embedding, limit=2, query_sparse_vector=chunks[3].sparse_embedding
+        ),
+    ]
+
+    dense_documents, hybrid_documents = VectorBaseDocument.search_batch(requests)
+
+    assert chunks[3].id not in {document.id for document in dense_documents}
+    assert chunks[3].id in {document.id for document in hybrid_documents}
+
+
+def test_hybrid_search_requires_a_sparse_vector(qdrant, make_chunks) -> None:
+    query_sparse_vector = SparseEmbedding(indices=[1], values=[1.0])
+
+    with pytest.raises(ImproperlyConfigured, match="sparse vector"):
+        ChunkDocument.search(make_chunks(1)[0].embedding, query_sparse_vector=query_sparse_vector)
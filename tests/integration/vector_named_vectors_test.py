@@ -0,0 +1,76 @@
+import uuid
+from typing import ClassVar
+
+import numpy as np
+import pytest
+from pydantic import UUID4, Field
+from qdrant_client.http.models import VectorParams
+
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.exceptions import ImproperlyConfigured
+from llm_engineering.domain.types import Embedding
+
+EMBEDDING_SIZES = {"model-a": 4, "model-b": 3}
+
+
+class MultiModelChunkDocument(VectorBaseDocument):
+    content: str
+    document_id: UUID4
+    embedding: Embedding | None = None
+    extra_embeddings: dict[str, Embedding] = Field(default_factory=dict)
+
+    class Config:
+        name = "test_multi_model_chunks"
+        embedding_models: ClassVar[list[str]] = list(EMBEDDING_SIZES)
+
+    @classmethod
+    def get_vector_params(cls) -> dict[str, VectorParams]:
+        return {
+            model_id: cls._get_vector_params(embedding_size=embedding_size)
+            for model_id, embedding_size in EMBEDDING_SIZES.items()
+        }
+
+
+@pytest.fixture
+def chunks(qdrant) -> list[MultiModelChunkDocument]:
+    rng = np.random.default_rng(seed=0)
+    chunks = [
+        MultiModelChunkDocument(
+            content=f"chunk {i}",
+            document_id=uuid.uuid4(),
+            embedding=rng.random(EMBEDDING_SIZES["model-a"], dtype=np.float32),
+            extra_embeddings={"model-b": rng.random(EMBEDDING_SIZES["model-b"], dtype=np.float32)},
+        )
+        for i in range(8)
+    ]
+    MultiModelChunkDocument.get_or_create_collection()
+    MultiModelChunkDocument.bulk_insert(chunks)
+
+    return chunks
+
+
+def test_each_model_gets_a_named_vector(qdrant, chunks) -> None:
+    vectors = qdrant.get_collection(collection_name="test_multi_model_chunks").config.params.vectors
+
+    assert {name: params.size for name, params in vectors.items()} == EMBEDDING_SIZES
+    assert chunks[0].to_point().vector.keys() == {"model-a", "model-b"}
+
+
+def test_search_uses_the_vector_of_the_requested_model(chunks) -> None:
+    for chunk in chunks:
+        assert MultiModelChunkDocument.search(chunk.embedding, limit=1)[0].id == chunk.id
+        documents = MultiModelChunkDocument.search(chunk.extra_embeddings["model-b"], limit=1, using="model-b")
+        assert documents[0].id == chunk.id
+
+
+def test_records_fill_the_embeddings_of_every_model(chunks) -> None:
+    (document,) = MultiModelChunkDocument.search(chunks[0].embedding, limit=1, with_vectors=True)
+
+    assert document.embedding.shape == (EMBEDDING_SIZES["model-a"],)
+    assert document.extra_embeddings.keys() == {"model-b"}
+    assert document.extra_embeddings["model-b"].shape == (EMBEDDING_SIZES["model-b"],)
+
+
+def test_search_rejects_a_model_without_vectors(chunks) -> None:
+    with pytest.raises(ImproperlyConfigured, match="model-c"):
+        MultiModelChunkDocument.search(chunks[0].embedding, using="model-c")
@@ -0,0 +1,55 @@
+from typing import ClassVar
+
+from qdrant_client.http.models import FieldCondition, Filter, MatchValue, PayloadSchemaType
+
+from .documents import ChunkDocument
+
+
+class IndexedChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_indexed_chunks"
+        payload_indexes: ClassVar[dict[str, str]] = {"document_id": "keyword", "content": "text"}
+
+
+def _payload_schema(client) -> dict:
+    payload_schema = client.get_collection(collection_name="test_indexed_chunks").payload_schema
+
+    return {field_name: index_info.data_type for field_name, index_info in payload_schema.items()}
+
+
+def test_collection_is_created_with_its_payload_indexes(mmap_client) -> None:
+    IndexedChunkDocument.get_or_create_collection()
+
+    assert _payload_schema(mmap_client) == {
+        "document_id": PayloadSchemaType.KEYWORD,
+        "content": PayloadSchemaType.TEXT,
+    }
+
+
+def test_missing_payload_indexes_are_added_to_an_existing_collection(mmap_client) -> None:
+    mmap_client.create_collection(
+        collection_name="test_indexed_chunks", vectors_config=IndexedChunkDocument.get_vector_params()
+    )
+    mmap_client.create_payload_index(
+        collection_name="test_indexed_chunks", field_name="document_id", field_schema=PayloadSchemaType.KEYWORD
+    )
+
+    IndexedChunkDocument.get_or_create_collection()
+
+    assert _payload_schema(mmap_client).keys() == {"document_id", "content"}
+    assert IndexedChunkDocument.create_payload_indexes() == []
+
+
+def test_search_filters_on_an_indexed_field(mmap_client, make_chunks) -> None:
+    chunks = [IndexedChunkDocument(**chunk.model_dump()) for chunk in make_chunks(4) + make_chunks(4)]
+    IndexedChunkDocument.get_or_create_collection()
+    IndexedChunkDocument.bulk_insert(chunks)
+    document_id = str(chunks[-1].document_id)
+
+    documents = IndexedChunkDocument.search(
+        chunks[0].embedding,
+        limit=8,
+        query_filter=Filter(must=[FieldCondition(key="document_id", match=MatchValue(value=document_id))]),
+    )
+
+    assert {document.id for document in documents} == {chunk.id for chunk in chunks[4:]}
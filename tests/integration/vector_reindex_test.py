@@ -0,0 +1,57 @@
+import pytest
+
+from .documents import ChunkDocument
+
+
+def _live_ids() -> set:
+    return {document.id for document in ChunkDocument.scroll_iter(batch_size=100)}
+
+
+def test_reindex_swaps_the_alias_to_the_new_version(qdrant, make_chunks) -> None:
+    # A collection created before the versioning, replaced by the alias on the first reindex.
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(make_chunks(3))
+
+    chunks = make_chunks(4)
+    collection_name = ChunkDocument.reindex(chunks, max_workers=1)
+
+    assert collection_name == "test_chunks__v1"
+    assert ChunkDocument.get_live_collection_name() == "test_chunks__v1"
+    assert _live_ids() == {chunk.id for chunk in chunks}
+
+
+def test_reindex_keeps_the_previous_versions_for_rollbacks(qdrant, make_chunks) -> None:
+    for _ in range(3):
+        chunks = make_chunks(2)
+        ChunkDocument.reindex(chunks, keep_versions=1, max_workers=1)
+
+    assert ChunkDocument.get_live_collection_name() == "test_chunks__v3"
+    # The oldest version is deleted, the one before the live version is kept.
+    assert ChunkDocument.get_collection_versions() == ["test_chunks__v2", "test_chunks__v3"]
+    assert _live_ids() == {chunk.id for chunk in chunks}
+
+
+def test_reindex_leaves_the_alias_unchanged_when_the_load_fails(qdrant, make_chunks, monkeypatch) -> None:
+    chunks = make_chunks(2)
+    ChunkDocument.reindex(chunks, max_workers=1)
+
+    monkeypatch.setattr(ChunkDocument, "_bulk_load", lambda documents, **kwargs: False)
+    with pytest.raises(RuntimeError):
+        ChunkDocument.reindex(make_chunks(2), max_workers=1)
+
+    assert ChunkDocument.get_live_collection_name() == "test_chunks__v1"
+    assert ChunkDocument.get_collection_versions() == ["test_chunks__v1"]
+    assert _live_ids() == {chunk.id for chunk in chunks}
+
+
+def test_reindex_leaves_the_alias_unchanged_when_the_indexing_times_out(qdrant, make_chunks, monkeypatch) -> None:
+    chunks = make_chunks(2)
+    ChunkDocument.reindex(chunks, max_workers=1)
+
+    monkeypatch.setattr(ChunkDocument, "wait_for_indexing", lambda collection_name, timeout: False)
+    with pytest.raises(RuntimeError, match="not indexed"):
+        ChunkDocument.reindex(make_chunks(2), max_workers=1)
+
+    assert ChunkDocument.get_live_collection_name() == "test_chunks__v1"
+    assert ChunkDocument.get_collection_versions() == ["test_chunks__v1"]
+    assert _live_ids() == {chunk.id for chunk in chunks}
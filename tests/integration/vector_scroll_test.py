@@ -0,0 +1,56 @@
+import pytest
+
+from .documents import ChunkDocument
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_scroll_iter_returns_every_document(qdrant, make_chunks, prefetch) -> None:
+    chunks = make_chunks(7)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+
+    documents = list(ChunkDocument.scroll_iter(batch_size=3, prefetch=prefetch, with_vectors=True))
+
+    assert {document.id for document in documents} == {chunk.id for chunk in chunks}
+    assert all(document.embedding is not None for document in documents)
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_scroll_iter_projects_the_fields_as_tuples(qdrant, make_chunks, prefetch) -> None:
+    chunks = make_chunks(7)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+
+    tuples = list(ChunkDocument.scroll_iter(batch_size=3, prefetch=prefetch, projection=["content"], as_tuples=True))
+
+    assert sorted(tuples) == sorted((chunk.id, chunk.content) for chunk in chunks)
+
+
+def test_scroll_iter_projects_the_fields_as_partial_documents(qdrant, make_chunks) -> None:
+    chunks = make_chunks(7)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+
+    documents = list(ChunkDocument.scroll_iter(batch_size=3, projection=["content"]))
+
+    assert {(document.id, document.content) for document in documents} == {
+        (chunk.id, chunk.content) for chunk in chunks
+    }
+    # Only the projected payload keys are fetched.
+    assert all("document_id" not in document.model_fields_set for document in documents)
+    assert all("embedding" not in document.model_fields_set for document in documents)
+
+
+def test_scroll_iter_projects_the_embeddings(qdrant, make_chunks) -> None:
+    chunks = make_chunks(7)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+
+    tuples = list(ChunkDocument.scroll_iter(batch_size=3, projection=["embedding"], as_tuples=True, with_vectors=True))
+
+    embeddings = {point_id: embedding for point_id, embedding in tuples}
+    assert embeddings.keys() == {chunk.id for chunk in chunks}
+    for chunk in chunks:
+        # Qdrant stores the cosine vectors normalized.
+        expected_embedding = chunk.embedding / (chunk.embedding**2).sum() ** 0.5
+        assert embeddings[chunk.id] == pytest.approx(expected_embedding.tolist(), abs=1e-6)
@@ -0,0 +1,68 @@
+import pytest
+from qdrant_client.http.models import FieldCondition, Filter, MatchValue
+
+from llm_engineering.domain.base.vector import VectorBaseDocument, VectorSearchRequest
+
+from .documents import ChunkDocument
+
+
+class OtherChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_other_chunks"
+
+
+@pytest.fixture
+def collections(make_chunks) -> tuple[list[ChunkDocument], list[OtherChunkDocument]]:
+    chunks = make_chunks(6)
+    other_chunks = [OtherChunkDocument(**chunk.model_dump()) for chunk in make_chunks(6)]
+    for document_class, documents in ((ChunkDocument, chunks), (OtherChunkDocument, other_chunks)):
+        document_class.get_or_create_collection()
+        document_class.bulk_insert(documents)
+
+    return chunks, other_chunks
+
+
+def test_search_batch_returns_the_results_of_each_request_in_order(qdrant, collections) -> None:
+    chunks, other_chunks = collections
+    document_filter = Filter(
+        must=[FieldCondition(key="document_id", match=MatchValue(value=str(chunks[0].document_id)))]
+    )
+    requests = [
+        VectorSearchRequest(ChunkDocument, chunks[0].embedding, limit=2),
+        (OtherChunkDocument, other_chunks[1].embedding, None, 3),
+        VectorSearchRequest(ChunkDocument, other_chunks[2].embedding, query_filter=document_filter, limit=4),
+    ]
+
+    # Qdrant local mode isn't thread-safe, so the collections are searched one after the other.
+    results = VectorBaseDocument.search_batch(requests, max_workers=1)
+
+    assert [len(documents) for documents in results] == [2, 3, 4]
+    assert results[0][0].id == chunks[0].id
+    assert results[1][0].id == other_chunks[1].id
+    assert all(isinstance(document, OtherChunkDocument) for document in results[1])
+    assert {document.document_id for document in results[2]} == {chunks[0].document_id}
+    for request, documents in zip(requests, results, strict=True):
+        request = VectorSearchRequest(*request)
+        expected_documents = request.document_class.search(
+            request.query_vector, limit=request.limit, query_filter=request.query_filter
+        )
+        assert [document.id for document in documents] == [document.id for document in expected_documents]
+
+
+def test_search_batch_queries_the_collections_concurrently(mmap_client, collections) -> None:
+    chunks, other_chunks = collections
+    requests = [
+        (document_class, chunk.embedding, None, 1)
+        for chunk in chunks
+        for document_class in (ChunkDocument, OtherChunkDocument)
+    ]
+
+    results = VectorBaseDocument.search_batch(requests)
+
+    assert [len(documents) for documents in results] == [1] * len(requests)
+    assert [documents[0].id for documents in results[::2]] == [chunk.id for chunk in chunks]
+    assert all(isinstance(documents[0], OtherChunkDocument) for documents in results[1::2])
+
+
+def test_search_batch_without_requests(qdrant) -> None:
+    assert VectorBaseDocument.search_batch([]) == []
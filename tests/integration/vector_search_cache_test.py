@@ -0,0 +1,143 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.infrastructure.db import search_cache as search_cache_module
+from llm_engineering.infrastructure.db.search_cache import (
+    InMemorySearchCacheBackend,
+    RedisSearchCacheBackend,
+    SearchCache,
+)
+
+from .documents import ChunkDocument
+
+
+@pytest.fixture
+def search_cache(qdrant) -> SearchCache:
+    search_cache = SearchCache(InMemorySearchCacheBackend())
+    VectorBaseDocument.set_search_cache(search_cache)
+
+    return search_cache
+
+
+def _search_ids(query_vector: list[float], **kwargs) -> list:
+    return [document.id for document in ChunkDocument.search(query_vector, limit=3, **kwargs)]
+
+
+def test_search_serves_the_repeated_queries_from_the_cache(search_cache, make_chunks) -> None:
+    chunks = make_chunks(5)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+    query_vector = chunks[0].embedding.tolist()
+
+    first_ids = _search_ids(query_vector)
+    second_ids = _search_ids(query_vector)
+
+    assert first_ids == second_ids
+    assert ChunkDocument.get_search_cache_stats() == (1, 1)
+
+
+def test_search_cache_is_invalidated_by_an_insert(search_cache, make_chunks) -> None:
+    chunks = make_chunks(5)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+    query_vector = chunks[0].embedding.tolist()
+    _search_ids(query_vector)
+
+    new_chunk = make_chunks(1)[0]
+    new_chunk.embedding = chunks[0].embedding * 2
+    ChunkDocument.bulk_insert([new_chunk])
+
+    assert new_chunk.id in _search_ids(query_vector)
+    assert ChunkDocument.get_search_cache_stats() == (0, 2)
+
+
+def test_search_cache_is_invalidated_by_delete_stale(search_cache, make_chunks) -> None:
+    chunks = make_chunks(5)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+    query_vector = chunks[0].embedding.tolist()
+    assert chunks[0].id in _search_ids(query_vector)
+
+    ChunkDocument.delete_stale(chunks[1:])
+
+    assert chunks[0].id not in _search_ids(query_vector)
+    assert ChunkDocument.get_search_cache_stats() == (0, 2)
+
+
+def test_search_cache_can_be_bypassed(search_cache, make_chunks) -> None:
+    chunks = make_chunks(5)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+    query_vector = chunks[0].embedding.tolist()
+
+    _search_ids(query_vector, use_cache=False)
+    _search_ids(query_vector, use_cache=False)
+
+    assert ChunkDocument.get_search_cache_stats() == (0, 0)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.values = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.values[key] = value.encode()
+
+    def incr(self, key: str) -> int:
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
+
+        return int(self.values[key])
+
+
+@pytest.fixture
+def redis_search_cache(qdrant, monkeypatch) -> SearchCache:
+    redis_client = FakeRedis()
+    monkeypatch.setattr(
+        search_cache_module, "redis", SimpleNamespace(Redis=SimpleNamespace(from_url=lambda url: redis_client))
+    )
+    search_cache = SearchCache(RedisSearchCacheBackend(url="redis://localhost:6379/0"))
+    VectorBaseDocument.set_search_cache(search_cache)
+
+    return search_cache
+
+
+@pytest.mark.parametrize(
+    "search_kwargs",
+    [{"with_vectors": True}, {"projection": ["content"]}, {"projection": ["content"], "as_tuples": True}],
+)
+def test_redis_search_cache_serves_the_same_results(redis_search_cache, make_chunks, search_kwargs) -> None:
+    chunks = make_chunks(5)
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert(chunks)
+    query_vector = chunks[0].embedding.tolist()
+
+    results = ChunkDocument.search(query_vector, limit=3, **search_kwargs)
+    cached_results = ChunkDocument.search(query_vector, limit=3, **search_kwargs)
+
+    assert ChunkDocument.get_search_cache_stats() == (1, 1)
+    assert len(cached_results) == len(results)
+    for result, cached_result in zip(results, cached_results, strict=True):
+        if isinstance(result, tuple):
+            assert cached_result == result
+            continue
+
+        assert type(cached_result) is ChunkDocument
+        assert cached_result.model_fields_set == result.model_fields_set
+        assert cached_result.__dict__.keys() == result.__dict__.keys()
+        assert (cached_result.id, cached_result.content) == (result.id, result.content)
+        if "embedding" in result.__dict__:
+            assert cached_result.embedding.dtype == np.float32
+            np.testing.assert_array_equal(cached_result.embedding, result.embedding)
+
+
+def test_redis_search_cache_does_not_import_the_cached_classes() -> None:
+    value = {"__model__": "os:system", "fields": {}, "fields_set": []}
+
+    with pytest.raises(ValueError, match="Can't rebuild"):
+        search_cache_module._from_json_value(value)
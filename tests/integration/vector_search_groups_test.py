@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from llm_engineering.domain.base.vector import VectorBaseDocument, VectorSearchRequest
+
+from .documents import EMBEDDING_SIZE, ChunkDocument
+
+
+@pytest.fixture
+def documents_chunks(qdrant, make_chunks) -> list[list[ChunkDocument]]:
+    documents_chunks = [make_chunks(4) for _ in range(3)]
+    ChunkDocument.get_or_create_collection()
+    ChunkDocument.bulk_insert([chunk for chunks in documents_chunks for chunk in chunks])
+
+    return documents_chunks
+
+
+def test_search_groups_returns_the_best_chunks_of_each_document(documents_chunks) -> None:
+    query_vector = documents_chunks[1][0].embedding
+
+    groups = ChunkDocument.search_groups(query_vector, limit=3, group_size=2)
+
+    assert len(groups) == 3
+    assert groups[0][0].id == documents_chunks[1][0].id
+    assert all(len(group) == 2 for group in groups)
+    assert [{chunk.document_id for chunk in group} for group in groups] == [{group[0].document_id} for group in groups]
+    assert len({group[0].document_id for group in groups}) == 3
+
+
+def test_search_groups_are_limited_to_the_number_of_documents(documents_chunks) -> None:
+    groups = ChunkDocument.search_groups(documents_chunks[0][0].embedding, limit=2)
+
+    assert [len(group) for group in groups] == [1, 1]
+    assert groups[0][0].id == documents_chunks[0][0].id
+
+
+def test_search_groups_batch_returns_the_groups_of_each_request_in_order(documents_chunks) -> None:
+    requests = [VectorSearchRequest(ChunkDocument, chunks[-1].embedding, limit=3) for chunks in documents_chunks]
+
+    results = VectorBaseDocument.search_groups_batch(requests, group_size=4, max_workers=1)
+
+    for chunks, groups in zip(documents_chunks, results, strict=True):
+        assert groups[0][0].id == chunks[-1].id
+        assert {chunk.id for chunk in groups[0]} == {chunk.id for chunk in chunks}
+
+
+def test_search_groups_on_a_missing_collection(mmap_client) -> None:
+    assert ChunkDocument.search_groups(np.ones(EMBEDDING_SIZE, dtype=np.float32)) == []
@@ -0,0 +1,79 @@
+import pytest
+from qdrant_client.http.models import FieldCondition, Filter, MatchValue, PayloadSchemaType
+
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.types import DataCategory
+
+from .documents import ChunkDocument
+
+
+class PostChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_post_chunks"
+        shared_collection = "test_unified_chunks"
+        category = DataCategory.POSTS
+
+
+class ArticleChunkDocument(ChunkDocument):
+    class Config:
+        name = "test_article_chunks"
+        shared_collection = "test_unified_chunks"
+        category = DataCategory.ARTICLES
+
+
+@pytest.fixture
+def shared_chunks(qdrant, make_chunks) -> tuple[list[PostChunkDocument], list[ArticleChunkDocument]]:
+    post_chunks = [PostChunkDocument(**chunk.model_dump()) for chunk in make_chunks(5)]
+    article_chunks = [ArticleChunkDocument(**chunk.model_dump()) for chunk in make_chunks(5)]
+    PostChunkDocument.get_or_create_collection()
+    PostChunkDocument.bulk_insert(post_chunks)
+    ArticleChunkDocument.bulk_insert(article_chunks)
+
+    return post_chunks, article_chunks
+
+
+def test_the_categories_share_one_collection(qdrant, shared_chunks) -> None:
+    post_chunks, _ = shared_chunks
+
+    assert (
+        PostChunkDocument.get_collection_name() == ArticleChunkDocument.get_collection_name() == "test_unified_chunks"
+    )
+    assert qdrant.count(collection_name="test_unified_chunks").count == 10
+    assert post_chunks[0].to_point().payload["category"] == "posts"
+    assert PostChunkDocument.get_payload_indexes() == {"category": PayloadSchemaType.KEYWORD}
+
+
+def test_reads_are_filtered_by_category(shared_chunks) -> None:
+    post_chunks, article_chunks = shared_chunks
+
+    documents = ArticleChunkDocument.search(post_chunks[0].embedding, limit=10)
+    assert {document.id for document in documents} == {chunk.id for chunk in article_chunks}
+    assert all(type(document) is ArticleChunkDocument for document in documents)
+
+    documents, _ = PostChunkDocument.bulk_find(limit=10)
+    assert {document.id for document in documents} == {chunk.id for chunk in post_chunks}
+    assert {document.id for document in PostChunkDocument.scroll_iter(batch_size=2)} == {
+        chunk.id for chunk in post_chunks
+    }
+
+
+def test_the_category_filter_is_combined_with_the_query_filter(shared_chunks) -> None:
+    post_chunks, _ = shared_chunks
+    query_filter = Filter(
+        must=[FieldCondition(key="document_id", match=MatchValue(value=str(post_chunks[0].document_id)))]
+    )
+
+    assert ArticleChunkDocument.search(post_chunks[0].embedding, query_filter=query_filter) == []
+    assert len(PostChunkDocument.search(post_chunks[0].embedding, query_filter=query_filter)) == 5
+
+
+def test_search_with_quotas_returns_each_category_up_to_its_quota(shared_chunks) -> None:
+    post_chunks, _ = shared_chunks
+
+    (documents,) = VectorBaseDocument.search_with_quotas(
+        [({PostChunkDocument: 2, ArticleChunkDocument: 3}, post_chunks[0].embedding)]
+    )
+
+    assert [type(document) for document in documents].count(PostChunkDocument) == 2
+    assert [type(document) for document in documents].count(ArticleChunkDocument) == 3
+    assert post_chunks[0].id in {document.id for document in documents}
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from tools import vector_store
+
+from .documents import ChunkDocument
+
+
+@pytest.fixture(autouse=True)
+def tool_connection(mmap_client, monkeypatch) -> None:
+    monkeypatch.setattr(vector_store, "connection", mmap_client)
+
+
+def _stored_points(client) -> dict:
+    records, _ = client.scroll(collection_name="test_chunks", limit=100, with_vectors=True)
+
+    return {str(record.id): (record.payload, record.vector) for record in records}
+
+
+def test_export_and_import_round_trip_the_points(mmap_client, make_chunks, tmp_path) -> None:
+    ChunkDocument.get_or_create_collection()
+    points = [chunk.to_point() for chunk in make_chunks(7)]
+    # A payload field holding a different type from point to point.
+    for point, value in zip(points, [{"key": "value"}, ["a", "b"], "[1, 2]", 3, None, "text", {"n": [1]}], strict=True):
+        point.payload["extra"] = value
+    mmap_client.upsert(collection_name="test_chunks", points=points)
+    exported_points = _stored_points(mmap_client)
+
+    export_dir = tmp_path / "export"
+    vector_store.__export_collection(export_dir, ChunkDocument, num_partitions=3, batch_size=2)
+    mmap_client.delete_collection(collection_name="test_chunks")
+    manifest = json.loads((export_dir / "manifest.json").read_text())
+    vector_store.__import_collection(export_dir, manifest, ChunkDocument, batch_size=2)
+
+    imported_points = _stored_points(mmap_client)
+    assert manifest["num_points"] == len(points)
+    assert imported_points.keys() == exported_points.keys()
+    for point_id, (payload, point_vector) in imported_points.items():
+        assert payload == exported_points[point_id][0]
+        assert point_vector == pytest.approx(exported_points[point_id][1], abs=1e-6)
+
+
+def test_reindex_streams_the_documents_into_the_new_version(mmap_client, make_chunks) -> None:
+    chunks = make_chunks(10)
+    consumed = []
+
+    def _documents():
+        for chunk in chunks:
+            consumed.append(chunk.id)
+            yield chunk
+
+    collection_name = ChunkDocument.reindex(_documents(), documents_per_load=3)
+
+    assert collection_name == "test_chunks__v1"
+    assert consumed == [chunk.id for chunk in chunks]
+    assert set(_stored_points(mmap_client)) == {str(chunk.id) for chunk in chunks}
+
+
+def test_reindex_drops_the_new_version_when_the_documents_fail(mmap_client, make_chunks) -> None:
+    chunks = make_chunks(5)
+    ChunkDocument.reindex(chunks)
+
+    def _documents():
+        yield from make_chunks(3)
+
+        raise RuntimeError("embedding failed")
+
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        ChunkDocument.reindex(_documents(), documents_per_load=2)
+
+    assert ChunkDocument.get_collection_versions() == ["test_chunks__v1"]
+    assert set(_stored_points(mmap_client)) == {str(chunk.id) for chunk in chunks}
+
+
+def test_reindex_collections_counts_the_streamed_documents(mmap_client, make_chunks) -> None:
+    chunks = make_chunks(4)
+
+    vector_store.__reindex_collections({ChunkDocument: iter(chunks)}, keep_versions=1)
+
+    assert ChunkDocument.get_live_collection_name() == "test_chunks__v1"
+    assert set(_stored_points(mmap_client)) == {str(chunk.id) for chunk in chunks}
@@ -0,0 +1,58 @@
+import json
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from llm_engineering.domain.base import nosql
+from llm_engineering.domain.documents import ArticleDocument
+from tools import data_warehouse
+
+from .fakes import FakeCollection, FakeCursor
+
+
+@pytest.fixture
+def articles() -> list[dict]:
+    return [
+        {
+            "_id": str(uuid.uuid4()),
+            "content": {"Title": f"title {i}"},
+            "platform": "medium",
+            "author_id": str(uuid.uuid4()),
+            "author_full_name": "first last",
+            "link": f"https://medium.com/article-{i}",
+        }
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def set_articles(monkeypatch):
+    def _set_articles(articles: list[dict]) -> None:
+        collection = FakeCollection(FakeCursor([dict(article) for article in articles]))
+        monkeypatch.setattr(nosql, "_database", {ArticleDocument.get_collection_name(): collection})
+
+    return _set_articles
+
+
+def test_export_writes_the_documents_as_a_json_array(tmp_path, articles, set_articles) -> None:
+    set_articles(articles)
+
+    data_warehouse.__export_data_category(tmp_path, ArticleDocument)
+
+    assert json.loads((tmp_path / "ArticleDocument.json").read_text()) == articles
+    assert [path.name for path in tmp_path.iterdir()] == ["ArticleDocument.json"]
+
+
+def test_a_failed_export_keeps_the_previous_export(tmp_path, articles, set_articles) -> None:
+    set_articles(articles)
+    data_warehouse.__export_data_category(tmp_path, ArticleDocument)
+
+    # A legacy document, missing a required field.
+    del articles[1]["link"]
+    set_articles(articles)
+    with pytest.raises(ValidationError):
+        data_warehouse.__export_data_category(tmp_path, ArticleDocument)
+
+    assert len(json.loads((tmp_path / "ArticleDocument.json").read_text())) == 3
+    assert [path.name for path in tmp_path.iterdir()] == ["ArticleDocument.json"]
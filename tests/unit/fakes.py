@@ -0,0 +1,29 @@
+from pymongo import errors
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict], fail_at: int | None = None) -> None:
+        self.documents = documents
+        self.fail_at = fail_at
+        self.closed = False
+
+    def __iter__(self):
+        for i, document in enumerate(self.documents):
+            if i == self.fail_at:
+                raise errors.OperationFailure("cursor killed")
+
+            yield document
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeCollection:
+    def __init__(self, cursor: FakeCursor) -> None:
+        self.cursor = cursor
+        self.find_kwargs = None
+
+    def find(self, filter: dict, **kwargs) -> FakeCursor:
+        self.find_kwargs = {"filter": filter, **kwargs}
+
+        return self.cursor
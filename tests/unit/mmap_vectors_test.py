@@ -0,0 +1,143 @@
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pytest
+from qdrant_client.http.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    MatchValue,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+    VectorParams,
+)
+
+from llm_engineering.infrastructure.db.mmap_vectors import MmapVectorClient
+
+COLLECTION_NAME = "chunks"
+EMBEDDING_SIZE = 4
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "vector_db"
+
+
+@pytest.fixture
+def client(path: Path):
+    client = MmapVectorClient(path)
+    client.create_collection(COLLECTION_NAME, VectorParams(size=EMBEDDING_SIZE, distance=Distance.COSINE))
+    client.create_payload_index(COLLECTION_NAME, "author_id", PayloadSchemaType.KEYWORD)
+
+    yield client
+
+    client.close()
+
+
+@pytest.fixture
+def points() -> list[PointStruct]:
+    rng = np.random.default_rng(seed=0)
+
+    return [
+        PointStruct(
+            id=str(uuid.uuid4()),
+            vector=rng.random(EMBEDDING_SIZE, dtype=np.float32).tolist(),
+            payload={"author_id": f"author {i % 2}", "platform": f"platform {i % 3}", "position": i},
+        )
+        for i in range(12)
+    ]
+
+
+def _ids(points) -> set[str]:
+    return {str(point.id) for point in points}
+
+
+def _author_filter(author_id: str) -> Filter:
+    return Filter(must=[FieldCondition(key="author_id", match=MatchValue(value=author_id))])
+
+
+def test_upsert_inserts_and_replaces_the_points(client, points) -> None:
+    client.upsert(COLLECTION_NAME, points)
+    client.upsert(COLLECTION_NAME, [PointStruct(id=points[0].id, vector=points[0].vector, payload={"position": -1})])
+
+    records = client.retrieve(COLLECTION_NAME, [points[0].id, points[1].id])
+
+    assert client.count(COLLECTION_NAME).count == len(points)
+    assert [record.payload["position"] for record in records] == [-1, 1]
+
+
+@pytest.mark.parametrize("field_name", ["author_id", "platform"])
+def test_search_returns_the_nearest_points_passing_the_filter(client, points, field_name) -> None:
+    client.upsert(COLLECTION_NAME, points)
+    query_filter = Filter(must=[FieldCondition(key=field_name, match=MatchValue(value=points[1].payload[field_name]))])
+
+    scored_points = client.search(COLLECTION_NAME, query_vector=points[1].vector, query_filter=query_filter, limit=3)
+
+    assert str(scored_points[0].id) == points[1].id
+    assert scored_points[0].score == pytest.approx(1.0)
+    assert all(point.payload[field_name] == points[1].payload[field_name] for point in scored_points)
+    assert [point.score for point in scored_points] == sorted((point.score for point in scored_points), reverse=True)
+
+
+def test_scroll_pages_through_the_points_in_the_order_of_their_ids(client, points) -> None:
+    client.upsert(COLLECTION_NAME, points)
+
+    scrolled_ids, offset = [], None
+    while True:
+        records, offset = client.scroll(COLLECTION_NAME, limit=5, offset=offset)
+        scrolled_ids.extend(str(record.id) for record in records)
+        if offset is None:
+            break
+
+    assert scrolled_ids == sorted(_ids(points))
+
+
+def test_scroll_with_a_filter(client, points) -> None:
+    client.upsert(COLLECTION_NAME, points)
+
+    records, offset = client.scroll(COLLECTION_NAME, scroll_filter=_author_filter("author 0"), limit=100)
+
+    assert offset is None
+    assert _ids(records) == _ids(point for point in points if point.payload["author_id"] == "author 0")
+    assert client.count(COLLECTION_NAME, count_filter=_author_filter("author 0")).count == len(records)
+
+
+def test_delete_by_ids_and_by_filter(client, points) -> None:
+    client.upsert(COLLECTION_NAME, points)
+
+    client.delete(COLLECTION_NAME, PointIdsList(points=[points[0].id]))
+    client.delete(COLLECTION_NAME, FilterSelector(filter=_author_filter("author 1")))
+
+    records, _ = client.scroll(COLLECTION_NAME, limit=100)
+    scored_points = client.search(COLLECTION_NAME, query_vector=points[0].vector, limit=100)
+    expected_ids = _ids(point for point in points[1:] if point.payload["author_id"] == "author 0")
+    assert _ids(records) == expected_ids
+    assert _ids(scored_points) == expected_ids
+
+
+def test_reopen_keeps_the_points_and_the_payload_indexes(path, client, points) -> None:
+    client.upsert(COLLECTION_NAME, points[:6])
+    client.delete(COLLECTION_NAME, PointIdsList(points=[points[0].id]))
+    client.close()
+
+    reopened_client = MmapVectorClient(path)
+    try:
+        reopened_client.upsert(COLLECTION_NAME, points[6:])
+        records, _ = reopened_client.scroll(COLLECTION_NAME, scroll_filter=_author_filter("author 0"), limit=100)
+
+        assert reopened_client.count(COLLECTION_NAME).count == len(points) - 1
+        assert "author_id" in reopened_client.get_collection(COLLECTION_NAME).payload_schema
+        assert _ids(records) == _ids(point for point in points[1:] if point.payload["author_id"] == "author 0")
+    finally:
+        reopened_client.close()
+
+
+def test_a_second_client_cannot_open_the_same_folder(path, client) -> None:
+    with pytest.raises(RuntimeError, match="already opened by another client"):
+        MmapVectorClient(path)
+
+    client.close()
+    MmapVectorClient(path).close()
@@ -0,0 +1,76 @@
+import uuid
+
+import pytest
+
+from llm_engineering.domain.base import nosql
+from llm_engineering.domain.documents import UserDocument
+
+from .fakes import FakeCollection, FakeCursor
+
+
+@pytest.fixture
+def users() -> list[dict]:
+    return [{"_id": str(uuid.uuid4()), "first_name": f"first {i}", "last_name": f"last {i}"} for i in range(5)]
+
+
+@pytest.fixture
+def make_collection(monkeypatch):
+    def _make_collection(cursor: FakeCursor) -> FakeCollection:
+        collection = FakeCollection(cursor)
+        monkeypatch.setattr(nosql, "_database", {UserDocument.get_collection_name(): collection})
+
+        return collection
+
+    return _make_collection
+
+
+def test_iter_find_streams_the_documents_and_closes_the_cursor(users, make_collection) -> None:
+    cursor = FakeCursor(users)
+    collection = make_collection(cursor)
+
+    documents = list(UserDocument.iter_find({"last_name": "last 0"}, batch_size=2))
+
+    assert [document.first_name for document in documents] == [user["first_name"] for user in users]
+    assert collection.find_kwargs == {
+        "filter": {"last_name": "last 0"},
+        "projection": None,
+        "batch_size": 2,
+        "sort": None,
+    }
+    assert cursor.closed is True
+
+
+def test_iter_find_closes_the_cursor_when_the_iteration_stops_early(users, make_collection) -> None:
+    cursor = FakeCursor(users)
+    make_collection(cursor)
+
+    documents = UserDocument.iter_find()
+    next(documents)
+    assert cursor.closed is False
+
+    documents.close()
+
+    assert cursor.closed is True
+
+
+def test_iter_find_closes_the_cursor_when_the_query_fails(users, make_collection) -> None:
+    cursor = FakeCursor(users, fail_at=3)
+    make_collection(cursor)
+
+    documents = list(UserDocument.iter_find())
+
+    assert len(documents) == 3
+    assert cursor.closed is True
+
+
+def test_iter_find_projects_the_fields(users, make_collection) -> None:
+    cursor = FakeCursor([{"_id": user["_id"], "first_name": user["first_name"]} for user in users])
+    collection = make_collection(cursor)
+
+    documents = list(UserDocument.iter_find(projection=["id", "first_name"]))
+
+    assert collection.find_kwargs["projection"] == {"_id": 1, "first_name": 1}
+    assert [(str(document.id), document.first_name) for document in documents] == [
+        (user["_id"], user["first_name"]) for user in users
+    ]
+    assert all("last_name" not in document.model_fields_set for document in documents)
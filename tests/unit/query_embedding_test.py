@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from llm_engineering.application.preprocessing import embedding_data_handlers
+from llm_engineering.application.preprocessing.dispatchers import EmbeddingDispatcher
+from llm_engineering.domain.queries import Query
+from llm_engineering.settings import settings
+
+
+class FakeEmbeddingModel:
+    model_id = "fake-embedding-model"
+    embedding_size = 4
+    max_input_length = 256
+
+    def __call__(self, input_text: list[str], to_list: bool = True) -> np.ndarray:
+        return np.ones((len(input_text), self.embedding_size), dtype=np.float32)
+
+
+class FakeSparseEmbeddingModel:
+    model_id = "bm25"
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def __call__(self, input_text: list[str], is_query: bool = False) -> list[tuple[list[int], list[float]]]:
+        self.calls.append(input_text)
+
+        return [([1, 2], [0.5, 0.5]) for _ in input_text]
+
+
+@pytest.fixture
+def sparse_calls(monkeypatch) -> list:
+    sparse_embedding_model = FakeSparseEmbeddingModel()
+    monkeypatch.setattr(embedding_data_handlers, "embedding_model", FakeEmbeddingModel())
+    monkeypatch.setattr(embedding_data_handlers, "sparse_embedding_model", sparse_embedding_model)
+
+    return sparse_embedding_model.calls
+
+
+def test_queries_are_not_sparse_embedded_without_hybrid_search(sparse_calls, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "RAG_HYBRID_SEARCH", False)
+
+    embedded_query = EmbeddingDispatcher.dispatch(Query.from_str("query"))
+
+    assert sparse_calls == []
+    assert embedded_query.sparse_embedding is None
+    assert embedded_query.embedding.shape == (4,)
+
+
+def test_queries_are_sparse_embedded_with_hybrid_search(sparse_calls, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "RAG_HYBRID_SEARCH", True)
+
+    embedded_query = EmbeddingDispatcher.dispatch(Query.from_str("query"))
+
+    assert sparse_calls == [["query"]]
+    assert embedded_query.sparse_embedding.indices == [1, 2]
+    assert embedded_query.metadata["sparse_embedding_model_id"] == "bm25"
+
+
+def test_the_caller_overrides_the_sparse_embedding_setting(sparse_calls, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "RAG_HYBRID_SEARCH", True)
+
+    embedded_query = EmbeddingDispatcher.dispatch(Query.from_str("query"), with_sparse_embedding=False)
+
+    assert sparse_calls == []
+    assert embedded_query.sparse_embedding is None
@@ -0,0 +1,53 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from llm_engineering.domain.documents import ArticleDocument, PostDocument
+
+
+@pytest.fixture
+def article() -> dict:
+    return {
+        "_id": str(uuid.uuid4()),
+        "content": {"Title": "title", "Content": "content"},
+        "platform": "medium",
+        "author_id": str(uuid.uuid4()),
+        "author_full_name": "first last",
+        "link": "https://medium.com/article",
+    }
+
+
+def test_from_mongo_trusted_builds_the_same_document_as_the_validation(article) -> None:
+    trusted_document = ArticleDocument.from_mongo(dict(article), trusted=True)
+    validated_document = ArticleDocument.from_mongo(dict(article))
+
+    assert trusted_document.model_dump() == validated_document.model_dump()
+    assert isinstance(trusted_document.id, uuid.UUID)
+    assert isinstance(trusted_document.author_id, uuid.UUID)
+
+
+def test_from_mongo_trusted_fills_the_missing_fields_with_their_defaults(article) -> None:
+    del article["link"]
+
+    document = PostDocument.from_mongo(article, trusted=True)
+
+    assert document.link is None
+    assert document.image is None
+    assert "link" not in document.model_fields_set
+
+
+def test_from_mongo_trusted_validates_the_documents_missing_a_required_field(article) -> None:
+    del article["link"]
+
+    with pytest.raises(ValidationError, match="link"):
+        ArticleDocument.from_mongo(article, trusted=True)
+
+
+def test_from_mongo_partial_leaves_the_missing_fields_unset(article) -> None:
+    document = ArticleDocument.from_mongo({"_id": article["_id"], "link": article["link"]}, partial=True)
+
+    assert document.link == article["link"]
+    assert document.model_fields_set == {"id", "link"}
+    with pytest.raises(AttributeError):
+        _ = document.platform
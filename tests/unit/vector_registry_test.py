@@ -0,0 +1,95 @@
+import pytest
+
+from llm_engineering.domain.base import VectorBaseDocument
+from llm_engineering.domain.embedded_chunks import (
+    EmbeddedArticleChunk,
+    EmbeddedChunk,
+    EmbeddedPostChunk,
+    EmbeddedRepositoryChunk,
+)
+from llm_engineering.domain.exceptions import ImproperlyConfigured
+from llm_engineering.domain.queries import EmbeddedQuery
+from llm_engineering.domain.types import DataCategory, Embedding
+
+
+class RegisteredDocument(VectorBaseDocument):
+    content: str
+    embedding: Embedding | None = None
+
+    class Config:
+        name = "test_registered_documents"
+        category = DataCategory.POSTS
+
+
+class UnconfiguredDocument(RegisteredDocument):
+    pass
+
+
+class SharedPostDocument(VectorBaseDocument):
+    content: str
+
+    class Config:
+        name = "test_shared_posts"
+        shared_collection = "test_shared_documents"
+        category = DataCategory.POSTS
+
+
+class SharedArticleDocument(VectorBaseDocument):
+    content: str
+
+    class Config:
+        name = "test_shared_articles"
+        shared_collection = "test_shared_documents"
+        category = DataCategory.ARTICLES
+
+
+def test_collection_names_resolve_to_their_registered_class() -> None:
+    assert VectorBaseDocument.collection_name_to_class("test_registered_documents") is RegisteredDocument
+    assert EmbeddedChunk.collection_name_to_class("embedded_articles") is EmbeddedArticleChunk
+
+
+def test_subclasses_without_their_own_config_are_not_registered() -> None:
+    assert UnconfiguredDocument.get_collection_name() == "test_registered_documents"
+    assert VectorBaseDocument.collection_name_to_class("test_registered_documents") is RegisteredDocument
+
+
+def test_collection_name_to_class_only_returns_subclasses_of_the_caller() -> None:
+    with pytest.raises(ValueError, match="test_registered_documents"):
+        EmbeddedChunk.collection_name_to_class("test_registered_documents")
+    with pytest.raises(ValueError, match="unknown_collection"):
+        VectorBaseDocument.collection_name_to_class("unknown_collection")
+
+
+def test_shared_collections_resolve_by_category() -> None:
+    for category, document_class in ((DataCategory.POSTS, SharedPostDocument), ("articles", SharedArticleDocument)):
+        assert VectorBaseDocument.collection_name_to_class("test_shared_documents", category=category) is document_class
+
+
+def test_registered_classes_are_filtered_by_base_class() -> None:
+    assert set(EmbeddedChunk.get_registered_classes()) == {
+        EmbeddedPostChunk,
+        EmbeddedArticleChunk,
+        EmbeddedRepositoryChunk,
+    }
+    assert RegisteredDocument in VectorBaseDocument.get_registered_classes()
+    assert EmbeddedQuery not in VectorBaseDocument.get_registered_classes()
+
+
+def test_class_metadata_is_precomputed() -> None:
+    metadata = RegisteredDocument.get_metadata()
+
+    assert metadata.collection_name == "test_registered_documents"
+    assert metadata.category == DataCategory.POSTS
+    assert metadata.fields == ("id", "content", "embedding")
+    assert (metadata.has_embedding, metadata.has_sparse_embedding, metadata.has_extra_embeddings) == (
+        True,
+        False,
+        False,
+    )
+    assert SharedArticleDocument.get_metadata().collection_name == "test_shared_documents"
+    assert EmbeddedPostChunk.get_metadata().has_extra_embeddings is True
+
+
+def test_base_class_has_no_metadata() -> None:
+    with pytest.raises(ImproperlyConfigured, match="abstract document class"):
+        VectorBaseDocument.get_metadata()
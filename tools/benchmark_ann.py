@@ -0,0 +1,217 @@
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import Generator, NamedTuple
+
+import click
+import numpy as np
+from loguru import logger
+
+from llm_engineering.application.networks import EmbeddingModelSingleton
+from llm_engineering.domain import embedded_chunks  # noqa: F401 (registers the ODM classes)
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.embedded_chunks import EmbeddedChunk
+from llm_engineering.infrastructure.db.qdrant import connection
+
+
+class SearchSettings(NamedTuple):
+    hnsw_ef: int | None = None
+    exact: bool = False
+    oversampling: float | None = None
+    rescore: bool | None = None
+
+
+@click.command()
+@click.option(
+    "--collection",
+    "collection_names",
+    multiple=True,
+    help="The embedded collections to benchmark. Defaults to all of them.",
+)
+@click.option(
+    "--num-queries",
+    default=100,
+    type=int,
+    help="Number of query vectors sampled from each collection.",
+)
+@click.option(
+    "--queries-file",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="An instruct dataset exported to JSON (e.g., output/instruct_datasets.json), whose embedded instructions "
+    "are used as queries instead of the stored vectors.",
+)
+@click.option("--k", default=10, type=int, help="Number of retrieved neighbors, the k of recall@k.")
+@click.option(
+    "--hnsw-ef",
+    "hnsw_efs",
+    multiple=True,
+    type=int,
+    default=[16, 32, 64, 128, 256],
+    help="The hnsw_ef values to sweep.",
+)
+@click.option(
+    "--oversampling",
+    "oversamplings",
+    multiple=True,
+    type=float,
+    default=[1.0, 2.0],
+    help="The quantization oversampling values to sweep, on the quantized collections.",
+)
+@click.option("--seed", default=42, type=int, help="Seed of the query sampling.")
+def main(
+    collection_names: tuple[str, ...],
+    num_queries: int,
+    queries_file: Path | None,
+    k: int,
+    hnsw_efs: tuple[int, ...],
+    oversamplings: tuple[float, ...],
+    seed: int,
+) -> None:
+    """
+    Measure the recall@k and latency of the approximate searches of the embedded collections, for a sweep of
+    hnsw_ef and quantization settings, against the exact top-k computed with NumPy.
+
+    Set QDRANT_LOCAL_PATH to run it against Qdrant local mode, whose searches are always exact.
+    """
+
+    document_classes = [
+        document_class
+        for document_class in EmbeddedChunk.get_registered_classes()
+        if not collection_names or document_class.get_collection_name() in collection_names
+    ]
+    assert len(document_classes) > 0, "No embedded collection matches the given names."
+
+    rng = np.random.default_rng(seed=seed)
+    query_vectors = __embed_queries(queries_file) if queries_file is not None else None
+
+    for document_class in document_classes:
+        if not connection.collection_exists(collection_name=document_class.get_collection_name()):
+            logger.warning(f"Skipping '{document_class.get_collection_name()}': it does not exist.")
+
+            continue
+
+        ids, vectors = __load_vectors(document_class)
+        if len(ids) == 0:
+            logger.warning(f"Skipping '{document_class.get_collection_name()}': it is empty.")
+
+            continue
+
+        if query_vectors is not None:
+            class_query_vectors = query_vectors
+        else:
+            sample = rng.choice(len(ids), size=min(num_queries, len(ids)), replace=False)
+            class_query_vectors = vectors[sample]
+
+        ground_truth = __exact_top_k(ids, vectors, class_query_vectors, k=k)
+
+        quantization_settings = [(None, None)]
+        if document_class.get_quantization_config() is not None:
+            quantization_settings = list(itertools.product(oversamplings, [False, True]))
+
+        sweep = [SearchSettings(exact=True)] + [
+            SearchSettings(hnsw_ef=hnsw_ef, oversampling=oversampling, rescore=rescore)
+            for hnsw_ef, (oversampling, rescore) in itertools.product(hnsw_efs, quantization_settings)
+        ]
+
+        logger.info(
+            f"Benchmarking '{document_class.get_collection_name()}'.",
+            num_points=len(ids),
+            num_queries=len(class_query_vectors),
+            k=k,
+        )
+        for search_settings in sweep:
+            recall, latencies = __benchmark(document_class, class_query_vectors, ground_truth, k, search_settings)
+            p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+
+            logger.info(
+                f"{__format_settings(search_settings)}: recall@{k} = {recall:.4f}, "
+                f"p50 = {p50:.2f}ms, p95 = {p95:.2f}ms"
+            )
+
+
+def __load_vectors(document_class: type[VectorBaseDocument]) -> tuple[list, np.ndarray]:
+    # Only the IDs and the embeddings are fetched, without the payloads.
+    points = list(
+        document_class.scroll_iter(batch_size=1000, projection=["embedding"], as_tuples=True, with_vectors=True)
+    )
+    points = [(point_id, embedding) for point_id, embedding in points if embedding is not None]
+    if len(points) == 0:
+        return [], np.empty((0, 0), dtype=np.float32)
+
+    ids, embeddings = zip(*points, strict=True)
+
+    return list(ids), np.stack([np.asarray(embedding, dtype=np.float32) for embedding in embeddings])
+
+
+def __embed_queries(queries_file: Path) -> np.ndarray:
+    instructions = list(__find_instructions(json.loads(queries_file.read_text())))
+    assert len(instructions) > 0, f"No instructions found in '{queries_file}'."
+
+    logger.info(f"Embedding {len(instructions)} instructions from '{queries_file}'.")
+
+    return EmbeddingModelSingleton()(instructions, to_list=False)
+
+
+def __find_instructions(data: dict | list) -> Generator[str, None, None]:
+    if isinstance(data, list):
+        for item in data:
+            yield from __find_instructions(item)
+    elif isinstance(data, dict):
+        if isinstance(data.get("instruction"), str):
+            yield data["instruction"]
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                yield from __find_instructions(value)
+
+
+def __exact_top_k(ids: list, vectors: np.ndarray, query_vectors: np.ndarray, k: int) -> list[set]:
+    # The embedded collections use the cosine distance, so the exact ranking is the dot product of unit vectors.
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    query_vectors = query_vectors / np.maximum(np.linalg.norm(query_vectors, axis=1, keepdims=True), 1e-12)
+
+    scores = query_vectors @ vectors.T
+    k = min(k, len(ids))
+    top_k = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+    return [{ids[idx] for idx in row} for row in top_k]
+
+
+def __benchmark(
+    document_class: type[VectorBaseDocument],
+    query_vectors: np.ndarray,
+    ground_truth: list[set],
+    k: int,
+    search_settings: SearchSettings,
+) -> tuple[float, np.ndarray]:
+    def _search(query_vector: np.ndarray) -> list[tuple]:
+        # Only the IDs are fetched, so the latency is the one of the search itself.
+        return document_class.search(
+            query_vector.tolist(), limit=k, as_tuples=True, use_cache=False, **search_settings._asdict()
+        )
+
+    for query_vector in query_vectors[:5]:
+        _search(query_vector)
+
+    recalls, latencies = [], []
+    for query_vector, expected_ids in zip(query_vectors, ground_truth, strict=True):
+        start_time = time.perf_counter()
+        results = _search(query_vector)
+        latencies.append(time.perf_counter() - start_time)
+
+        retrieved_ids = {point_id for point_id, *_ in results}
+        recalls.append(len(retrieved_ids & expected_ids) / max(len(expected_ids), 1))
+
+    return float(np.mean(recalls)), np.asarray(latencies)
+
+
+def __format_settings(search_settings: SearchSettings) -> str:
+    if search_settings.exact:
+        return "exact"
+
+    return ", ".join(f"{name}={value}" for name, value in search_settings._asdict().items() if name != "exact")
+
+
+if __name__ == "__main__":
+    main()
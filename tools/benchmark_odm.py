@@ -0,0 +1,100 @@
+import gc
+import time
+import uuid
+from typing import Callable
+
+import click
+import numpy as np
+from loguru import logger
+from qdrant_client.models import Record
+
+from llm_engineering.domain.documents import ArticleDocument
+from llm_engineering.domain.embedded_chunks import EmbeddedArticleChunk
+
+
+@click.command()
+@click.option(
+    "--num-samples",
+    default=100_000,
+    type=int,
+    help="Number of synthetic records decoded by each benchmark.",
+)
+@click.option(
+    "--embedding-size",
+    default=384,
+    type=int,
+    help="Size of the synthetic embeddings attached to the embedded chunks.",
+)
+def main(num_samples: int, embedding_size: int) -> None:
+    """Compare the validated and trusted construction paths of the ODM classes on synthetic data."""
+
+    rng = np.random.default_rng(seed=42)
+    author_id = str(uuid.uuid4())
+
+    mongo_documents = [
+        {
+            "_id": str(uuid.uuid4()),
+            "content": {"Title": f"Article {i}", "Content": "Lorem ipsum dolor sit amet. " * 50},
+            "platform": "medium",
+            "author_id": author_id,
+            "author_full_name": "Paul Iusztin",
+            "link": f"https://medium.com/article-{i}",
+        }
+        for i in range(num_samples)
+    ]
+    embedded_records = [
+        Record(
+            id=str(uuid.uuid4()),
+            payload={
+                "content": "Lorem ipsum dolor sit amet. " * 20,
+                "platform": "medium",
+                "document_id": str(uuid.uuid4()),
+                "author_id": author_id,
+                "author_full_name": "Paul Iusztin",
+                "metadata": {"chunk_size": 500},
+                "link": f"https://medium.com/article-{i}",
+            },
+            vector=rng.random(embedding_size, dtype=np.float32).tolist(),
+        )
+        for i in range(num_samples)
+    ]
+    __compare(
+        "NoSQLBaseDocument.from_mongo",
+        validated=lambda: [ArticleDocument.from_mongo(dict(document)) for document in mongo_documents],
+        trusted=lambda: [ArticleDocument.from_mongo(dict(document), trusted=True) for document in mongo_documents],
+    )
+    __compare(
+        "VectorBaseDocument.from_record",
+        validated=lambda: [EmbeddedArticleChunk.from_record(record) for record in embedded_records],
+        trusted=lambda: [EmbeddedArticleChunk.from_record(record, trusted=True) for record in embedded_records],
+    )
+
+
+def __compare(name: str, validated: Callable[[], list], trusted: Callable[[], list]) -> None:
+    validated_time = __timeit(validated)
+    trusted_time = __timeit(trusted)
+
+    logger.info(
+        f"{name}: validated = {validated_time:.3f}s, trusted = {trusted_time:.3f}s, "
+        f"speedup = {validated_time / max(trusted_time, 1e-9):.2f}x"
+    )
+
+
+def __timeit(func: Callable[[], list], repeat: int = 5) -> float:
+    # Like `timeit`, disable the garbage collector so its passes over the large inputs don't dominate the timings.
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start_time = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start_time)
+        finally:
+            gc.enable()
+
+    return min(timings)
+
+
+if __name__ == "__main__":
+    main()
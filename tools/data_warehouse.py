@@ -52,13 +52,27 @@ def __export(data_dir: Path) -> None:
 
 
 def __export_data_category(data_dir: Path, category_class: type[NoSQLBaseDocument]) -> None:
-    data = category_class.bulk_find()
-    serialized_data = [d.to_mongo() for d in data]
     export_file = data_dir / f"{category_class.__name__}.json"
 
-    logger.info(f"Exporting {len(serialized_data)} items of {category_class.__name__} to {export_file}...")
-    with export_file.open("w") as f:
-        json.dump(serialized_data, f)
+    logger.info(f"Exporting {category_class.__name__} to {export_file}...")
+    # The documents are streamed to the JSON array one by one, as the repositories can be large. They are
+    # written to a temporary file first, so a failed export never leaves a truncated array behind.
+    temp_file = export_file.with_name(f"{export_file.name}.tmp")
+    num_items = 0
+    try:
+        with temp_file.open("w") as f:
+            f.write("[")
+            for document in category_class.iter_find():
+                if num_items > 0:
+                    f.write(", ")
+                json.dump(document.to_mongo(), f)
+                num_items += 1
+            f.write("]")
+        temp_file.replace(export_file)
+    finally:
+        temp_file.unlink(missing_ok=True)
+
+    logger.info(f"Exported {num_items} items of {category_class.__name__} to {export_file}.")
 
 
 def __import(data_dir: Path) -> None:
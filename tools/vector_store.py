@@ -0,0 +1,481 @@
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Generator, Iterator
+from uuid import UUID
+
+import click
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+from qdrant_client.http.models import (
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PointStruct,
+    Record,
+    SparseVector,
+    VectorParams,
+)
+
+from llm_engineering.application.preprocessing import ChunkingDispatcher, EmbeddingDispatcher
+from llm_engineering.domain import cleaned_documents, embedded_chunks  # noqa: F401 (registers the ODM classes)
+from llm_engineering.domain.base.vector import VectorBaseDocument
+from llm_engineering.domain.cleaned_documents import CleanedDocument
+from llm_engineering.domain.embedded_chunks import EmbeddedChunk
+from llm_engineering.infrastructure.db.qdrant import connection
+from llm_engineering.settings import settings
+
+
+@click.command()
+@click.option(
+    "--create-payload-indexes",
+    is_flag=True,
+    default=False,
+    help="Whether to backfill the payload indexes declared by the ODM classes on the existing collections.",
+)
+@click.option(
+    "--reindex",
+    is_flag=True,
+    default=False,
+    help="Whether to re-embed the cleaned documents into new versions of the embedded collections and swap them live.",
+)
+@click.option(
+    "--migrate-layout",
+    is_flag=True,
+    default=False,
+    help="Whether to copy the embedded chunks to the layout selected by QDRANT_UNIFIED_EMBEDDED_COLLECTION.",
+)
+@click.option(
+    "--export-data",
+    is_flag=True,
+    default=False,
+    help="Whether to export the points of all the collections, with their embeddings, to the data directory.",
+)
+@click.option(
+    "--import-data",
+    is_flag=True,
+    default=False,
+    help="Whether to import the points exported to the data directory, without recomputing the embeddings.",
+)
+@click.option(
+    "--data-dir",
+    default=Path("data/vector_store_export"),
+    type=Path,
+    help="Path to the directory holding the exported collections.",
+)
+@click.option(
+    "--num-partitions",
+    default=8,
+    type=int,
+    help="The number of ID ranges scrolled in parallel when exporting a collection.",
+)
+@click.option(
+    "--batch-size",
+    default=1000,
+    type=int,
+    help="The number of points scrolled or upserted per request when exporting or importing.",
+)
+@click.option(
+    "--keep-versions",
+    default=1,
+    type=int,
+    help="The number of previous versions of each embedded collection kept for rollbacks when reindexing.",
+)
+def main(
+    create_payload_indexes: bool,
+    reindex: bool,
+    migrate_layout: bool,
+    export_data: bool,
+    import_data: bool,
+    data_dir: Path,
+    num_partitions: int,
+    batch_size: int,
+    keep_versions: int,
+) -> None:
+    assert (
+        create_payload_indexes or reindex or migrate_layout or export_data or import_data
+    ), "Specify at least one operation."
+
+    if create_payload_indexes:
+        __create_payload_indexes()
+
+    if reindex:
+        __reindex(keep_versions=keep_versions)
+
+    if migrate_layout:
+        __migrate_layout(keep_versions=keep_versions)
+
+    if export_data:
+        __export(data_dir, num_partitions=num_partitions, batch_size=batch_size)
+
+    if import_data:
+        __import(data_dir, batch_size=batch_size)
+
+
+def __create_payload_indexes() -> None:
+    for document_class in VectorBaseDocument.get_registered_classes():
+        collection_name = document_class.get_collection_name()
+        if len(document_class.get_payload_indexes()) == 0:
+            continue
+
+        if not connection.collection_exists(collection_name=collection_name):
+            logger.warning(f"Skipping '{collection_name}' as the collection does not exist.")
+
+            continue
+
+        indexed_fields = document_class.create_payload_indexes()
+
+        logger.info(f"Backfilled {len(indexed_fields)} payload indexes on '{collection_name}'.", fields=indexed_fields)
+
+
+def __reindex(keep_versions: int) -> None:
+    cleaned_document_classes = {
+        cleaned_document_class.get_category(): cleaned_document_class
+        for cleaned_document_class in CleanedDocument.get_registered_classes()
+    }
+
+    documents = {}
+    for embedded_chunk_class in EmbeddedChunk.get_registered_classes():
+        cleaned_document_class = cleaned_document_classes[embedded_chunk_class.get_category()]
+        if not connection.collection_exists(collection_name=cleaned_document_class.get_collection_name()):
+            logger.warning(f"Skipping '{embedded_chunk_class.get_collection_name()}' as it has no cleaned documents.")
+
+            continue
+
+        documents[embedded_chunk_class] = __iter_embedded_chunks(cleaned_document_class)
+
+    __reindex_collections(documents, keep_versions=keep_versions)
+
+
+def __iter_embedded_chunks(
+    cleaned_document_class: type[CleanedDocument], batch_size: int = 10
+) -> Generator[EmbeddedChunk, None, None]:
+    chunks = (
+        chunk for document in cleaned_document_class.scroll_iter() for chunk in ChunkingDispatcher.dispatch(document)
+    )
+    while batched_chunks := list(itertools.islice(chunks, batch_size)):
+        yield from EmbeddingDispatcher.dispatch(batched_chunks)
+
+
+def __migrate_layout(keep_versions: int) -> None:
+    documents = {}
+    for embedded_chunk_class in EmbeddedChunk.get_registered_classes():
+        # Read from the layout that is not selected, i.e. the one being migrated from.
+        if embedded_chunk_class.get_shared_collection_name() is not None:
+            source_collection_name = embedded_chunk_class.Config.name
+            scroll_filter = None
+        else:
+            source_collection_name = settings.QDRANT_EMBEDDED_COLLECTION_NAME
+            scroll_filter = Filter(
+                must=[FieldCondition(key="category", match=MatchValue(value=str(embedded_chunk_class.get_category())))]
+            )
+
+        if not connection.collection_exists(collection_name=source_collection_name):
+            logger.warning(f"Skipping '{source_collection_name}' as the collection does not exist.")
+
+            continue
+
+        documents[embedded_chunk_class] = __iter_records(embedded_chunk_class, source_collection_name, scroll_filter)
+
+    __reindex_collections(documents, keep_versions=keep_versions)
+
+
+def __iter_records(
+    embedded_chunk_class: type[EmbeddedChunk], collection_name: str, scroll_filter: Filter | None, batch_size: int = 256
+) -> Generator[EmbeddedChunk, None, None]:
+    offset = None
+    while True:
+        records, offset = connection.scroll(
+            collection_name=collection_name,
+            scroll_filter=scroll_filter,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        yield from (embedded_chunk_class.from_record(record) for record in records)
+
+        if offset is None:
+            break
+
+
+def __reindex_collections(
+    documents: dict[type[VectorBaseDocument], Iterator[VectorBaseDocument]], keep_versions: int
+) -> None:
+    # Classes sharing a collection are reindexed together, as a new version must hold all of their documents.
+    # The documents are streamed from their source into the new version, so they are never all held in memory.
+    documents_by_collection: dict[str, list[Iterator[VectorBaseDocument]]] = {}
+    document_classes = {}
+    for document_class, class_documents in documents.items():
+        collection_name = document_class.get_collection_name()
+        documents_by_collection.setdefault(collection_name, []).append(class_documents)
+        document_classes.setdefault(collection_name, document_class)
+
+    for collection_name, collection_documents in documents_by_collection.items():
+        version_name = document_classes[collection_name].reindex(
+            itertools.chain.from_iterable(collection_documents), keep_versions=keep_versions
+        )
+        num_points = connection.count(collection_name=version_name).count
+
+        logger.info(f"Reindexed {num_points} documents into '{version_name}'.")
+
+
+# Columns of the exported Parquet files: the point ID, its JSON payload and its sparse vectors.
+ID_COLUMN = "__id"
+PAYLOAD_COLUMN = "__payload"
+SPARSE_INDICES_COLUMN = "__{name}_indices"
+SPARSE_VALUES_COLUMN = "__{name}_values"
+# Each bulk load of an import upserts this many batches in parallel.
+IMPORT_BATCHES_PER_LOAD = 16
+
+
+def __export(data_dir: Path, num_partitions: int, batch_size: int) -> None:
+    logger.info(f"Exporting the vector store to {data_dir}...")
+
+    for document_class in VectorBaseDocument.get_registered_classes():
+        collection_name = document_class.get_collection_name()
+        if not connection.collection_exists(collection_name=collection_name):
+            logger.warning(f"Skipping '{collection_name}' as the collection does not exist.")
+
+            continue
+
+        __export_collection(
+            data_dir / document_class.__name__, document_class, num_partitions=num_partitions, batch_size=batch_size
+        )
+
+
+def __export_collection(
+    export_dir: Path, document_class: type[VectorBaseDocument], num_partitions: int, batch_size: int
+) -> None:
+    collection_name = document_class.get_collection_name()
+    params = connection.get_collection(collection_name=collection_name).config.params
+    if isinstance(params.vectors, VectorParams):
+        vector_sizes = {"": params.vectors.size}
+    else:
+        vector_sizes = {name: vector_params.size for name, vector_params in (params.vectors or {}).items()}
+    sparse_vector_names = list(params.sparse_vectors or {})
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+
+    # The point IDs are random UUIDs: splitting the 128-bit ID space evenly balances the partitions. Each one
+    # is scrolled from its lower bound, as Qdrant scrolls the points in the order of their IDs.
+    bounds = [str(UUID(int=i * 2**128 // num_partitions)) for i in range(num_partitions)] + [None]
+    with ThreadPoolExecutor(max_workers=num_partitions) as executor:
+        partitions = list(
+            executor.map(
+                lambda i: __export_partition(
+                    document_class,
+                    export_dir,
+                    f"partition-{i:03d}",
+                    lower_bound=bounds[i],
+                    upper_bound=bounds[i + 1],
+                    vector_sizes=vector_sizes,
+                    sparse_vector_names=sparse_vector_names,
+                    batch_size=batch_size,
+                ),
+                range(num_partitions),
+            )
+        )
+    num_points = sum(partition["num_points"] for partition in partitions)
+
+    manifest = {
+        "class_name": document_class.__name__,
+        "collection_name": collection_name,
+        "num_points": num_points,
+        "partitions": partitions,
+        "vectors": [{"name": vector_name, "size": vector_size} for vector_name, vector_size in vector_sizes.items()],
+        "sparse_vectors": sparse_vector_names,
+    }
+    (export_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    logger.info(f"Exported {num_points} points of '{collection_name}' to {export_dir}.")
+
+
+def __export_partition(
+    document_class: type[VectorBaseDocument],
+    export_dir: Path,
+    partition_name: str,
+    lower_bound: str,
+    upper_bound: str | None,
+    vector_sizes: dict[str, int],
+    sparse_vector_names: list[str],
+    batch_size: int,
+) -> dict:
+    # Every scrolled page is written as soon as it is read, so the memory use does not grow with the collection:
+    # its payloads as a Parquet file, and its embeddings appended to one raw float32 matrix per vector.
+    partition_dir = export_dir / partition_name
+    partition_dir.mkdir(exist_ok=True)
+
+    payload_files = []
+    embedding_files = [f"{partition_name}/embeddings-{i}.f32" for i in range(len(vector_sizes))]
+    num_points = 0
+
+    with ExitStack() as stack:
+        embedding_writers = [stack.enter_context((export_dir / file).open("wb")) for file in embedding_files]
+
+        offset = lower_bound
+        while offset is not None:
+            records, offset = connection.scroll(
+                collection_name=document_class.get_collection_name(),
+                scroll_filter=document_class._filter_by_category(None),
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if upper_bound is not None:
+                records = [record for record in records if str(record.id) < upper_bound]
+                if offset is not None and str(offset) >= upper_bound:
+                    offset = None
+
+            if len(records) == 0:
+                continue
+
+            table = __records_to_table(records, sparse_vector_names)
+            payload_file = f"{partition_name}/payloads-{len(payload_files):06d}.parquet"
+            pq.write_table(table, export_dir / payload_file)
+            payload_files.append(payload_file)
+
+            for (vector_name, vector_size), embedding_writer in zip(
+                vector_sizes.items(), embedding_writers, strict=True
+            ):
+                # Points missing a vector get a row of NaNs, skipped when importing.
+                page_vectors = np.full((len(records), vector_size), np.nan, dtype=np.float32)
+                for row, record in enumerate(records):
+                    vector = __get_vector(record, vector_name)
+                    if vector is not None:
+                        page_vectors[row] = vector
+                embedding_writer.write(page_vectors.tobytes())
+
+            num_points += len(records)
+
+    return {
+        "num_points": num_points,
+        "payloads": payload_files,
+        "embeddings": embedding_files,
+    }
+
+
+def __records_to_table(records: list[Record], sparse_vector_names: list[str]) -> pa.Table:
+    # The payloads are stored as JSON strings, as their fields and their types vary from point to point.
+    columns = {
+        ID_COLUMN: [str(record.id) for record in records],
+        PAYLOAD_COLUMN: [json.dumps(record.payload or {}) for record in records],
+    }
+
+    for sparse_vector_name in sparse_vector_names:
+        sparse_vectors = [__get_vector(record, sparse_vector_name) for record in records]
+        columns[SPARSE_INDICES_COLUMN.format(name=sparse_vector_name)] = pa.array(
+            [vector.indices if vector is not None else None for vector in sparse_vectors], type=pa.list_(pa.uint32())
+        )
+        columns[SPARSE_VALUES_COLUMN.format(name=sparse_vector_name)] = pa.array(
+            [vector.values if vector is not None else None for vector in sparse_vectors], type=pa.list_(pa.float32())
+        )
+
+    return pa.table(columns)
+
+
+def __get_vector(record: Record, vector_name: str) -> list[float] | SparseVector | None:
+    if isinstance(record.vector, dict):
+        return record.vector.get(vector_name)
+
+    return record.vector if vector_name == "" else None
+
+
+def __import(data_dir: Path, batch_size: int) -> None:
+    logger.info(f"Importing the vector store from {data_dir}...")
+    assert data_dir.is_dir(), f"{data_dir} is not a directory or it doesn't exists."
+
+    document_classes = {
+        document_class.__name__: document_class for document_class in VectorBaseDocument.get_registered_classes()
+    }
+
+    for export_dir in sorted(data_dir.iterdir()):
+        manifest_file = export_dir / "manifest.json"
+        if not manifest_file.is_file():
+            continue
+
+        manifest = json.loads(manifest_file.read_text())
+        document_class = document_classes.get(manifest["class_name"])
+        if document_class is None:
+            logger.warning(f"Skipping {export_dir} as it does not match any ODM class.")
+
+            continue
+
+        __import_collection(export_dir, manifest, document_class, batch_size=batch_size)
+
+
+def __import_collection(
+    export_dir: Path, manifest: dict, document_class: type[VectorBaseDocument], batch_size: int
+) -> None:
+    points = __iter_points(export_dir, manifest)
+
+    document_class.get_or_create_collection()
+    num_points = 0
+    failed = False
+    with document_class.deferred_indexing():
+        while load_points := list(itertools.islice(points, batch_size * IMPORT_BATCHES_PER_LOAD)):
+            if document_class._bulk_load_points(load_points, batch_size=batch_size) is False:
+                failed = True
+            num_points += len(load_points)
+
+    if failed:
+        logger.error(f"Failed to import some points of {export_dir} into '{document_class.get_collection_name()}'.")
+    else:
+        logger.info(f"Imported {num_points} points into '{document_class.get_collection_name()}' from {export_dir}.")
+
+
+def __iter_points(export_dir: Path, manifest: dict) -> Generator[PointStruct, None, None]:
+    for partition in manifest["partitions"]:
+        if partition["num_points"] == 0:
+            continue
+
+        # The matrices are memory-mapped: only the rows of the payload file being read are loaded from the disk.
+        matrices = {
+            vector["name"]: np.memmap(
+                export_dir / embedding_file, dtype=np.float32, mode="r", shape=(partition["num_points"], vector["size"])
+            )
+            for vector, embedding_file in zip(manifest["vectors"], partition["embeddings"], strict=True)
+        }
+
+        start = 0
+        for payload_file in partition["payloads"]:
+            rows = pq.read_table(export_dir / payload_file).to_pylist()
+            file_vectors = {
+                vector_name: np.asarray(matrix[start : start + len(rows)]) for vector_name, matrix in matrices.items()
+            }
+            for i, row in enumerate(rows):
+                yield __row_to_point(
+                    row,
+                    {vector_name: vectors[i] for vector_name, vectors in file_vectors.items()},
+                    manifest,
+                )
+            start += len(rows)
+
+
+def __row_to_point(row: dict, vectors: dict[str, np.ndarray], manifest: dict) -> PointStruct:
+    point_id = row.pop(ID_COLUMN)
+
+    point_vectors = {
+        vector_name: vector.tolist() for vector_name, vector in vectors.items() if not np.isnan(vector).any()
+    }
+    for sparse_vector_name in manifest["sparse_vectors"]:
+        indices = row.pop(SPARSE_INDICES_COLUMN.format(name=sparse_vector_name))
+        values = row.pop(SPARSE_VALUES_COLUMN.format(name=sparse_vector_name))
+        if indices is not None:
+            point_vectors[sparse_vector_name] = SparseVector(indices=indices, values=values)
+
+    payload = json.loads(row[PAYLOAD_COLUMN])
+
+    # Shaped as `VectorBaseDocument.to_point` does, with a plain list for the unnamed vector.
+    vector = point_vectors[""] if list(point_vectors) == [""] else point_vectors
+
+    return PointStruct(id=point_id, vector=vector, payload=payload)
+
+
+if __name__ == "__main__":
+    main()